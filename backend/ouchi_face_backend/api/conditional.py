@@ -0,0 +1,80 @@
+"""HTTP validators (``ETag`` / ``Last-Modified``) and conditional GET handling."""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from ..services.catalog_cache import CachedResponse
+
+# Clients must revalidate before reusing a copy; with a matching validator that is a bodiless 304.
+CACHE_CONTROL = "no-cache"
+
+
+def resource_validators(resource_id: int, *timestamps: datetime | None) -> tuple[str, datetime | None]:
+    """``ETag`` and ``Last-Modified`` of one resource, from the timestamps that move whenever its JSON does."""
+    stamp = "|".join(value.isoformat() if value else "-" for value in timestamps)
+    etag = '"r-' + hashlib.blake2b(f"{resource_id}|{stamp}".encode(), digest_size=8).hexdigest() + '"'
+    return etag, max((value for value in timestamps if value), default=None)
+
+
+def catalog_validator(event_id: int | None, checked_at: datetime | None) -> str:
+    """``ETag`` of whole-catalog responses (lists), from :meth:`ResourceService.catalog_watermark`."""
+    stamp = f"{event_id or 0}|{checked_at.isoformat() if checked_at else '-'}"
+    return '"c-' + hashlib.blake2b(stamp.encode(), digest_size=8).hexdigest() + '"'
+
+
+def is_not_modified(request: Request, etag: str | None, last_modified: datetime | None = None) -> bool:
+    """Whether the client's copy is current, per ``If-None-Match`` or, failing that, ``If-Modified-Since``."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if etag is None:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        # If-None-Match uses the weak comparison: "W/" prefixes are ignored.
+        candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+        return etag in candidates
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return _as_utc(last_modified).replace(microsecond=0) <= since
+
+
+def validator_headers(etag: str | None, last_modified: datetime | None = None) -> dict[str, str]:
+    headers = {"Cache-Control": CACHE_CONTROL}
+    if etag:
+        headers["ETag"] = etag
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    return headers
+
+
+def not_modified(etag: str | None, last_modified: datetime | None = None) -> Response:
+    return Response(status_code=304, headers=validator_headers(etag, last_modified))
+
+
+def cached_json(request: Request, cached: CachedResponse) -> Response:
+    """``cached`` as a JSON response, or a 304 when the client already holds it."""
+    if is_not_modified(request, cached.etag, cached.last_modified):
+        return not_modified(cached.etag, cached.last_modified)
+    return Response(
+        content=cached.body,
+        media_type="application/json",
+        headers=validator_headers(cached.etag, cached.last_modified),
+    )
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Timestamps are stored as naive UTC.
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
@@ -1,10 +1,22 @@
 from __future__ import annotations
 
+from fastapi import Request
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ..db.session import get_session
+from ..db.session import get_read_session, get_session
+from ..services.job_queue import SyncJobQueue
 
 
 async def get_db_session() -> AsyncSession:
     async with get_session() as session:
         yield session
+
+
+async def get_read_db_session() -> AsyncSession:
+    """Session from the read-only pool, for endpoints that never write."""
+    async with get_read_session() as session:
+        yield session
+
+
+def get_job_queue(request: Request) -> SyncJobQueue:
+    return request.app.state.sync_jobs
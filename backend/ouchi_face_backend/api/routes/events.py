@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+
+from ...db.session import get_read_session
+from ...schemas.event import CatalogEventRead, EventChangelogResponse
+from ...services.event_bus import event_bus
+from ...services.event_log import EventLogService
+
+router = APIRouter(prefix="/api/events", tags=["events"])
+
+
+@router.get("", response_model=EventChangelogResponse)
+async def events(
+    since: int | None = Query(None, ge=0),
+    resource_id: int | None = None,
+    limit: int = Query(500, ge=1, le=5000),
+) -> EventChangelogResponse | StreamingResponse:
+    """Changelog page after event ``since``; without it, server-sent events from now on.
+
+    The stream carries ``resource.created|updated|deleted``, ``health.changed``
+    and ``resync``; its event ids are changelog ids, so a client can fill a gap
+    with ``?since=<last id>``. The session is opened here rather than through
+    a dependency, which would hold it for as long as a stream stays open.
+    """
+    if since is None:
+        return StreamingResponse(
+            event_bus.stream(),
+            media_type="text/event-stream",
+            # X-Accel-Buffering stops nginx from holding events back in its buffer.
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+    async with get_read_session() as session:
+        page = await EventLogService(session).since(since, limit=limit, resource_id=resource_id)
+    return EventChangelogResponse(
+        events=[CatalogEventRead.model_validate(event) for event in page.events],
+        next=page.next_id,
+        has_more=page.has_more,
+        reset=page.reset,
+    )
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from ...schemas.job import SyncJobRead
+from ...schemas.resource import RepoResourceCreate
+from ...services.job_queue import SyncJobQueue
+from ..deps import get_job_queue
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+
+@router.post("", response_model=SyncJobRead, status_code=status.HTTP_202_ACCEPTED)
+async def submit_sync_job(payload: RepoResourceCreate, queue: SyncJobQueue = Depends(get_job_queue)) -> SyncJobRead:
+    job = await queue.submit(str(payload.repo_url), payload.branch, payload.subpath)
+    return SyncJobRead.model_validate(job)
+
+
+@router.get("/{job_id}", response_model=SyncJobRead)
+async def read_sync_job(job_id: int, queue: SyncJobQueue = Depends(get_job_queue)) -> SyncJobRead:
+    job = await queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return SyncJobRead.model_validate(job)
@@ -1,40 +1,135 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from datetime import datetime, timedelta
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from pydantic import TypeAdapter
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from ...db.fts_query import InvalidQuery
+from ...db.session import get_read_session
+from ...db.tags import TagMode
 from ...models.resource import ResourceKind
 from ...schemas.resource import (
-    RepoResourceCreate,
+    BulkSyncResponse,
+    CatalogCacheStats,
+    CatalogImportResponse,
+    HealthHistoryBucket,
     ResourceCreateRequest,
+    ResourceHealthHistoryResponse,
     ResourceHealthResponse,
     ResourceListResponse,
     ResourceRead,
     SyncResponse,
+    TagFacet,
+    resource_list_json,
 )
-from ...services.resource_service import ResourceService, to_read_model
-from ..deps import get_db_session
+from ...services.catalog_cache import CachedResponse, catalog_cache
+from ...services.catalog_io import CatalogTransfer, iter_lines
+from ...services.health_history import DAY, HOUR, MINUTE, HealthHistoryService
+from ...services.resource_service import CountMode, ResourceService, to_read_model
+from ...utils.cursor import InvalidCursor
+from ..conditional import cached_json, catalog_validator, is_not_modified, not_modified, resource_validators
+from ..deps import get_db_session, get_read_db_session
 
 router = APIRouter(prefix="/api/resources", tags=["resources"])
 
+_RESOLUTIONS = {"minute": MINUTE, "hour": HOUR, "day": DAY}
+_TAG_FACETS = TypeAdapter(list[TagFacet])
+
 
 def get_service(session: AsyncSession = Depends(get_db_session)) -> ResourceService:
     return ResourceService(session)
 
 
+def get_read_service(session: AsyncSession = Depends(get_read_db_session)) -> ResourceService:
+    return ResourceService(session)
+
+
 @router.get("", response_model=ResourceListResponse)
 async def list_resources(
     *,
-    service: ResourceService = Depends(get_service),
-    q: str | None = Query(default=None, description="Full text search query"),
+    request: Request,
+    service: ResourceService = Depends(get_read_service),
+    q: str | None = Query(
+        default=None,
+        description='Search text ranked by relevance; supports "phrases", -word, tag:, owner: and kind:, '
+        "and -tag:, -owner: and -kind: to exclude",
+    ),
     kind: ResourceKind | None = None,
-    tag: str | None = None,
+    tag: list[str] | None = Query(default=None, description="Filter by tag; repeat for several tags"),
+    tag_mode: TagMode = Query(default="all", description="Match resources having all or any of the tags"),
     owner: str | None = None,
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
-) -> ResourceListResponse:
-    resources, total = await service.list_resources(q=q, kind=kind, tag=tag, owner=owner, limit=limit, offset=offset)
-    return ResourceListResponse(items=[await to_read_model(res) for res in resources], total=total)
+    cursor: str | None = Query(default=None, description="Opaque cursor from a previous page's next_cursor"),
+    count: CountMode = Query(default="exact", description="How to compute total: exact, estimate or none"),
+) -> Response:
+    async def load(etag: str) -> tuple[CachedResponse, None]:
+        page = await service.list_page(
+            q=q,
+            kind=kind,
+            tags=tag,
+            tag_mode=tag_mode,
+            owner=owner,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            count=count,
+            rows=True,
+        )
+        # Rows go straight to JSON: building ResourceRead models and having
+        # FastAPI validate them again against response_model dominated the request.
+        body = resource_list_json.dump_json(
+            {
+                "items": [{**row._asdict(), "snippet": page.snippets.get(row.id)} for row in page.items],
+                "total": page.total,
+                "total_is_estimate": page.total_is_estimate,
+                "next_cursor": page.next_cursor,
+            }
+        )
+        return CachedResponse(body, etag), None
+
+    query = " ".join(q.split()) if q else None
+    tags = tuple(sorted(set(tag))) if tag else ()
+    key = ("list", query, kind, tags, tag_mode if tags else "all", owner, limit, 0 if cursor else offset, cursor, count)
+    cached = catalog_cache.get(key)
+    if cached is None:
+        # Taken before reading, so a write that lands meanwhile changes the
+        # validator; it also answers a poll for an unchanged catalog without
+        # loading or serializing the page.
+        etag = catalog_validator(*await service.catalog_watermark())
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        try:
+            cached = await catalog_cache.load(key, lambda: load(etag))
+        except (InvalidCursor, InvalidQuery) as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return cached_json(request, cached)
+
+
+@router.get("/tags", response_model=list[TagFacet])
+async def list_tag_facets(
+    *,
+    service: ResourceService = Depends(get_read_service),
+    kind: ResourceKind | None = None,
+    owner: str | None = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+) -> Response:
+    async def load() -> tuple[CachedResponse, None]:
+        facets = await service.tag_facets(kind=kind, owner=owner, limit=limit)
+        return CachedResponse(_TAG_FACETS.dump_json([TagFacet(tag=tag, count=count) for tag, count in facets])), None
+
+    cached = await catalog_cache.fetch(("tags", kind, owner, limit), load)
+    return Response(content=cached.body, media_type="application/json")
+
+
+@router.get("/cache", response_model=CatalogCacheStats)
+async def cache_stats() -> CatalogCacheStats:
+    """Hit rate, invalidations and evictions of the catalog read cache."""
+    return catalog_cache.stats()
 
 
 @router.post("", response_model=ResourceRead)
@@ -46,20 +141,71 @@ async def create_resource(
     return await to_read_model(resource)
 
 
+@router.post("/sync", response_model=BulkSyncResponse)
+async def sync_all_resources(service: ResourceService = Depends(get_service)) -> BulkSyncResponse:
+    return await service.sync_all()
+
+
+@router.get("/export")
+async def export_resources() -> StreamingResponse:
+    """Every resource as one ``ouchi.yaml``-shaped JSON object per line."""
+    transfer = CatalogTransfer(session_factory=get_read_session)
+    return StreamingResponse(
+        transfer.export(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="ouchi-catalog.ndjson"'},
+    )
+
+
+@router.post("/import", response_model=CatalogImportResponse)
+async def import_resources(request: Request) -> CatalogImportResponse:
+    """Upsert resources from an NDJSON request body, read and written in batches."""
+    return await CatalogTransfer().import_lines(iter_lines(request.stream()))
+
+
 @router.get("/{resource_id}", response_model=ResourceRead)
-async def read_resource(resource_id: int, service: ResourceService = Depends(get_service)) -> ResourceRead:
-    resource = await service.get_resource(resource_id)
-    if not resource:
-        raise HTTPException(status_code=404, detail="Resource not found")
-    return await to_read_model(resource)
+async def read_resource(
+    resource_id: int, request: Request, service: ResourceService = Depends(get_read_service)
+) -> Response:
+    return await _detail_response(request, service, ("id", resource_id), resource_id=resource_id)
 
 
 @router.get("/slug/{slug}", response_model=ResourceRead)
-async def read_resource_by_slug(slug: str, service: ResourceService = Depends(get_service)) -> ResourceRead:
-    resource = await service.get_by_slug(slug)
-    if not resource:
-        raise HTTPException(status_code=404, detail="Resource not found")
-    return await to_read_model(resource)
+async def read_resource_by_slug(
+    slug: str, request: Request, service: ResourceService = Depends(get_read_service)
+) -> Response:
+    return await _detail_response(request, service, ("slug", slug), slug=slug)
+
+
+async def _detail_response(
+    request: Request, service: ResourceService, key: tuple, *, resource_id: int | None = None, slug: str | None = None
+) -> Response:
+    cached = catalog_cache.get(key)
+    if cached is None:
+        if "if-none-match" in request.headers or "if-modified-since" in request.headers:
+            # Revalidate from four columns before loading and serializing the resource.
+            timestamps = await service.get_timestamps(resource_id=resource_id, slug=slug)
+            if timestamps is not None:
+                etag, last_modified = resource_validators(*timestamps)
+                if is_not_modified(request, etag, last_modified):
+                    return not_modified(etag, last_modified)
+        cached = await catalog_cache.load(key, lambda: _load_detail(service, resource_id=resource_id, slug=slug))
+        if cached is None:
+            raise HTTPException(status_code=404, detail="Resource not found")
+    return cached_json(request, cached)
+
+
+async def _load_detail(
+    service: ResourceService, *, resource_id: int | None, slug: str | None
+) -> tuple[CachedResponse, int] | None:
+    resource = await (service.get_resource(resource_id) if slug is None else service.get_by_slug(slug))
+    if resource is None:
+        return None
+    etag, last_modified = resource_validators(
+        resource.id, resource.modified_at, resource.health_checked_at, resource.last_synced_at
+    )
+    body = (await to_read_model(resource)).model_dump_json().encode()
+    return CachedResponse(body, etag, last_modified), resource.id
 
 
 @router.post("/{resource_id}/sync", response_model=SyncResponse)
@@ -70,14 +216,50 @@ async def sync_resource(resource_id: int, service: ResourceService = Depends(get
     if not resource.repo_url:
         raise HTTPException(status_code=400, detail="Resource does not have a repository source")
 
-    payload = RepoResourceCreate(repo_url=resource.repo_url)
-    refreshed = await service.create_or_update(payload)
-    return SyncResponse(resource=await to_read_model(refreshed), refreshed=True)
+    resource, refreshed = await service.sync_resource(resource)
+    return SyncResponse(resource=await to_read_model(resource), refreshed=refreshed)
 
 
 @router.get("/{resource_id}/health", response_model=ResourceHealthResponse)
-async def resource_health(resource_id: int, service: ResourceService = Depends(get_service)) -> ResourceHealthResponse:
+async def resource_health(resource_id: int, service: ResourceService = Depends(get_read_service)) -> ResourceHealthResponse:
+    resource = await service.get_resource(resource_id)
+    if not resource:
+        raise HTTPException(status_code=404, detail="Resource not found")
+    return ResourceHealthResponse(
+        resource_id=resource.id,
+        status=resource.health_status,
+        checked_at=resource.health_checked_at,
+        latency_ms=resource.health_latency_ms,
+    )
+
+
+@router.get("/{resource_id}/health/history", response_model=ResourceHealthHistoryResponse)
+async def resource_health_history(
+    resource_id: int,
+    days: int = Query(default=30, ge=1, le=400),
+    resolution: Literal["minute", "hour", "day"] = "day",
+    service: ResourceService = Depends(get_read_service),
+) -> ResourceHealthHistoryResponse:
     resource = await service.get_resource(resource_id)
     if not resource:
         raise HTTPException(status_code=404, detail="Resource not found")
-    return ResourceHealthResponse(resource_id=resource.id, status=resource.health_status, checked_at=resource.health_checked_at)
+    summary = await HealthHistoryService(service.session).summary(
+        resource_id, since=datetime.utcnow() - timedelta(days=days), resolution=_RESOLUTIONS[resolution]
+    )
+    return ResourceHealthHistoryResponse(
+        resource_id=resource_id,
+        since=datetime.utcfromtimestamp(summary.since),
+        until=datetime.utcfromtimestamp(summary.until),
+        samples=summary.samples,
+        uptime=summary.uptime,
+        avg_latency_ms=summary.avg_latency_ms,
+        buckets=[
+            HealthHistoryBucket(
+                start=datetime.utcfromtimestamp(bucket.start),
+                samples=bucket.samples,
+                uptime=100.0 * bucket.up_count / bucket.samples,
+                avg_latency_ms=bucket.latency_sum / bucket.latency_count if bucket.latency_count else None,
+            )
+            for bucket in summary.buckets
+        ],
+    )
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, Response
+
+from ...services.thumbnails import ThumbnailStore
+from ..conditional import is_not_modified
+
+router = APIRouter(prefix="/api/thumbnails", tags=["thumbnails"])
+
+# The URL names the image content, so whatever it returns never changes.
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+_store = ThumbnailStore()
+
+
+@router.get("/{digest}/{size}")
+async def get_thumbnail(digest: str, size: int, request: Request) -> Response:
+    """A resized variant from the content-addressed cache, e.g. ``/api/thumbnails/<thumbnail_hash>/320``.
+
+    The file is handed to ``FileResponse`` as a path: it is streamed from
+    disk, or sent by the server itself where it supports the ASGI pathsend
+    extension, without being read into Python.
+    """
+    path = _store.variant_path(digest, size)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Thumbnail not found")
+    headers = {"Cache-Control": IMMUTABLE, "ETag": f'"{digest}-{path.name}"'}
+    if is_not_modified(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    try:
+        stat_result = path.stat()
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Thumbnail not found") from None
+    return FileResponse(path, media_type=_store.media_type, headers=headers, stat_result=stat_result)
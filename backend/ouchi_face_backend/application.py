@@ -3,12 +3,19 @@ from __future__ import annotations
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .api.routes import resources
+from .api.routes import events, jobs, resources, thumbnails
 from .core.config import settings
-from .db.session import init_db
+from .db.session import dispose_engines, init_db
+from .services.catalog_refresh import CatalogRefresher
+from .services.event_bus import event_bus
 from .services.health_monitor import HealthMonitor
+from .services.job_queue import SyncJobQueue
+from .services.repo_sync import shutdown_sync_executor
+from .services.thumbnails import shutdown_thumbnail_executor
 
 health_monitor = HealthMonitor()
+sync_jobs = SyncJobQueue()
+catalog_refresher = CatalogRefresher()
 
 
 def create_app() -> FastAPI:
@@ -23,15 +30,27 @@ def create_app() -> FastAPI:
     )
 
     app.include_router(resources.router)
+    app.include_router(jobs.router)
+    app.include_router(events.router)
+    app.include_router(thumbnails.router)
+    app.state.sync_jobs = sync_jobs
 
     @app.on_event("startup")
     async def on_startup() -> None:  # noqa: D401 - FastAPI hook
         await init_db()
         await health_monitor.start()
+        await sync_jobs.start()
+        await catalog_refresher.start()
 
     @app.on_event("shutdown")
     async def on_shutdown() -> None:  # noqa: D401 - FastAPI hook
+        event_bus.close()
         await health_monitor.shutdown()
+        await sync_jobs.shutdown()
+        await catalog_refresher.shutdown()
+        shutdown_sync_executor()
+        shutdown_thumbnail_executor()
+        await dispose_engines()
 
     return app
 
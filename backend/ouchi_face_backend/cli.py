@@ -0,0 +1,99 @@
+"""Administrative commands, installed as the ``ouchi-face`` script."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from typing import AsyncIterator, BinaryIO, Sequence
+
+from .db.fts import merge_resource_fts, optimize_resource_fts, rebuild_resource_fts
+from .db.session import dispose_engines, get_session, init_db
+from .services.catalog_io import CatalogTransfer, iter_lines
+
+
+async def _fts(args: argparse.Namespace) -> None:
+    async with get_session() as session:
+        if args.action == "rebuild":
+            count = await rebuild_resource_fts(session)
+            await optimize_resource_fts(session)
+            print(f"rebuilt search index for {count} resources")
+        elif args.action == "optimize":
+            await optimize_resource_fts(session)
+            print("search index optimized")
+        else:
+            await merge_resource_fts(session, args.pages)
+            print(f"merged up to {args.pages} index pages")
+        await session.commit()
+
+
+async def _export(args: argparse.Namespace) -> None:
+    output = open(args.output, "wb") if args.output != "-" else sys.stdout.buffer
+    try:
+        async for chunk in CatalogTransfer(batch_size=args.batch_size).export():
+            output.write(chunk)
+    finally:
+        if output is not sys.stdout.buffer:
+            output.close()
+
+
+async def _import(args: argparse.Namespace) -> None:
+    source = open(args.input, "rb") if args.input != "-" else sys.stdin.buffer
+    try:
+        summary = await CatalogTransfer(batch_size=args.batch_size).import_lines(iter_lines(_read_chunks(source)))
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+    print(
+        f"{summary.created} created, {summary.updated} updated, {summary.failed} failed in {summary.duration_ms:.0f} ms",
+        file=sys.stderr,
+    )
+    for error in summary.errors:
+        print(f"  line {error.line}: {error.error}", file=sys.stderr)
+
+
+async def _read_chunks(source: BinaryIO, size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    while chunk := source.read(size):
+        yield chunk
+
+
+async def _run(args: argparse.Namespace) -> None:
+    try:
+        await init_db()
+        await args.handler(args)
+    finally:
+        await dispose_engines()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="ouchi-face", description="Ouchi Face catalog administration")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fts = commands.add_parser("fts", help="maintain the full text search index")
+    fts.set_defaults(handler=_fts)
+    actions = fts.add_subparsers(dest="action", required=True)
+    actions.add_parser("rebuild", help="reindex every resource from the resource table, then optimize")
+    actions.add_parser("optimize", help="merge all index segments into one (rewrites the whole index)")
+    merge = actions.add_parser("merge", help="incrementally merge index segments, bounded by --pages")
+    merge.add_argument("--pages", type=int, default=500, help="approximate number of leaf pages to write")
+
+    export = commands.add_parser("export", help="write every resource as NDJSON")
+    export.set_defaults(handler=_export)
+    export.add_argument("-o", "--output", default="-", help="file to write, '-' for stdout (default)")
+    export.add_argument("--batch-size", type=int, default=None, help="resources read per query")
+
+    load = commands.add_parser("import", help="upsert resources from an NDJSON file")
+    load.set_defaults(handler=_import)
+    load.add_argument("input", help="NDJSON file to read, '-' for stdin")
+    load.add_argument("--batch-size", type=int, default=None, help="records written per transaction")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    asyncio.run(_run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import AnyUrl, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -13,9 +13,63 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="OUCHI_", env_file=('.env',), case_sensitive=False)
 
     database_url: str = Field(default="sqlite+aiosqlite:///./data/ouchi_face.db")
+    db_pool_size: int = Field(default=4, ge=1)
+    db_max_overflow: int = Field(default=4, ge=0)
+    db_read_pool_size: int = Field(default=8, ge=1)
+    sqlite_journal_mode: Literal["wal", "delete"] = "wal"
+    sqlite_synchronous: Literal["off", "normal", "full"] = "normal"
+    sqlite_mmap_size: int = Field(default=256 * 1024 * 1024, ge=0)
+    sqlite_cache_size_kib: int = Field(default=64 * 1024, ge=0)
+    sqlite_busy_timeout_ms: int = Field(default=5000, ge=0)
+    sqlite_temp_store: Literal["default", "file", "memory"] = "memory"
     repo_storage_dir: Path = Field(default=Path("data/repos"))
+    repo_fetch_mode: Literal["full", "shallow"] = "shallow"
+    repo_storage_mode: Literal["checkout", "bare"] = "checkout"
+    repo_sync_workers: int = Field(default=4, ge=1)
+    thumbnail_sizes: list[int] = Field(default_factory=lambda: [160, 320, 640])
+    thumbnail_format: Literal["webp", "jpeg"] = "webp"
+    thumbnail_quality: int = Field(default=80, ge=1, le=100)
+    thumbnail_max_bytes: int = Field(default=10 * 1024 * 1024, ge=0)
+    thumbnail_workers: int = Field(default=2, ge=1)
+    sync_job_workers: int = Field(default=2, ge=1)
+    sync_job_max_attempts: int = Field(default=3, ge=1)
+    bulk_sync_concurrency: int = Field(default=8, ge=1)
+    bulk_sync_batch_size: int = Field(default=100, ge=1)
+    catalog_batch_size: int = Field(default=500, ge=1)
+    catalog_cache_entries: int = Field(default=1024, ge=0)
+    catalog_cache_ttl_seconds: float = Field(default=30.0, ge=0)
+    events_max_pending: int = Field(default=256, ge=1)
+    events_heartbeat_seconds: float = Field(default=15.0, gt=0)
+    events_retry_ms: int = Field(default=3000, ge=0)
+    events_retention_days: int = Field(default=30, ge=1)
+    events_prune_interval_seconds: int = Field(default=3600, ge=60)
+    repo_refresh_interval_seconds: Optional[int] = Field(default=None, ge=60)
+    search_weight_name: float = Field(default=10.0, ge=0)
+    search_weight_description: float = Field(default=4.0, ge=0)
+    search_weight_tags: float = Field(default=2.0, ge=0)
+    search_weight_readme: float = Field(default=1.0, ge=0)
+    readme_index_max_chars: int = Field(default=200_000, ge=0)
+    search_fuzzy_expansions: int = Field(default=4, ge=0)
+    search_max_terms: int = Field(default=8, ge=1)
     health_check_interval_seconds: int = Field(default=120, ge=30)
+    health_min_interval_seconds: int = Field(default=30, ge=5)
+    health_max_interval_seconds: int = Field(default=1800, ge=30)
+    health_backoff_factor: float = Field(default=1.5, ge=1.0)
+    health_stable_after: int = Field(default=3, ge=1)
+    health_jitter_ratio: float = Field(default=0.1, ge=0.0, le=0.5)
+    health_tick_seconds: int = Field(default=5, ge=1)
+    health_rollup_interval_seconds: int = Field(default=300, ge=30)
+    health_raw_retention_hours: int = Field(default=2, ge=1)
+    health_minute_retention_hours: int = Field(default=48, ge=1)
+    health_hour_retention_days: int = Field(default=14, ge=1)
+    health_day_retention_days: int = Field(default=400, ge=1)
     health_request_timeout: int = Field(default=10, ge=1)
+    health_max_concurrency: int = Field(default=32, ge=1)
+    health_per_host_concurrency: int = Field(default=4, ge=1)
+    health_probe_method: Literal["head", "get"] = "head"
+    health_http2: bool = True
+    health_max_keepalive_connections: int = Field(default=20, ge=0)
+    health_keepalive_expiry: float = Field(default=30.0, ge=0)
     allow_origins: list[str] = Field(default_factory=lambda: ["*"])
     github_client_id: Optional[str] = None
     github_client_secret: Optional[str] = None
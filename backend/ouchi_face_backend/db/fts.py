@@ -1,36 +1,282 @@
 from __future__ import annotations
 
-from typing import Iterable
+import html
+from typing import Any, Mapping, Sequence
 
-from sqlalchemy import text
+from sqlalchemy import Connection, bindparam, column, func, literal_column, select, table, text
+from sqlalchemy.sql.elements import ColumnElement
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ..models.resource import Resource
+from ..core.config import settings
+from ..models.resource import Resource, ResourceReadme
+from .readme import stored_readme_text
+
+# Prefix indexes keep short "ter*" queries from scanning the whole term list.
+RESOURCES_FTS_DDL = "CREATE VIRTUAL TABLE resources_fts USING fts5(name, description, tags, readme, prefix='2 3')"
+RESOURCES_FTS_VOCAB_DDL = "CREATE VIRTUAL TABLE IF NOT EXISTS resources_fts_vocab USING fts5vocab(resources_fts, 'row')"
+
+HIGHLIGHT_OPEN = "<mark>"
+HIGHLIGHT_CLOSE = "</mark>"
+SNIPPET_TOKENS = 16
+# snippet() marks matches with private-use characters; the stored text around
+# them is escaped before they become HTML tags.
+_MATCH_OPEN = "\ue000"
+_MATCH_CLOSE = "\ue001"
+
+_FUZZY_MIN_LENGTH = 3
+_FUZZY_SCAN_LIMIT = 5000
+
+_fts = table("resources_fts", column("rowid"))
+_vocab = table("resources_fts_vocab", column("term"), column("doc"))
+_fts_ref = literal_column("resources_fts")
+
+
+_POPULATE = text(
+    """
+    INSERT INTO resources_fts(rowid, name, description, tags, readme)
+    SELECT id, name, COALESCE(description, ''),
+           COALESCE((SELECT group_concat(value, ' ') FROM json_each(resource.tags)), ''), ''
+    FROM resource
+    """
+)
+_SET_README = text("UPDATE resources_fts SET readme = :readme WHERE rowid = :id")
+_README_BATCH = 200
+
+
+def ensure_resource_fts(conn: Connection) -> None:
+    """Create the search index, rebuilding it from ``resource`` if its layout changed."""
+    fts_sql = conn.execute(text("SELECT sql FROM sqlite_master WHERE name = 'resources_fts'")).scalar()
+    if fts_sql != RESOURCES_FTS_DDL:
+        # Earlier layouts (a contentless table, no prefix indexes) are simply rebuilt.
+        conn.execute(text("DROP TABLE IF EXISTS resources_fts_vocab"))
+        if fts_sql is not None:
+            conn.execute(text("DROP TABLE resources_fts"))
+        conn.execute(text(RESOURCES_FTS_DDL))
+        conn.execute(_POPULATE)
+        _index_stored_readmes(conn)
+    conn.execute(text(RESOURCES_FTS_VOCAB_DDL))
+
+
+def _index_stored_readmes(conn: Connection) -> None:
+    # READMEs are stored compressed, so SQL cannot copy them over; a batch at a
+    # time is decompressed here instead.
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            select(ResourceReadme.resource_id, ResourceReadme.content)
+            .where(ResourceReadme.resource_id > last_id)
+            .order_by(ResourceReadme.resource_id)
+            .limit(_README_BATCH)
+        ).all()
+        if not rows:
+            return
+        conn.execute(_SET_README, [{"id": rid, "readme": stored_readme_text(content)} for rid, content in rows])
+        last_id = rows[-1][0]
+
+
+async def upsert_resources_fts(
+    session: AsyncSession, resources: Sequence[Resource], readmes: Mapping[int, str] | None = None
+) -> None:
+    """Reindex ``resources`` in a few batched statements, inside the caller's transaction.
+
+    The README column is only rewritten for the ids in ``readmes``; otherwise
+    a resource keeps whatever README text it was indexed with.
+    """
+    rows = [
+        {"id": resource.id, "name": resource.name, "description": resource.description, "tags": resource.tags}
+        for resource in resources
+    ]
+    await upsert_fts_rows(session, rows, readmes)
+
+
+async def upsert_fts_rows(
+    session: AsyncSession, rows: Sequence[Mapping[str, Any]], readmes: Mapping[int, str] | None = None
+) -> None:
+    """Like :func:`upsert_resources_fts`, for plain ``id``/``name``/``description``/``tags`` mappings."""
+    if rows:
+        params = [
+            {
+                "id": row["id"],
+                "name": row["name"],
+                "description": row["description"] or "",
+                "tags": " ".join(row["tags"] or []),
+            }
+            for row in rows
+        ]
+        await session.exec(
+            text("UPDATE resources_fts SET name = :name, description = :description, tags = :tags WHERE rowid = :id"),
+            params=params,
+        )
+        await session.exec(
+            text(
+                """
+                INSERT INTO resources_fts(rowid, name, description, tags, readme)
+                SELECT :id, :name, :description, :tags, ''
+                WHERE NOT EXISTS (SELECT 1 FROM resources_fts WHERE rowid = :id)
+                """
+            ),
+            params=params,
+        )
+    if readmes:
+        await session.exec(_SET_README, params=[{"id": rid, "readme": readme} for rid, readme in readmes.items()])
+
+
+async def remove_resources_fts(session: AsyncSession, resource_ids: Sequence[int]) -> None:
+    if resource_ids:
+        await session.exec(
+            text("DELETE FROM resources_fts WHERE rowid IN :ids").bindparams(bindparam("ids", expanding=True)),
+            params={"ids": list(resource_ids)},
+        )
 
 
 async def upsert_resource_fts(session: AsyncSession, resource: Resource) -> None:
-    await session.exec(text("DELETE FROM resources_fts WHERE rowid = :id").bindparams(id=resource.id))
+    await upsert_resources_fts(session, [resource])
+
+
+async def remove_resource_fts(session: AsyncSession, resource_id: int) -> None:
+    await remove_resources_fts(session, [resource_id])
+
+
+async def rebuild_resource_fts(session: AsyncSession) -> int:
+    """Repopulate the index from ``resource`` and the stored READMEs; returns the number of indexed rows."""
+    await session.exec(text("DELETE FROM resources_fts"))
+    result = await session.exec(_POPULATE)
+    await session.run_sync(lambda sync_session: _index_stored_readmes(sync_session.connection()))
+    return result.rowcount
+
+
+async def optimize_resource_fts(session: AsyncSession) -> None:
+    """Merge every index segment into one; the fastest layout for queries, but rewrites the whole index."""
+    await session.exec(text("INSERT INTO resources_fts(resources_fts) VALUES ('optimize')"))
+
+
+async def merge_resource_fts(session: AsyncSession, pages: int = 500) -> None:
+    """Do a bounded amount of incremental segment merging (roughly ``pages`` leaf pages)."""
     await session.exec(
-        text(
-            """
-            INSERT INTO resources_fts(rowid, name, description, tags)
-            VALUES (:id, :name, :description, :tags)
-            """
-        ).bindparams(
-            id=resource.id,
-            name=resource.name,
-            description=resource.description or "",
-            tags=" ".join(resource.tags or []),
-        )
+        text("INSERT INTO resources_fts(resources_fts, rank) VALUES ('merge', :pages)").bindparams(pages=pages)
     )
 
 
-async def remove_resource_fts(session: AsyncSession, resource_id: int) -> None:
-    await session.exec(text("DELETE FROM resources_fts WHERE rowid = :id").bindparams(id=resource_id))
+def _rank() -> ColumnElement[float]:
+    return func.bm25(
+        _fts_ref,
+        settings.search_weight_name,
+        settings.search_weight_description,
+        settings.search_weight_tags,
+        settings.search_weight_readme,
+    )
+
+
+def _matching(match: str, filters: Sequence[ColumnElement[bool]]):
+    return (
+        select()
+        .select_from(_fts)
+        .join(Resource, Resource.id == _fts.c.rowid)
+        .where(_fts_ref.match(match), *filters)
+    )
+
+
+async def search_resources(
+    session: AsyncSession,
+    match: str,
+    filters: Sequence[ColumnElement[bool]] = (),
+    *,
+    limit: int,
+    offset: int = 0,
+    entity: Any = Resource,
+) -> list[tuple[Any, str]]:
+    """Matching resources, best ``bm25`` rank first, each with a highlighted snippet.
+
+    ``entity`` is what is loaded per hit: ``Resource`` or a ``Bundle`` of its columns.
+    """
+    snippet = func.snippet(_fts_ref, -1, _MATCH_OPEN, _MATCH_CLOSE, "…", SNIPPET_TOKENS)
+    query = (
+        _matching(match, filters)
+        .add_columns(entity, snippet)
+        .order_by(_rank(), Resource.modified_at.desc(), Resource.id.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+    result = await session.exec(query)
+    return [(item, highlight_html(text_)) for item, text_ in result.all()]
 
 
-async def search_resource_ids(session: AsyncSession, query: str) -> Iterable[int]:
+def highlight_html(snippet: str | None) -> str | None:
+    """``snippet`` as HTML: stored text escaped, matches wrapped in ``HIGHLIGHT_OPEN`` / ``HIGHLIGHT_CLOSE``."""
+    if snippet is None:
+        return None
+    return html.escape(snippet).replace(_MATCH_OPEN, HIGHLIGHT_OPEN).replace(_MATCH_CLOSE, HIGHLIGHT_CLOSE)
+
+
+async def count_matches(
+    session: AsyncSession, match: str, filters: Sequence[ColumnElement[bool]] = (), cap: int | None = None
+) -> int:
+    matching = _matching(match, filters).add_columns(Resource.id)
+    if cap is not None:
+        matching = matching.limit(cap)
+    result = await session.exec(select(func.count()).select_from(matching.subquery()))
+    return result.scalar_one()
+
+
+async def fuzzy_groups(
+    session: AsyncSession, terms: Sequence[str], prefix_last: bool = False, expansions: int | None = None
+) -> list[list[str]]:
+    """Pair every term with close spellings taken from the index vocabulary.
+
+    Terms the index already knows are kept as they are. Unknown ones gain up to
+    ``expansions`` indexed terms sharing their first letter within a small
+    edit distance, most frequent first.
+    """
+    expansions = settings.search_fuzzy_expansions if expansions is None else expansions
+    groups = []
+    for index, term in enumerate(terms):
+        is_prefix = prefix_last and index == len(terms) - 1
+        group = [term]
+        if expansions and len(term) >= _FUZZY_MIN_LENGTH and not await _known_term(session, term, is_prefix):
+            group += await _close_terms(session, term, expansions)
+        groups.append(group)
+    return groups
+
+
+async def _known_term(session: AsyncSession, term: str, is_prefix: bool) -> bool:
+    condition = _vocab.c.term.between(term, term + "\U0010ffff") if is_prefix else _vocab.c.term == term
+    result = await session.exec(select(_vocab.c.term).where(condition).limit(1))
+    return result.first() is not None
+
+
+async def _close_terms(session: AsyncSession, term: str, expansions: int) -> list[str]:
+    max_distance = 1 if len(term) <= 4 else 2
     result = await session.exec(
-        text("SELECT rowid FROM resources_fts WHERE resources_fts MATCH :match").bindparams(match=query)
+        select(_vocab.c.term, _vocab.c.doc)
+        .where(
+            _vocab.c.term >= term[0],
+            _vocab.c.term < term[0] + "\U0010ffff",
+            func.length(_vocab.c.term).between(len(term) - max_distance, len(term) + max_distance),
+        )
+        .limit(_FUZZY_SCAN_LIMIT)
     )
-    return [row for row in result.scalars().all()]
+    scored = []
+    for candidate, doc in result.all():
+        distance = edit_distance(term, candidate, max_distance)
+        if distance <= max_distance:
+            scored.append((distance, -doc, candidate))
+    return [candidate for _, _, candidate in sorted(scored)[:expansions]]
+
+
+def edit_distance(left: str, right: str, limit: int) -> int:
+    """Optimal string alignment distance, giving up (returning ``limit + 1``) once it exceeds ``limit``."""
+    if abs(len(left) - len(right)) > limit:
+        return limit + 1
+    previous2: list[int] = []
+    previous = list(range(len(right) + 1))
+    for i, lchar in enumerate(left, start=1):
+        current = [i] + [0] * len(right)
+        for j, rchar in enumerate(right, start=1):
+            cost = lchar != rchar
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and lchar == right[j - 2] and left[i - 2] == rchar:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from typing import Sequence
+
+from ..core.config import settings
+from ..models.resource import ResourceKind
+
+# Mirrors the unicode61 tokenizer: letters and digits, everything else separates.
+_WORD = re.compile(r"[^\W_]+")
+# An optional "-" (exclude) and "field:" prefix, then a quoted or bare value.
+_CLAUSE = re.compile(r'(-?)(?:([A-Za-z]+):)?(?:"([^"]*)"?|(\S+))')
+
+FIELDS = ("tag", "owner", "kind")
+# Longer tokens are truncated; nothing real in the catalog gets near this.
+MAX_TERM_LENGTH = 64
+# Shorter prefixes would enumerate a large part of the vocabulary; this matches
+# the smallest prefix index on resources_fts.
+MIN_PREFIX_LENGTH = 2
+
+
+class InvalidQuery(ValueError):
+    pass
+
+
+def search_terms(text: str) -> list[str]:
+    return [word.lower()[:MAX_TERM_LENGTH] for word in _WORD.findall(text)]
+
+
+def _quote(words: Sequence[str]) -> str:
+    # Words only ever contain letters and digits, so quoting cannot be escaped.
+    return '"' + " ".join(words) + '"'
+
+
+@dataclass(frozen=True)
+class SearchQuery:
+    """A parsed search box query.
+
+    ``terms`` are single words (the last one may match as a prefix), ``phrases``
+    come from quotes or hyphenated words, and ``excluded`` from ``-word``. The
+    ``tag:``, ``owner:`` and ``kind:`` fields become ordinary column filters,
+    and ``-tag:``, ``-owner:`` and ``-kind:`` exclude what they name.
+    """
+
+    terms: tuple[str, ...] = ()
+    phrases: tuple[tuple[str, ...], ...] = ()
+    excluded: tuple[tuple[str, ...], ...] = ()
+    tags: tuple[str, ...] = ()
+    owner: str | None = None
+    kind: ResourceKind | None = None
+    excluded_tags: tuple[str, ...] = ()
+    excluded_owners: tuple[str, ...] = ()
+    excluded_kinds: tuple[ResourceKind, ...] = ()
+    prefix_last: bool = False
+
+    @property
+    def has_text(self) -> bool:
+        return bool(self.terms or self.phrases)
+
+    @cached_property
+    def exact_match(self) -> str | None:
+        return self.match([[term] for term in self.terms])
+
+    def match(self, term_groups: Sequence[Sequence[str]]) -> str | None:
+        """FTS5 expression with ``term_groups[i]`` as the alternatives for ``terms[i]``."""
+        if not self.has_text:
+            return None
+        parts = []
+        for index, group in enumerate(term_groups):
+            star = "*" if self.prefix_last and index == len(term_groups) - 1 else ""
+            alternatives = [f"{_quote([term])}{star}" for term in group]
+            parts.append(alternatives[0] if len(alternatives) == 1 else f"({' OR '.join(alternatives)})")
+        parts.extend(_quote(phrase) for phrase in self.phrases)
+        expression = " AND ".join(parts)
+        for phrase in self.excluded:
+            expression += f" NOT {_quote(phrase)}"
+        return expression
+
+
+@lru_cache(maxsize=512)
+def compile_query(text: str) -> SearchQuery:
+    """Parse free text into a :class:`SearchQuery`; results are memoized.
+
+    Words beyond ``settings.search_max_terms`` are dropped so a
+    pasted paragraph cannot turn into an arbitrarily large MATCH expression.
+    Raises :class:`InvalidQuery` for an unknown ``kind:`` or ``-kind:`` value.
+    """
+    budget = settings.search_max_terms
+    terms: list[str] = []
+    phrases: list[tuple[str, ...]] = []
+    excluded: list[tuple[str, ...]] = []
+    tags: list[str] = []
+    owner = None
+    kind = None
+    excluded_fields: dict[str, list] = {name: [] for name in FIELDS}
+    prefix_last = False
+
+    for match in _CLAUSE.finditer(text):
+        negate, field, quoted, bare = match.groups()
+        value = quoted if quoted is not None else bare
+        field = field.lower() if field else None
+        if field in FIELDS and value:
+            if field == "kind":
+                try:
+                    value = ResourceKind(value.lower())
+                except ValueError as exc:
+                    raise InvalidQuery(f"Unknown kind '{value}'") from exc
+            if negate:
+                excluded_fields[field].append(value)
+            elif field == "tag":
+                tags.append(value)
+            elif field == "owner":
+                owner = value
+            else:
+                kind = value
+            continue
+
+        words = search_terms(match.group(0) if field else value)[:budget]
+        budget -= len(words)
+        if not words:
+            continue
+        if negate:
+            excluded.append(tuple(words))
+        elif len(words) == 1 and quoted is None:
+            terms.append(words[0])
+            # Only the word being typed at the very end of the box is a prefix.
+            prefix_last = match.end() == len(text) and len(words[0]) >= MIN_PREFIX_LENGTH
+        else:
+            phrases.append(tuple(words))
+            prefix_last = False
+
+    return SearchQuery(
+        terms=tuple(terms),
+        phrases=tuple(phrases),
+        excluded=tuple(excluded) if terms or phrases else (),
+        tags=tuple(dict.fromkeys(tags)),
+        owner=owner,
+        kind=kind,
+        excluded_tags=tuple(dict.fromkeys(excluded_fields["tag"])),
+        excluded_owners=tuple(dict.fromkeys(excluded_fields["owner"])),
+        excluded_kinds=tuple(dict.fromkeys(excluded_fields["kind"])),
+        prefix_last=prefix_last,
+    )
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import zlib
+from typing import TYPE_CHECKING
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..core.config import settings
+from ..models.resource import ResourceReadme
+from ..utils.markdown import index_text
+
+if TYPE_CHECKING:
+    from ..services.repo_sync import ReadmeDocument
+
+
+async def store_readme(session: AsyncSession, resource_id: int, readme: ReadmeDocument | None) -> str | None:
+    """Save ``readme`` for ``resource_id`` unless its hash is unchanged.
+
+    Returns the text the search index should now hold for the README: its
+    indexed text, ``""`` if it was removed, or ``None`` if nothing changed.
+    """
+    result = await session.exec(select(ResourceReadme.content_hash).where(ResourceReadme.resource_id == resource_id))
+    current_hash = result.scalar_one_or_none()
+    if readme is None:
+        if current_hash is None:
+            return None
+        await remove_readme(session, resource_id)
+        return ""
+    if readme.content_hash == current_hash:
+        return None
+    values = {"content_hash": readme.content_hash, "size": readme.size, "content": readme.compressed}
+    await session.exec(
+        insert(ResourceReadme)
+        .values(resource_id=resource_id, **values)
+        .on_conflict_do_update(index_elements=[ResourceReadme.resource_id], set_=values)
+    )
+    return readme.search_text
+
+
+async def remove_readme(session: AsyncSession, resource_id: int) -> None:
+    await session.exec(delete(ResourceReadme).where(ResourceReadme.resource_id == resource_id))
+
+
+def stored_readme_text(compressed: bytes) -> str:
+    """Indexed text of a stored README, decompressing no more than the index can use."""
+    max_chars = settings.readme_index_max_chars
+    # UTF-8 needs at most four bytes per character.
+    raw = zlib.decompressobj().decompress(compressed, (max_chars + 1) * 4)
+    return index_text(raw.decode("utf-8", errors="ignore"), max_chars)
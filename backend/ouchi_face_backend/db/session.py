@@ -3,33 +3,126 @@ from __future__ import annotations
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
-from sqlalchemy import text
+from sqlalchemy import event as sa_event, text
+from sqlalchemy.engine import URL, Connection, make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..core.config import settings
+from ..models import event, health, job, resource  # noqa: F401 - register tables on SQLModel.metadata
+from .fts import ensure_resource_fts
 
 
-engine: AsyncEngine = create_async_engine(settings.database_url, echo=False, future=True)
+def _is_file_sqlite(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+def apply_sqlite_pragmas(dbapi_connection, read_only: bool = False) -> None:
+    """Storage profile applied to every new SQLite connection.
+
+    WAL lets the health monitor and sync jobs write while API requests keep
+    reading; ``synchronous=NORMAL`` is durable in WAL mode except for the
+    last transactions before a power loss.
+    """
+    pragmas = [
+        f"busy_timeout = {settings.sqlite_busy_timeout_ms}",
+        f"synchronous = {settings.sqlite_synchronous.upper()}",
+        f"mmap_size = {settings.sqlite_mmap_size}",
+        f"cache_size = -{settings.sqlite_cache_size_kib}",
+        f"temp_store = {settings.sqlite_temp_store.upper()}",
+    ]
+    if read_only:
+        pragmas.append("query_only = ON")
+    else:
+        pragmas.insert(1, f"journal_mode = {settings.sqlite_journal_mode.upper()}")
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in pragmas:
+            cursor.execute(f"PRAGMA {pragma}")
+    finally:
+        cursor.close()
+
+
+def build_engine(database_url: str, *, read_only: bool = False) -> AsyncEngine:
+    """Create an engine for ``database_url``; file-backed SQLite gets a sized pool and the pragma profile."""
+    url = make_url(database_url)
+    if not _is_file_sqlite(url):
+        return create_async_engine(url, echo=False, future=True)
+    pool_size = settings.db_read_pool_size if read_only else settings.db_pool_size
+    engine = create_async_engine(
+        url,
+        echo=False,
+        future=True,
+        pool_size=pool_size,
+        max_overflow=0 if read_only else settings.db_max_overflow,
+    )
+
+    @sa_event.listens_for(engine.sync_engine, "connect")
+    def on_connect(dbapi_connection, _connection_record) -> None:
+        apply_sqlite_pragmas(dbapi_connection, read_only)
+
+    return engine
+
+
+engine: AsyncEngine = build_engine(settings.database_url)
 session_factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
+# GET endpoints read through their own pool so they never queue behind
+# writers; an in-memory database has to share the single writer connection.
+read_engine: AsyncEngine = build_engine(settings.database_url, read_only=True) if _is_file_sqlite(engine.url) else engine
+read_session_factory = async_sessionmaker(read_engine, expire_on_commit=False, class_=AsyncSession)
 
-async def init_db() -> None:
-    async with engine.begin() as conn:
-        await conn.run_sync(SQLModel.metadata.create_all)
-        await conn.execute(
+
+def create_schema(conn: Connection) -> None:
+    SQLModel.metadata.create_all(conn)
+    _upgrade_existing_tables(conn)
+    if conn.execute(text("SELECT NOT EXISTS (SELECT 1 FROM resourcetag)")).scalar():
+        conn.execute(
             text(
                 """
-                CREATE VIRTUAL TABLE IF NOT EXISTS resources_fts USING fts5(
-                    name, description, tags, content='', content_rowid='id'
-                )
+                INSERT OR IGNORE INTO resourcetag (resource_id, tag)
+                SELECT resource.id, json_each.value FROM resource, json_each(resource.tags)
                 """
             )
         )
+    ensure_resource_fts(conn)
+
+
+def _upgrade_existing_tables(conn: Connection) -> None:
+    """Add columns and indexes introduced after a table was first created.
+
+    ``create_all`` skips tables that already exist, and there are no migrations,
+    so additive, nullable schema changes are applied here.
+    """
+    for table in SQLModel.metadata.sorted_tables:
+        existing = {row[1] for row in conn.execute(text(f"PRAGMA table_info('{table.name}')"))}
+        for column in table.columns:
+            if column.name not in existing and column.nullable:
+                column_type = column.type.compile(dialect=conn.dialect)
+                conn.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'))
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+async def init_db() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(create_schema)
 
 
 @asynccontextmanager
-def get_session() -> AsyncGenerator[AsyncSession, None]:
+async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with session_factory() as session:
         yield session
+
+
+@asynccontextmanager
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    async with read_session_factory() as session:
+        yield session
+
+
+async def dispose_engines() -> None:
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
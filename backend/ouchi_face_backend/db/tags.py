@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from typing import Literal, Mapping, Sequence
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.sql.elements import ColumnElement
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..models.resource import Resource, ResourceTag
+
+TagMode = Literal["any", "all"]
+
+
+async def replace_resource_tags(session: AsyncSession, resource_id: int, tags: Sequence[str]) -> None:
+    await replace_resource_tags_bulk(session, {resource_id: tags})
+
+
+async def replace_resource_tags_bulk(session: AsyncSession, tags_by_resource: Mapping[int, Sequence[str]]) -> None:
+    if not tags_by_resource:
+        return
+    await session.exec(delete(ResourceTag).where(ResourceTag.resource_id.in_(list(tags_by_resource))))
+    rows = [
+        {"resource_id": resource_id, "tag": tag}
+        for resource_id, tags in tags_by_resource.items()
+        for tag in dict.fromkeys(tags)
+    ]
+    if rows:
+        await session.exec(insert(ResourceTag), params=rows)
+
+
+async def remove_resource_tags(session: AsyncSession, resource_id: int) -> None:
+    await session.exec(delete(ResourceTag).where(ResourceTag.resource_id == resource_id))
+
+
+def tag_filter(tags: Sequence[str], mode: TagMode = "all") -> ColumnElement[bool]:
+    """``Resource.id IN (...)`` predicate answered from the ``(tag, resource_id)`` index."""
+    unique = list(dict.fromkeys(tags))
+    matching = select(ResourceTag.resource_id).where(ResourceTag.tag.in_(unique))
+    if mode == "all" and len(unique) > 1:
+        matching = matching.group_by(ResourceTag.resource_id).having(func.count() == len(unique))
+    return Resource.id.in_(matching)
+
+
+async def tag_facets(
+    session: AsyncSession, filters: Sequence[ColumnElement[bool]] = (), limit: int = 100
+) -> list[tuple[str, int]]:
+    count = func.count().label("count")
+    query = select(ResourceTag.tag, count)
+    if filters:
+        query = query.join(Resource, Resource.id == ResourceTag.resource_id).where(*filters)
+    query = query.group_by(ResourceTag.tag).order_by(count.desc(), ResourceTag.tag).limit(limit)
+    result = await session.exec(query)
+    return [(tag, total) for tag, total in result.all()]
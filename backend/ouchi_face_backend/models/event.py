@@ -3,12 +3,18 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
 class Event(SQLModel, table=True):
+    """One committed catalog change; ``data`` is compact JSON and ids only ever grow."""
+
+    __table_args__ = (Index("ix_event_resource_id_id", "resource_id", "id"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    resource_id: int = Field(foreign_key="resource.id")
+    # Not a foreign key: a resource's events, its deletion included, outlive it.
+    resource_id: int
     type: str
     data: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+
+class HealthSample(SQLModel, table=True):
+    """One raw probe result; ``ts`` is a UTC unix timestamp in seconds."""
+
+    __table_args__ = (Index("ix_healthsample_resource_ts", "resource_id", "ts"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    resource_id: int
+    ts: int
+    up: bool
+    latency_ms: Optional[float] = None
+
+
+class HealthRollup(SQLModel, table=True):
+    """Aggregated probe results for one ``resolution``-second bucket starting at ``bucket``."""
+
+    resource_id: int = Field(primary_key=True)
+    resolution: int = Field(primary_key=True)
+    bucket: int = Field(primary_key=True)
+    samples: int = 0
+    up_count: int = 0
+    latency_sum: float = 0.0
+    latency_count: int = 0
+    latency_max: Optional[float] = None
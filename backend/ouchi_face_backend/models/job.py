@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from sqlmodel import Field, SQLModel
+
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class SyncJob(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    status: JobStatus = Field(default=JobStatus.PENDING, index=True)
+    repo_url: str
+    branch: Optional[str] = None
+    subpath: Optional[str] = None
+    resource_id: Optional[int] = None
+    progress: Optional[str] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    sync_ms: Optional[float] = None
+    db_ms: Optional[float] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -4,8 +4,8 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
-from sqlalchemy import Column
-from sqlalchemy.types import JSON
+from sqlalchemy import Column, Index
+from sqlalchemy.types import JSON, LargeBinary
 from sqlmodel import Field, SQLModel
 
 
@@ -21,6 +21,8 @@ class ResourceSource(str, Enum):
 
 
 class Resource(SQLModel, table=True):
+    __table_args__ = (Index("ix_resource_modified_at_id", "modified_at", "id"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     kind: ResourceKind
     name: str = Field(index=True)
@@ -30,17 +32,42 @@ class Resource(SQLModel, table=True):
     url: Optional[str] = None
     path: Optional[str] = None
     repo_url: Optional[str] = Field(default=None, index=True)
+    repo_branch: Optional[str] = None
+    repo_subpath: Optional[str] = None
+    repo_commit_sha: Optional[str] = None
+    metadata_hash: Optional[str] = None
     owner: Optional[str] = None
     thumbnail_path: Optional[str] = None
+    # Digest of the thumbnail image in the variant cache, for /api/thumbnails/{digest}/{size}.
+    thumbnail_hash: Optional[str] = None
     license: Optional[str] = None
     healthcheck_path: Optional[str] = None
     updated_at: Optional[datetime] = None
     last_synced_at: Optional[datetime] = None
     health_status: str = Field(default="unknown", index=True)
-    health_checked_at: Optional[datetime] = None
+    health_checked_at: Optional[datetime] = Field(default=None, index=True)
+    health_latency_ms: Optional[float] = None
     source: ResourceSource = Field(default=ResourceSource.MANUAL, index=True)
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
     modified_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
 
     def touch(self) -> None:
         self.modified_at = datetime.utcnow()
+
+
+class ResourceTag(SQLModel, table=True):
+    """Normalized copy of ``Resource.tags`` so tag filters and facets can use an index."""
+
+    __table_args__ = (Index("ix_resourcetag_tag_resource", "tag", "resource_id"),)
+
+    resource_id: int = Field(primary_key=True)
+    tag: str = Field(primary_key=True)
+
+
+class ResourceReadme(SQLModel, table=True):
+    """README of a repository-backed resource, zlib-compressed and kept apart from ``Resource`` rows."""
+
+    resource_id: int = Field(primary_key=True)
+    content_hash: str
+    size: int
+    content: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
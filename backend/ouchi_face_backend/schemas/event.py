@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class CatalogEventRead(BaseModel):
+    model_config = {"from_attributes": True}
+
+    id: int
+    type: str
+    resource_id: int
+    data: dict[str, Any]
+    created_at: datetime
+
+
+class EventChangelogResponse(BaseModel):
+    events: list[CatalogEventRead]
+    # Pass back as ``since`` to continue; valid even when ``events`` is empty.
+    next: int
+    has_more: bool
+    # The requested position is older than the retained log (or unknown): reload the catalog, then follow ``next``.
+    reset: bool
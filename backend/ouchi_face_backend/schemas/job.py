@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, computed_field
+
+from ..models.job import JobStatus
+
+
+class SyncJobRead(BaseModel):
+    model_config = {"from_attributes": True}
+
+    id: int
+    status: JobStatus
+    repo_url: str
+    branch: Optional[str]
+    subpath: Optional[str]
+    resource_id: Optional[int]
+    progress: Optional[str]
+    error: Optional[str]
+    attempts: int
+    sync_ms: Optional[float]
+    db_ms: Optional[float]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+    @computed_field
+    @property
+    def total_ms(self) -> Optional[float]:
+        if not self.started_at or not self.finished_at:
+            return None
+        return (self.finished_at - self.started_at).total_seconds() * 1000
@@ -3,7 +3,8 @@ from __future__ import annotations
 from datetime import datetime, date
 from typing import Literal, Optional
 
-from pydantic import BaseModel, Field, HttpUrl, field_validator
+from pydantic import BaseModel, Field, HttpUrl, TypeAdapter, field_validator
+from typing_extensions import TypedDict
 
 from ..models.resource import ResourceKind, ResourceSource
 
@@ -61,20 +62,71 @@ class ResourceRead(BaseModel):
     repo_url: Optional[str]
     owner: Optional[str]
     thumbnail_path: Optional[str]
+    thumbnail_hash: Optional[str]
     license: Optional[str]
     healthcheck_path: Optional[str]
     updated_at: Optional[datetime]
     last_synced_at: Optional[datetime]
     health_status: str
     health_checked_at: Optional[datetime]
+    health_latency_ms: Optional[float] = None
     source: ResourceSource
     created_at: datetime
     modified_at: datetime
+    snippet: Optional[str] = None
 
 
 class ResourceListResponse(BaseModel):
     items: list[ResourceRead]
-    total: int
+    total: Optional[int]
+    total_is_estimate: bool = False
+    next_cursor: Optional[str] = None
+
+
+class ResourceRow(TypedDict):
+    """``ResourceRead`` as a plain mapping; serialized as is, without validation."""
+
+    id: int
+    kind: ResourceKind
+    name: str
+    slug: str
+    description: Optional[str]
+    tags: list[str]
+    url: Optional[str]
+    path: Optional[str]
+    repo_url: Optional[str]
+    owner: Optional[str]
+    thumbnail_path: Optional[str]
+    thumbnail_hash: Optional[str]
+    license: Optional[str]
+    healthcheck_path: Optional[str]
+    updated_at: Optional[datetime]
+    last_synced_at: Optional[datetime]
+    health_status: str
+    health_checked_at: Optional[datetime]
+    health_latency_ms: Optional[float]
+    source: ResourceSource
+    created_at: datetime
+    modified_at: datetime
+    snippet: Optional[str]
+
+
+class ResourceListRows(TypedDict):
+    """Wire format of ``ResourceListResponse`` built from database rows."""
+
+    items: list[ResourceRow]
+    total: Optional[int]
+    total_is_estimate: bool
+    next_cursor: Optional[str]
+
+
+# Compiled once; dumps list pages straight to JSON bytes.
+resource_list_json = TypeAdapter(ResourceListRows)
+
+
+class TagFacet(BaseModel):
+    tag: str
+    count: int
 
 
 class SyncResponse(BaseModel):
@@ -82,7 +134,67 @@ class SyncResponse(BaseModel):
     refreshed: bool
 
 
+class BulkSyncItem(BaseModel):
+    resource_id: int
+    repo_url: str
+    status: Literal["changed", "unchanged", "skipped", "failed"]
+    duration_ms: float = 0.0
+    error: Optional[str] = None
+
+
+class BulkSyncResponse(BaseModel):
+    changed: int
+    unchanged: int
+    skipped: int
+    failed: int
+    duration_ms: float
+    items: list[BulkSyncItem]
+
+
 class ResourceHealthResponse(BaseModel):
     resource_id: int
     status: str
     checked_at: Optional[datetime]
+    latency_ms: Optional[float] = None
+
+
+class HealthHistoryBucket(BaseModel):
+    start: datetime
+    samples: int
+    uptime: float
+    avg_latency_ms: Optional[float]
+
+
+class ResourceHealthHistoryResponse(BaseModel):
+    resource_id: int
+    since: datetime
+    until: datetime
+    samples: int
+    uptime: Optional[float]
+    avg_latency_ms: Optional[float]
+    buckets: list[HealthHistoryBucket]
+
+
+class CatalogImportError(BaseModel):
+    line: int
+    error: str
+
+
+class CatalogImportResponse(BaseModel):
+    created: int
+    updated: int
+    failed: int
+    duration_ms: float
+    errors: list[CatalogImportError]
+
+
+class CatalogCacheStats(BaseModel):
+    entries: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    hit_rate: float
+    stale: int
+    expired: int
+    evictions: int
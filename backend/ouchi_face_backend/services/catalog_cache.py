@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, Hashable, Iterable
+
+from ..core.config import settings
+from ..schemas.resource import CatalogCacheStats
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str | None = None
+    last_modified: datetime | None = None
+
+
+# What a loader hands back: the response and the resource it describes, or
+# None for responses that depend on the whole catalog (lists, facets).
+Loaded = tuple[CachedResponse, int | None]
+
+
+@dataclass
+class _Entry:
+    response: CachedResponse
+    resource_id: int | None
+    version: int
+    expires_at: float
+
+
+class CatalogCache:
+    """Bounded LRU of serialized catalog reads, invalidated through version counters.
+
+    Every invalidation advances one global version and records it as the
+    change version of the catalog and of each resource it names. An entry is
+    valid while nothing it depends on changed after the version it was loaded
+    at: list entries depend on the catalog, detail entries only on their own
+    resource. Versions are read before loading, so a write that commits while
+    a load is in flight keeps its stale result out of the cache.
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        ttl_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = settings.catalog_cache_entries if max_entries is None else max_entries
+        self.ttl_seconds = settings.catalog_cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.clock = clock
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._version = 0
+        self._catalog_changed = 0
+        self._all_changed = 0
+        self._resource_changed: dict[int, int] = {}
+        self._hits = self._misses = self._stale = self._expired = self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    async def fetch(self, key: Hashable, load: Callable[[], Awaitable[Loaded | None]]) -> CachedResponse | None:
+        """Cached response for ``key``, or whatever ``load`` returns (``None`` results are not cached)."""
+        return self.get(key) or await self.load(key, load)
+
+    def get(self, key: Hashable) -> CachedResponse | None:
+        """The cached response for ``key`` if it is still current."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if not self._is_current(entry):
+                self._stale += 1
+                del self._entries[key]
+            elif entry.expires_at <= self.clock():
+                self._expired += 1
+                del self._entries[key]
+            else:
+                self._hits += 1
+                self._entries.move_to_end(key)
+                return entry.response
+        return None
+
+    async def load(self, key: Hashable, load: Callable[[], Awaitable[Loaded | None]]) -> CachedResponse | None:
+        """Run ``load`` and cache its response under ``key`` unless a write overlapped it."""
+        self._misses += 1
+        version = self._version
+        loaded = await load()
+        if loaded is None:
+            return None
+        response, resource_id = loaded
+        entry = _Entry(response, resource_id, version, self.clock() + self.ttl_seconds)
+        if self.enabled and self._is_current(entry):
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return response
+
+    def invalidate(self, resource_ids: Iterable[int] | None = None) -> None:
+        """Mark the catalog changed, along with ``resource_ids`` (every resource when ``None``)."""
+        self._version += 1
+        self._catalog_changed = self._version
+        if resource_ids is None:
+            self._all_changed = self._version
+            self._resource_changed.clear()
+            return
+        for resource_id in resource_ids:
+            self._resource_changed[resource_id] = self._version
+
+    def clear(self) -> None:
+        self.invalidate()
+        self._entries.clear()
+
+    def stats(self) -> CatalogCacheStats:
+        lookups = self._hits + self._misses
+        return CatalogCacheStats(
+            entries=len(self._entries),
+            max_entries=self.max_entries,
+            ttl_seconds=self.ttl_seconds,
+            hits=self._hits,
+            misses=self._misses,
+            hit_rate=self._hits / lookups if lookups else 0.0,
+            stale=self._stale,
+            expired=self._expired,
+            evictions=self._evictions,
+        )
+
+    def _is_current(self, entry: _Entry) -> bool:
+        if entry.resource_id is None:
+            changed = self._catalog_changed
+        else:
+            changed = max(self._all_changed, self._resource_changed.get(entry.resource_id, 0))
+        return changed <= entry.version
+
+
+catalog_cache = CatalogCache()
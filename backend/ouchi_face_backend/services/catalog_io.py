@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import json
+import time
+from typing import Any, AsyncIterable, AsyncIterator, Callable
+
+from pydantic import ValidationError
+from sqlalchemy import select
+
+from ..core.config import settings
+from ..db.session import get_session
+from ..models.resource import Resource
+from ..schemas.resource import CatalogImportError, CatalogImportResponse, ResourceMetadata
+from .resource_service import ResourceService
+
+# A single record never comes close; anything longer is rejected unread.
+MAX_LINE_BYTES = 1024 * 1024
+# Only the first errors are reported back; ``failed`` still counts them all.
+MAX_REPORTED_ERRORS = 100
+
+
+async def iter_lines(chunks: AsyncIterable[bytes], max_line_bytes: int = MAX_LINE_BYTES) -> AsyncIterator[bytes | None]:
+    """Split a byte stream into lines without holding more than one line in memory.
+
+    Lines longer than ``max_line_bytes`` are skipped and reported as ``None``.
+    """
+    buffer = b""
+    oversized = False
+    async for chunk in chunks:
+        buffer += chunk
+        while (end := buffer.find(b"\n")) >= 0:
+            line, buffer = buffer[:end], buffer[end + 1 :]
+            yield None if oversized else line
+            oversized = False
+        if len(buffer) > max_line_bytes:
+            oversized, buffer = True, b""
+    if buffer or oversized:
+        yield None if oversized else buffer
+
+
+def export_record(resource: Resource) -> dict[str, Any]:
+    """The ``ouchi.yaml`` fields of ``resource``, which is also what an import accepts."""
+    record = {
+        "kind": resource.kind.value,
+        "name": resource.name,
+        "description": resource.description,
+        "tags": resource.tags,
+        "url": resource.url,
+        "path": resource.path,
+        "repo": resource.repo_url,
+        "healthcheck": resource.healthcheck_path,
+        "owner": resource.owner,
+        "license": resource.license,
+        "thumbnail": resource.thumbnail_path,
+        "updated": resource.updated_at.isoformat() if resource.updated_at else None,
+    }
+    return {key: value for key, value in record.items() if value not in (None, [])}
+
+
+class CatalogTransfer:
+    """Streams the catalog out as NDJSON and loads NDJSON back in fixed-size batches."""
+
+    def __init__(self, session_factory: Callable = get_session, batch_size: int | None = None) -> None:
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.catalog_batch_size
+
+    async def export(self) -> AsyncIterator[bytes]:
+        """Yield one NDJSON chunk per batch, walking ``resource`` by primary key."""
+        last_id = 0
+        while True:
+            async with self.session_factory() as session:
+                result = await session.exec(
+                    select(Resource).where(Resource.id > last_id).order_by(Resource.id).limit(self.batch_size)
+                )
+                resources = result.scalars().all()
+            if not resources:
+                return
+            last_id = resources[-1].id
+            yield "".join(
+                json.dumps(export_record(resource), ensure_ascii=False, separators=(",", ":")) + "\n"
+                for resource in resources
+            ).encode("utf-8")
+
+    async def import_lines(self, lines: AsyncIterable[bytes | None]) -> CatalogImportResponse:
+        started = time.perf_counter()
+        summary = CatalogImportResponse(created=0, updated=0, failed=0, duration_ms=0.0, errors=[])
+        batch: list[tuple[int, ResourceMetadata]] = []
+        line_number = 0
+        async with self.session_factory() as session:
+            service = ResourceService(session)
+            async for line in lines:
+                line_number += 1
+                if line is None:
+                    self._fail(summary, line_number, f"line exceeds {MAX_LINE_BYTES} bytes")
+                    continue
+                if not line.strip():
+                    continue
+                try:
+                    batch.append((line_number, ResourceMetadata.model_validate_json(line)))
+                except ValidationError as exc:
+                    self._fail(summary, line_number, _describe(exc))
+                if len(batch) >= self.batch_size:
+                    await self._write(service, batch, summary)
+                    batch = []
+            if batch:
+                await self._write(service, batch, summary)
+        summary.duration_ms = (time.perf_counter() - started) * 1000
+        return summary
+
+    async def _write(
+        self, service: ResourceService, batch: list[tuple[int, ResourceMetadata]], summary: CatalogImportResponse
+    ) -> None:
+        session = service.session
+        try:
+            created, updated = await service.import_batch([metadata for _, metadata in batch])
+            await service.commit()
+            # Keep the identity map from growing with every batch.
+            session.expunge_all()
+        except Exception:  # noqa: BLE001 - retry one by one to isolate the offending record
+            await service.rollback()
+        else:
+            summary.created += created
+            summary.updated += updated
+            return
+        for line_number, metadata in batch:
+            try:
+                created, updated = await service.import_batch([metadata])
+                await service.commit()
+            except Exception as exc:  # noqa: BLE001 - reported in the summary
+                await service.rollback()
+                self._fail(summary, line_number, str(getattr(exc, "orig", exc)))
+            else:
+                summary.created += created
+                summary.updated += updated
+        session.expunge_all()
+
+    @staticmethod
+    def _fail(summary: CatalogImportResponse, line_number: int, error: str) -> None:
+        summary.failed += 1
+        if len(summary.errors) < MAX_REPORTED_ERRORS:
+            summary.errors.append(CatalogImportError(line=line_number, error=error))
+
+
+def _describe(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'record'}: {error['msg']}" for error in exc.errors()
+    )
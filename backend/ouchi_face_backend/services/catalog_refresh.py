@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import logging
+from typing import Callable
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from ..core.config import settings
+from ..db.session import get_session
+from ..schemas.resource import BulkSyncResponse
+from .event_log import EventLogService
+from .resource_service import ResourceService
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogRefresher:
+    """Prunes the event log and, when ``repo_refresh_interval_seconds`` is set, re-syncs repository-backed resources."""
+
+    def __init__(self, session_factory: Callable = get_session) -> None:
+        self.scheduler = AsyncIOScheduler()
+        self.session_factory = session_factory
+
+    async def start(self) -> None:
+        self.scheduler.add_job(self.prune_events, "interval", seconds=settings.events_prune_interval_seconds)
+        if settings.repo_refresh_interval_seconds:
+            self.scheduler.add_job(self.refresh, "interval", seconds=settings.repo_refresh_interval_seconds)
+        self.scheduler.start()
+
+    async def shutdown(self) -> None:
+        if self.scheduler.running:
+            self.scheduler.shutdown()
+
+    async def refresh(self) -> BulkSyncResponse:
+        async with self.session_factory() as session:
+            summary = await ResourceService(session).sync_all()
+        logger.info(
+            "catalog refresh: %d changed, %d unchanged, %d skipped, %d failed in %.0f ms",
+            summary.changed,
+            summary.unchanged,
+            summary.skipped,
+            summary.failed,
+            summary.duration_ms,
+        )
+        return summary
+
+    async def prune_events(self) -> int:
+        async with self.session_factory() as session:
+            pruned = await EventLogService(session).prune()
+            await session.commit()
+        if pruned:
+            logger.info("event log: pruned %d events older than %d days", pruned, settings.events_retention_days)
+        return pruned
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Hashable
+
+from ..core.config import settings
+
+RESOURCE_CREATED = "resource.created"
+RESOURCE_UPDATED = "resource.updated"
+RESOURCE_DELETED = "resource.deleted"
+HEALTH_CHANGED = "health.changed"
+# Sent instead of whatever a subscriber fell too far behind on; clients reload.
+RESYNC = "resync"
+
+
+@dataclass
+class CatalogEvent:
+    type: str
+    resource_id: int
+    data: dict[str, Any] = field(default_factory=dict)
+    # Set once persisted to the event log; the id doubles as the SSE event id.
+    id: int | None = None
+    created_at: datetime | None = None
+
+    @property
+    def coalesce_key(self) -> Hashable:
+        # A newer event about the same resource and topic supersedes a pending one.
+        return self.type.partition(".")[0], self.resource_id
+
+
+def compact_json(data: dict[str, Any]) -> str:
+    return json.dumps(data, separators=(",", ":"))
+
+
+def encode_sse(event_id: int | None, event_type: str, data: dict[str, Any]) -> bytes:
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines += [f"event: {event_type}", "data: " + compact_json(data)]
+    return ("\n".join(lines) + "\n\n").encode()
+
+
+class Subscription:
+    """One subscriber's bounded buffer of encoded events, coalesced per resource and topic."""
+
+    def __init__(self, bus: EventBus, max_pending: int) -> None:
+        self._bus = bus
+        self._max_pending = max_pending
+        self._pending: OrderedDict[Hashable, bytes] = OrderedDict()
+        self._ready = asyncio.Event()
+
+    def push(self, key: Hashable, message: bytes) -> None:
+        if RESYNC in self._pending:
+            return
+        if key not in self._pending and len(self._pending) >= self._max_pending:
+            # Too far behind to catch up event by event: drop the backlog.
+            self._pending.clear()
+            self._pending[RESYNC] = encode_sse(None, RESYNC, {})
+        else:
+            # Re-queue at the end so event ids still arrive in increasing order.
+            self._pending.pop(key, None)
+            self._pending[key] = message
+        self._ready.set()
+
+    def drain(self) -> list[bytes]:
+        messages = list(self._pending.values())
+        self._pending.clear()
+        self._ready.clear()
+        return messages
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait until something is pending; ``False`` on timeout."""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def wake(self) -> None:
+        self._ready.set()
+
+    def close(self) -> None:
+        self._bus.unsubscribe(self)
+
+
+class EventBus:
+    """In-process pub/sub for catalog and health changes.
+
+    ``publish`` encodes an event once and hands the same bytes to every
+    subscriber, so its cost is a dict insert per open stream. Subscribers
+    that fall behind have updates to the same resource coalesced and, past
+    ``max_pending`` distinct resources, get a single ``resync`` instead.
+    """
+
+    def __init__(self, max_pending: int | None = None) -> None:
+        self.max_pending = max_pending or settings.events_max_pending
+        self._subscribers: set[Subscription] = set()
+        self._sequence = 0
+        self._closed = asyncio.Event()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self, self.max_pending)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def publish(self, events: list[CatalogEvent]) -> None:
+        if not self._subscribers:
+            return
+        for event in events:
+            self._sequence = event.id or self._sequence + 1
+            message = encode_sse(self._sequence, event.type, {"resource_id": event.resource_id, **event.data})
+            for subscription in self._subscribers:
+                subscription.push(event.coalesce_key, message)
+
+    async def stream(self, heartbeat: float | None = None) -> AsyncIterator[bytes]:
+        """Server-sent events for one client, with comment heartbeats to keep proxies from timing out."""
+        heartbeat = heartbeat or settings.events_heartbeat_seconds
+        subscription = self.subscribe()
+        try:
+            yield f"retry: {settings.events_retry_ms}\n\n".encode()
+            while not self._closed.is_set():
+                if await subscription.wait(heartbeat):
+                    yield b"".join(subscription.drain())
+                else:
+                    yield b": keepalive\n\n"
+        finally:
+            subscription.close()
+
+    def close(self) -> None:
+        """End every open stream, e.g. on shutdown."""
+        self._closed.set()
+        for subscription in list(self._subscribers):
+            subscription.wake()
+
+
+event_bus = EventBus()
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Sequence
+
+from sqlalchemy import delete, func, insert, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..core.config import settings
+from ..models.event import Event
+from .event_bus import CatalogEvent, compact_json
+
+
+@dataclass
+class ChangelogPage:
+    events: list[CatalogEvent]
+    # Where the next request continues; also returned when nothing new is there.
+    next_id: int = 0
+    has_more: bool = False
+    # The requested position was pruned or is unknown: reload, then follow from ``next_id``.
+    reset: bool = False
+
+
+def encode_data(data: dict) -> str | None:
+    """``data`` as compact JSON without ``None`` values; ``None`` when nothing is left."""
+    values = {key: value for key, value in data.items() if value is not None}
+    return compact_json(values) if values else None
+
+
+class EventLogService:
+    """Durable changelog of catalog and health events, written in the caller's transaction.
+
+    Row ids are SQLite rowids, so they grow with commit order as long as the
+    newest row is never deleted; :meth:`prune` keeps it for that reason.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def append(self, events: Sequence[CatalogEvent]) -> None:
+        """Insert ``events`` (not committed) and set their ``id``."""
+        if not events:
+            return
+        now = datetime.utcnow()
+        rows = [
+            {"resource_id": event.resource_id, "type": event.type, "data": encode_data(event.data), "created_at": now}
+            for event in events
+        ]
+        # RETURNING in parameter order would make this one statement per row.
+        # SQLite gives a new row max(rowid) + 1 and nobody else can insert
+        # before this transaction ends, so the batch holds the last len(rows) ids.
+        await self.session.exec(insert(Event), params=rows)
+        newest = (await self.session.exec(select(func.max(Event.id)))).scalar_one()
+        for event_id, event in enumerate(events, start=newest - len(events) + 1):
+            event.id, event.created_at = event_id, now
+
+    async def since(self, after_id: int, *, limit: int = 500, resource_id: int | None = None) -> ChangelogPage:
+        """Events after ``after_id`` in commit order, optionally for one resource only."""
+        result = await self.session.exec(
+            select(select(func.min(Event.id)).scalar_subquery(), select(func.max(Event.id)).scalar_subquery())
+        )
+        oldest, newest = result.one()
+        if newest is None:
+            return ChangelogPage(events=[], reset=after_id > 0)
+        if after_id < oldest - 1 or after_id > newest:
+            return ChangelogPage(events=[], next_id=newest, reset=True)
+
+        query = select(Event.id, Event.resource_id, Event.type, Event.data, Event.created_at).where(Event.id > after_id)
+        if resource_id is not None:
+            query = query.where(Event.resource_id == resource_id)
+        result = await self.session.exec(query.order_by(Event.id).limit(limit + 1))
+        rows = result.all()
+        page = ChangelogPage(
+            events=[
+                CatalogEvent(event_type, event_resource_id, json.loads(data) if data else {}, event_id, created_at)
+                for event_id, event_resource_id, event_type, data, created_at in rows[:limit]
+            ],
+            has_more=len(rows) > limit,
+        )
+        last_id = page.events[-1].id if page.events else after_id
+        # A filtered page that reached the end has seen everything up to the newest event.
+        page.next_id = last_id if page.has_more else max(last_id, newest)
+        return page
+
+    async def prune(self, now: datetime | None = None) -> int:
+        """Delete events older than ``events_retention_days``; returns how many went."""
+        cutoff = (now or datetime.utcnow()) - timedelta(days=settings.events_retention_days)
+        # Ids follow commit order, so everything before the first recent event
+        # is old; scanning from the oldest row stops there without an index on
+        # created_at. With no recent event at all, only the newest row stays.
+        first_recent = select(Event.id).where(Event.created_at >= cutoff).order_by(Event.id).limit(1).scalar_subquery()
+        newest = select(func.max(Event.id)).scalar_subquery()
+        result = await self.session.exec(delete(Event).where(Event.id < func.coalesce(first_recent, newest)))
+        return result.rowcount
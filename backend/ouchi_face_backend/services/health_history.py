@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import calendar
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Iterable
+
+from sqlalchemy import delete, insert, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..core.config import settings
+from ..models.health import HealthRollup, HealthSample
+
+if TYPE_CHECKING:
+    from .health_monitor import HealthCheckResult
+
+MINUTE = 60
+HOUR = 3600
+DAY = 86400
+
+
+def to_timestamp(value: datetime) -> int:
+    return calendar.timegm(value.utctimetuple())
+
+
+@dataclass
+class HealthBucket:
+    start: int
+    samples: int
+    up_count: int
+    latency_sum: float
+    latency_count: int
+
+
+@dataclass
+class HealthSummary:
+    since: int
+    until: int
+    buckets: list[HealthBucket]
+
+    @property
+    def samples(self) -> int:
+        return sum(bucket.samples for bucket in self.buckets)
+
+    @property
+    def uptime(self) -> float | None:
+        samples = self.samples
+        if not samples:
+            return None
+        return 100.0 * sum(bucket.up_count for bucket in self.buckets) / samples
+
+    @property
+    def avg_latency_ms(self) -> float | None:
+        count = sum(bucket.latency_count for bucket in self.buckets)
+        if not count:
+            return None
+        return sum(bucket.latency_sum for bucket in self.buckets) / count
+
+
+_ROLLUP_RAW = text(
+    """
+    INSERT INTO healthrollup (resource_id, resolution, bucket, samples, up_count, latency_sum, latency_count, latency_max)
+    SELECT resource_id, :resolution, (ts / :resolution) * :resolution, COUNT(*), SUM(up),
+           COALESCE(SUM(latency_ms), 0), COUNT(latency_ms), MAX(latency_ms)
+    FROM healthsample
+    WHERE ts < :cutoff
+    GROUP BY resource_id, ts / :resolution
+    ON CONFLICT (resource_id, resolution, bucket) DO UPDATE SET
+        samples = samples + excluded.samples,
+        up_count = up_count + excluded.up_count,
+        latency_sum = latency_sum + excluded.latency_sum,
+        latency_count = latency_count + excluded.latency_count,
+        latency_max = MAX(COALESCE(latency_max, excluded.latency_max), COALESCE(excluded.latency_max, latency_max))
+    """
+)
+
+_ROLLUP_TIER = text(
+    """
+    INSERT INTO healthrollup (resource_id, resolution, bucket, samples, up_count, latency_sum, latency_count, latency_max)
+    SELECT resource_id, :resolution, (bucket / :resolution) * :resolution, SUM(samples), SUM(up_count),
+           SUM(latency_sum), SUM(latency_count), MAX(latency_max)
+    FROM healthrollup
+    WHERE resolution = :source AND bucket < :cutoff
+    GROUP BY resource_id, bucket / :resolution
+    ON CONFLICT (resource_id, resolution, bucket) DO UPDATE SET
+        samples = samples + excluded.samples,
+        up_count = up_count + excluded.up_count,
+        latency_sum = latency_sum + excluded.latency_sum,
+        latency_count = latency_count + excluded.latency_count,
+        latency_max = MAX(COALESCE(latency_max, excluded.latency_max), COALESCE(excluded.latency_max, latency_max))
+    """
+)
+
+# Every sample lives in exactly one tier at a time (raw rows are deleted once
+# rolled up), so a window query can simply add up all tiers.
+_SUMMARY = text(
+    """
+    SELECT (start / :step) * :step AS slot, SUM(samples), SUM(up_count), SUM(latency_sum), SUM(latency_count)
+    FROM (
+        SELECT ts AS start, 1 AS samples, up AS up_count, COALESCE(latency_ms, 0) AS latency_sum,
+               latency_ms IS NOT NULL AS latency_count
+        FROM healthsample
+        WHERE resource_id = :resource_id AND ts >= :since AND ts < :until
+        UNION ALL
+        SELECT bucket, samples, up_count, latency_sum, latency_count
+        FROM healthrollup
+        WHERE resource_id = :resource_id AND bucket + resolution > :since AND bucket < :until
+    )
+    GROUP BY slot
+    ORDER BY slot
+    """
+)
+
+
+def _align(value: int, resolution: int) -> int:
+    return value - value % resolution
+
+
+class HealthHistoryService:
+    """Append-only probe history, downsampled into minute, hour and day buckets."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def record(self, results: Iterable[HealthCheckResult]) -> None:
+        rows = [
+            {
+                "resource_id": item.resource_id,
+                "ts": to_timestamp(item.checked_at),
+                "up": item.status == "up",
+                "latency_ms": item.latency_ms,
+            }
+            for item in results
+        ]
+        if rows:
+            await self.session.exec(insert(HealthSample), params=rows)
+
+    async def rollup(self, now: datetime | None = None) -> None:
+        now_ts = to_timestamp(now or datetime.utcnow())
+
+        cutoff = _align(now_ts - settings.health_raw_retention_hours * HOUR, MINUTE)
+        await self.session.exec(_ROLLUP_RAW.bindparams(resolution=MINUTE, cutoff=cutoff))
+        await self.session.exec(delete(HealthSample).where(HealthSample.ts < cutoff))
+
+        for source, target, retention in (
+            (MINUTE, HOUR, settings.health_minute_retention_hours * HOUR),
+            (HOUR, DAY, settings.health_hour_retention_days * DAY),
+        ):
+            cutoff = _align(now_ts - retention, target)
+            await self.session.exec(_ROLLUP_TIER.bindparams(resolution=target, source=source, cutoff=cutoff))
+            await self.session.exec(
+                delete(HealthRollup).where(HealthRollup.resolution == source, HealthRollup.bucket < cutoff)
+            )
+
+        cutoff = now_ts - settings.health_day_retention_days * DAY
+        await self.session.exec(delete(HealthRollup).where(HealthRollup.resolution == DAY, HealthRollup.bucket < cutoff))
+
+    async def summary(
+        self, resource_id: int, *, since: datetime, until: datetime | None = None, resolution: int = DAY
+    ) -> HealthSummary:
+        since_ts = to_timestamp(since)
+        until_ts = to_timestamp(until or datetime.utcnow()) + 1
+        result = await self.session.exec(
+            _SUMMARY.bindparams(resource_id=resource_id, since=since_ts, until=until_ts, step=resolution)
+        )
+        buckets = [
+            HealthBucket(start=slot, samples=samples, up_count=up_count, latency_sum=latency_sum, latency_count=latency_count)
+            for slot, samples, up_count, latency_sum, latency_count in result.all()
+        ]
+        return HealthSummary(since=since_ts, until=until_ts, buckets=buckets)
+
+    async def purge(self, resource_id: int) -> None:
+        await self.session.exec(delete(HealthSample).where(HealthSample.resource_id == resource_id))
+        await self.session.exec(delete(HealthRollup).where(HealthRollup.resource_id == resource_id))
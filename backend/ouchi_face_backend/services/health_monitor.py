@@ -1,24 +1,99 @@
 from __future__ import annotations
 
+import asyncio
+import time
+from dataclasses import dataclass
 from datetime import datetime
-from urllib.parse import urljoin
+from importlib.util import find_spec
+from typing import Callable
+from urllib.parse import urljoin, urlsplit
 
 import httpx
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from sqlalchemy import select
+from sqlalchemy import bindparam, select, update
 
 from ..core.config import settings
 from ..db.session import get_session
 from ..models.resource import Resource
+from .catalog_cache import CatalogCache, catalog_cache
+from .event_bus import HEALTH_CHANGED, CatalogEvent, EventBus, event_bus
+from .event_log import EventLogService
+from .health_history import HealthHistoryService
+from .health_schedule import HealthSchedule
+
+
+@dataclass
+class HealthCheckResult:
+    resource_id: int
+    status: str
+    checked_at: datetime
+    latency_ms: float | None = None
+
+
+HealthTarget = tuple[str, str | None]
+
+# Methods that servers commonly reject for HEAD even though GET works.
+_HEAD_UNSUPPORTED = {405, 501}
+
+# A Core executemany: unlike the ORM bulk UPDATE by primary key it does not
+# require every row to still exist.
+_resource = Resource.__table__
+_UPDATE_HEALTH = (
+    update(_resource)
+    .where(_resource.c.id == bindparam("resource_id"))
+    .values(
+        health_status=bindparam("status"),
+        health_checked_at=bindparam("checked_at"),
+        health_latency_ms=bindparam("latency_ms"),
+    )
+)
+
+
+def build_probe_client() -> httpx.AsyncClient:
+    """Shared client tuned for many small probes: keep-alive pooling and HTTP/2 when ``h2`` is installed."""
+    return httpx.AsyncClient(
+        timeout=settings.health_request_timeout,
+        http2=settings.health_http2 and find_spec("h2") is not None,
+        limits=httpx.Limits(
+            max_connections=settings.health_max_concurrency,
+            max_keepalive_connections=settings.health_max_keepalive_connections,
+            keepalive_expiry=settings.health_keepalive_expiry,
+        ),
+    )
 
 
 class HealthMonitor:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        client: httpx.AsyncClient | None = None,
+        session_factory: Callable = get_session,
+        cache: CatalogCache = catalog_cache,
+        events: EventBus = event_bus,
+    ) -> None:
         self.scheduler = AsyncIOScheduler()
-        self.client = httpx.AsyncClient(timeout=settings.health_request_timeout)
+        self.client = client or build_probe_client()
+        self.session_factory = session_factory
+        self.cache = cache
+        self.events = events
+        # Last known status per resource, so only transitions are announced.
+        self._statuses: dict[int, str] = {}
+        self._concurrency = asyncio.Semaphore(settings.health_max_concurrency)
+        self._host_limits: dict[str, asyncio.Semaphore] = {}
+        self._etags: dict[int, str] = {}
+        self.schedule = HealthSchedule(
+            base_interval=settings.health_check_interval_seconds,
+            min_interval=settings.health_min_interval_seconds,
+            max_interval=settings.health_max_interval_seconds,
+            backoff=settings.health_backoff_factor,
+            stable_after=settings.health_stable_after,
+            jitter=settings.health_jitter_ratio,
+        )
+        self._targets: dict[int, HealthTarget] | None = None
+        self._targets_loaded_at = 0.0
 
     async def start(self) -> None:
-        self.scheduler.add_job(self._run_checks, "interval", seconds=settings.health_check_interval_seconds)
+        self.scheduler.add_job(self._tick, "interval", seconds=settings.health_tick_seconds)
+        self.scheduler.add_job(self._rollup, "interval", seconds=settings.health_rollup_interval_seconds)
         self.scheduler.start()
 
     async def shutdown(self) -> None:
@@ -26,24 +101,121 @@ class HealthMonitor:
         if self.scheduler.running:
             self.scheduler.shutdown()
 
+    async def _tick(self) -> None:
+        now = time.monotonic()
+        if self._targets is None or now - self._targets_loaded_at >= settings.health_check_interval_seconds:
+            self._targets = await self._load_targets()
+            self._targets_loaded_at = now
+            self.schedule.sync(self._targets)
+
+        popped = self.schedule.pop_due(now)
+        try:
+            results = await self._probe([(rid, *self._targets[rid]) for rid in popped if rid in self._targets])
+            stored = await self._store(results)
+        except Exception:
+            # Popped ids are off the heap until recorded; put them back so they are not dropped for good.
+            self.schedule.requeue(popped)
+            raise
+        # Backoff and flap state only advance for results that were committed;
+        # deleted resources stay unscheduled until the next sync drops them.
+        for item in stored:
+            self.schedule.record(item.resource_id, item.status)
+
     async def _run_checks(self) -> None:
-        async with get_session() as session:
-            result = await session.exec(select(Resource).where(Resource.url.is_not(None)))
-            resources = result.all()
-            for resource in resources:
-                await self._check_resource(session, resource)
+        """Probe every resource with a URL right away, ignoring the schedule."""
+        targets = await self._load_targets()
+        await self._store(await self._probe([(rid, *target) for rid, target in targets.items()]))
+
+    async def _load_targets(self) -> dict[int, HealthTarget]:
+        # Read the targets up front and release the connection so that slow
+        # endpoints never hold a SQLite transaction open while we wait on them.
+        async with self.session_factory() as session:
+            result = await session.exec(
+                select(Resource.id, Resource.url, Resource.healthcheck_path, Resource.health_status).where(
+                    Resource.url.is_not(None)
+                )
+            )
+            rows = result.all()
+        for resource_id, _, _, status in rows:
+            self._statuses.setdefault(resource_id, status)
+        targets = {resource_id: (url, healthcheck_path) for resource_id, url, healthcheck_path, _ in rows}
+        # Forget validators of resources that were deleted or lost their URL.
+        self._etags = {resource_id: etag for resource_id, etag in self._etags.items() if resource_id in targets}
+        return targets
+
+    async def _probe(self, targets: list[tuple[int, str, str | None]]) -> list[HealthCheckResult]:
+        return list(await asyncio.gather(*(self._check_resource(*target) for target in targets)))
+
+    async def _store(self, results: list[HealthCheckResult]) -> list[HealthCheckResult]:
+        """Commit ``results`` and announce status changes; returns the results that were stored."""
+        if not results:
+            return []
+        async with self.session_factory() as session:
+            # Resources deleted while they were probed get no status, samples or events.
+            result = await session.exec(select(Resource.id).where(Resource.id.in_([item.resource_id for item in results])))
+            live = set(result.scalars().all())
+            for resource_id in {item.resource_id for item in results} - live:
+                self._statuses.pop(resource_id, None)
+            results = [item for item in results if item.resource_id in live]
+            if not results:
+                return []
+            # Only status transitions are logged, evict cached reads and reach
+            # subscribers; a fresher check time or latency on its own shows up
+            # once the cached entry expires.
+            changes = [
+                CatalogEvent(
+                    HEALTH_CHANGED,
+                    item.resource_id,
+                    {"status": item.status, "checked_at": item.checked_at.isoformat(), "latency_ms": item.latency_ms},
+                )
+                for item in results
+                if self._statuses.get(item.resource_id) != item.status
+            ]
+            await session.exec(_UPDATE_HEALTH, params=[vars(item) for item in results])
+            await HealthHistoryService(session).record(results)
+            await EventLogService(session).append(changes)
             await session.commit()
+        self._statuses.update((item.resource_id, item.status) for item in results)
+        if changes:
+            self.cache.invalidate([event.resource_id for event in changes])
+            self.events.publish(changes)
+        return results
 
-    async def _check_resource(self, session, resource: Resource) -> None:
-        if not resource.url:
-            return
-        target = resource.url
-        if resource.healthcheck_path:
-            target = urljoin(resource.url.rstrip("/") + "/", resource.healthcheck_path.lstrip("/"))
-        try:
-            response = await self.client.get(target)
-            resource.health_status = "up" if response.is_success else "down"
-        except httpx.HTTPError:
-            resource.health_status = "down"
-        resource.health_checked_at = datetime.utcnow()
-        await session.flush()
+    async def _rollup(self) -> None:
+        async with self.session_factory() as session:
+            await HealthHistoryService(session).rollup()
+            await session.commit()
+
+    async def _check_resource(self, resource_id: int, url: str, healthcheck_path: str | None = None) -> HealthCheckResult:
+        target = url
+        if healthcheck_path:
+            target = urljoin(url.rstrip("/") + "/", healthcheck_path.lstrip("/"))
+        headers = {"If-None-Match": self._etags[resource_id]} if resource_id in self._etags else None
+        latency_ms = None
+        async with self._host_limit(target), self._concurrency:
+            started = time.perf_counter()
+            try:
+                response = await self._request(target, headers)
+                latency_ms = round((time.perf_counter() - started) * 1000, 2)
+                status = "up" if response.is_success or response.status_code == 304 else "down"
+                if etag := response.headers.get("etag"):
+                    self._etags[resource_id] = etag
+            except (httpx.HTTPError, httpx.InvalidURL):
+                status = "down"
+        return HealthCheckResult(resource_id=resource_id, status=status, checked_at=datetime.utcnow(), latency_ms=latency_ms)
+
+    async def _request(self, target: str, headers: dict[str, str] | None) -> httpx.Response:
+        if settings.health_probe_method == "head":
+            response = await self.client.head(target, headers=headers)
+            if response.status_code not in _HEAD_UNSUPPORTED:
+                return response
+        # Only the status line and headers matter, so the body is never read.
+        async with self.client.stream("GET", target, headers=headers) as response:
+            return response
+
+    def _host_limit(self, target: str) -> asyncio.Semaphore:
+        host = urlsplit(target).netloc
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = self._host_limits[host] = asyncio.Semaphore(settings.health_per_host_concurrency)
+        return limit
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+FLAP_WINDOW = 6
+
+
+@dataclass
+class ProbeState:
+    interval: float
+    streak: int = 0
+    history: deque[str] = field(default_factory=lambda: deque(maxlen=FLAP_WINDOW))
+
+    @property
+    def last_status(self) -> str | None:
+        return self.history[-1] if self.history else None
+
+    @property
+    def flapping(self) -> bool:
+        transitions = sum(1 for prev, cur in zip(self.history, itertools.islice(self.history, 1, None)) if prev != cur)
+        return transitions >= 2
+
+
+class HealthSchedule:
+    """Per-resource probe schedule backed by a min-heap of next due times.
+
+    Resources that keep answering ``up`` back off geometrically towards
+    ``max_interval``; resources that are down or flapping are re-probed every
+    ``min_interval``. Every interval is jittered so probes spread out instead
+    of arriving in bursts.
+    """
+
+    def __init__(
+        self,
+        *,
+        base_interval: float,
+        min_interval: float,
+        max_interval: float,
+        backoff: float = 1.5,
+        stable_after: int = 3,
+        jitter: float = 0.1,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self.base_interval = base_interval
+        self.min_interval = min(min_interval, base_interval)
+        self.max_interval = max(max_interval, base_interval)
+        self.backoff = backoff
+        self.stable_after = stable_after
+        self.jitter = jitter
+        self.clock = clock
+        self.rng = rng
+        self._states: dict[int, ProbeState] = {}
+        self._due: dict[int, float] = {}
+        self._heap: list[tuple[float, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def sync(self, resource_ids: Iterable[int]) -> None:
+        """Track exactly ``resource_ids``; new ones are spread across the base interval."""
+        wanted = set(resource_ids)
+        for resource_id in list(self._states):
+            if resource_id not in wanted:
+                del self._states[resource_id]
+                self._due.pop(resource_id, None)
+        now = self.clock()
+        for resource_id in wanted - self._states.keys():
+            self._states[resource_id] = ProbeState(interval=self.base_interval)
+            self._push(resource_id, now + self.rng() * self.base_interval)
+
+    def pop_due(self, now: float | None = None) -> list[int]:
+        now = self.clock() if now is None else now
+        due: list[int] = []
+        while self._heap and self._heap[0][0] <= now:
+            when, resource_id = heapq.heappop(self._heap)
+            # Entries are invalidated lazily: only the latest push for a resource counts.
+            if self._due.get(resource_id) != when:
+                continue
+            del self._due[resource_id]
+            due.append(resource_id)
+        return due
+
+    def record(self, resource_id: int, status: str) -> float | None:
+        """Register a probe result and schedule the next probe; returns its due time."""
+        state = self._states.get(resource_id)
+        if state is None:
+            return None
+        state.streak = state.streak + 1 if state.last_status == status else 1
+        state.history.append(status)
+
+        if status != "up" or state.flapping:
+            state.interval = self.min_interval
+        elif state.streak > self.stable_after:
+            state.interval = min(self.max_interval, max(state.interval, self.base_interval) * self.backoff)
+        else:
+            state.interval = self.base_interval
+
+        due = self.clock() + self._jittered(state.interval)
+        self._push(resource_id, due)
+        return due
+
+    def requeue(self, resource_ids: Iterable[int]) -> None:
+        """Reschedule popped resources whose probe never got recorded, after ``min_interval``."""
+        now = self.clock()
+        for resource_id in resource_ids:
+            if resource_id in self._states and resource_id not in self._due:
+                self._push(resource_id, now + self._jittered(self.min_interval))
+
+    def next_due(self) -> float | None:
+        return min(self._due.values(), default=None)
+
+    def state(self, resource_id: int) -> ProbeState | None:
+        return self._states.get(resource_id)
+
+    def _jittered(self, interval: float) -> float:
+        return interval * (1 + self.jitter * (2 * self.rng() - 1))
+
+    def _push(self, resource_id: int, due: float) -> None:
+        self._due[resource_id] = due
+        heapq.heappush(self._heap, (due, resource_id))
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Callable
+
+from sqlalchemy import select, update
+
+from ..core.config import settings
+from ..db.session import get_session
+from ..models.job import JobStatus, SyncJob
+from .repo_sync import RepoSyncService
+from .resource_service import ResourceService
+
+logger = logging.getLogger(__name__)
+
+
+class SyncJobQueue:
+    """Runs repository registrations in the background.
+
+    Jobs are persisted in the ``syncjob`` table before they are queued, so a
+    restart picks up whatever was still pending or running. A job that was
+    running when the process died ``sync_job_max_attempts`` times is failed
+    instead, so one that brings the process down is not retried forever.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable = get_session,
+        repo_sync: RepoSyncService | None = None,
+        workers: int | None = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.repo_sync = repo_sync
+        self.workers = workers or settings.sync_job_workers
+        self._queue: asyncio.Queue[int] | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue()
+        max_attempts = settings.sync_job_max_attempts
+        async with self.session_factory() as session:
+            await session.exec(
+                update(SyncJob)
+                .where(SyncJob.status == JobStatus.RUNNING, SyncJob.attempts >= max_attempts)
+                .values(
+                    status=JobStatus.FAILED,
+                    progress="failed",
+                    error=f"interrupted {max_attempts} times; giving up",
+                    finished_at=datetime.utcnow(),
+                )
+            )
+            await session.exec(
+                update(SyncJob)
+                .where(SyncJob.status == JobStatus.RUNNING)
+                .values(status=JobStatus.PENDING, progress="requeued after restart")
+            )
+            result = await session.exec(select(SyncJob.id).where(SyncJob.status == JobStatus.PENDING).order_by(SyncJob.id))
+            pending = result.scalars().all()
+            await session.commit()
+        for job_id in pending:
+            self._queue.put_nowait(job_id)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def shutdown(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def join(self) -> None:
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def submit(self, repo_url: str, branch: str | None = None, subpath: str | None = None) -> SyncJob:
+        async with self.session_factory() as session:
+            job = SyncJob(repo_url=repo_url, branch=branch, subpath=subpath, progress="queued")
+            session.add(job)
+            await session.commit()
+            await session.refresh(job)
+        if self._queue is not None:
+            self._queue.put_nowait(job.id)
+        return job
+
+    async def get(self, job_id: int) -> SyncJob | None:
+        async with self.session_factory() as session:
+            return await session.get(SyncJob, job_id)
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except Exception:  # noqa: BLE001 - a worker must outlive any one job
+                # Loading or claiming the job failed (e.g. "database is locked").
+                logger.exception("sync job %d crashed", job_id)
+                await self._mark_crashed(job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _mark_crashed(self, job_id: int) -> None:
+        try:
+            await self._update(
+                job_id, status=JobStatus.FAILED, progress="failed", error="internal error", finished_at=datetime.utcnow()
+            )
+        except Exception:  # noqa: BLE001 - already logged; the job is requeued on restart if still RUNNING/PENDING
+            logger.exception("could not mark sync job %d as failed", job_id)
+
+    async def _run(self, job_id: int) -> None:
+        job = await self.get(job_id)
+        if job is None or job.status != JobStatus.PENDING:
+            return
+        await self._update(
+            job_id,
+            status=JobStatus.RUNNING,
+            progress="syncing repository",
+            started_at=datetime.utcnow(),
+            attempts=job.attempts + 1,
+        )
+        try:
+            async with self.session_factory() as session:
+                service = ResourceService(session, repo_sync=self.repo_sync)
+                started = time.perf_counter()
+                sync_result = await service.repo_sync.sync_async(job.repo_url, job.branch, job.subpath)
+                sync_ms = (time.perf_counter() - started) * 1000
+                await self._update(job_id, progress="writing catalog", sync_ms=sync_ms)
+
+                started = time.perf_counter()
+                resource = await service.store_sync_result(job.repo_url, job.branch, job.subpath, sync_result)
+                db_ms = (time.perf_counter() - started) * 1000
+        except Exception as exc:  # noqa: BLE001 - failures are reported through the job record
+            await self._update(
+                job_id, status=JobStatus.FAILED, progress="failed", error=str(exc), finished_at=datetime.utcnow()
+            )
+            return
+        await self._update(
+            job_id,
+            status=JobStatus.SUCCEEDED,
+            progress="done",
+            resource_id=resource.id,
+            db_ms=db_ms,
+            finished_at=datetime.utcnow(),
+        )
+
+    async def _update(self, job_id: int, **values: Any) -> None:
+        async with self.session_factory() as session:
+            await session.exec(update(SyncJob).where(SyncJob.id == job_id).values(**values))
+            await session.commit()
@@ -19,8 +19,12 @@ def load_ouchi_metadata(root: Path) -> ResourceMetadata:
     yaml_path = root / "ouchi.yaml"
     if not yaml_path.exists():
         raise OuchiMetadataError(f"ouchi.yaml not found in {root}")
+    return parse_ouchi_metadata(yaml_path.read_text(encoding="utf-8"))
+
+
+def parse_ouchi_metadata(content: str) -> ResourceMetadata:
     try:
-        raw: dict[str, Any] = _yaml.load(yaml_path.read_text(encoding="utf-8")) or {}
+        raw: dict[str, Any] = _yaml.load(content) or {}
     except Exception as exc:  # noqa: BLE001 - want to expose parse issues
         raise OuchiMetadataError(f"Failed to parse ouchi.yaml: {exc}") from exc
 
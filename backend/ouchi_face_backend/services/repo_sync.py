@@ -1,16 +1,116 @@
 from __future__ import annotations
 
+import asyncio
+import codecs
+import hashlib
+import posixpath
 import shutil
-from dataclasses import dataclass
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Callable, Iterable, Iterator, Optional
 from urllib.parse import urlparse
 
-from git import Repo
+from git import Commit, Git, Repo
 
 from ..core.config import settings
 from ..schemas.resource import ResourceMetadata
-from .ouchi_parser import OuchiMetadataError, load_ouchi_metadata
+from ..utils.markdown import index_text
+from .ouchi_parser import OuchiMetadataError, parse_ouchi_metadata
+from .thumbnails import CACHE_DIR_NAME, ThumbnailStore
+
+README_CANDIDATES = ("README.md", "README.MD", "readme.md")
+READ_CHUNK_SIZE = 64 * 1024
+
+ChunkReader = Callable[[str], Optional[Iterator[bytes]]]
+
+_executor: ThreadPoolExecutor | None = None
+
+
+def get_sync_executor() -> ThreadPoolExecutor:
+    """Bounded pool that runs git and YAML work away from the event loop."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.repo_sync_workers, thread_name_prefix="repo-sync")
+    return _executor
+
+
+def shutdown_sync_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+@dataclass
+class _RepoLock:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    users: int = 0
+
+
+_repo_locks: dict[Path, _RepoLock] = {}
+
+
+@asynccontextmanager
+async def _repo_lock(repo_dir: Path) -> AsyncIterator[None]:
+    """Hold ``repo_dir`` exclusively; waiting happens on the event loop, not in a pool thread.
+
+    Only the event loop touches ``_repo_locks``, and an entry is dropped as
+    soon as nobody holds or waits for it.
+    """
+    entry = _repo_locks.setdefault(repo_dir, _RepoLock())
+    entry.users += 1
+    try:
+        async with entry.lock:
+            yield
+    finally:
+        entry.users -= 1
+        if not entry.users:
+            del _repo_locks[repo_dir]
+
+
+@dataclass
+class ReadmeDocument:
+    """A README consumed chunk by chunk.
+
+    The full text is only ever held zlib-compressed; besides that, just the
+    first ``readme_index_max_chars`` characters are kept, stripped of
+    Markdown, for the search index.
+    """
+
+    content_hash: str
+    size: int
+    compressed: bytes
+    search_text: str
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[bytes], max_chars: int | None = None) -> ReadmeDocument:
+        max_chars = settings.readme_index_max_chars if max_chars is None else max_chars
+        digest = hashlib.sha256()
+        compressor = zlib.compressobj()
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        compressed: list[bytes] = []
+        text: list[str] = []
+        size = kept = 0
+        for chunk in chunks:
+            size += len(chunk)
+            digest.update(chunk)
+            compressed.append(compressor.compress(chunk))
+            # One character past the limit tells index_text whether a word was cut.
+            if kept <= max_chars:
+                part = decoder.decode(chunk)[: max_chars + 1 - kept]
+                text.append(part)
+                kept += len(part)
+        compressed.append(compressor.flush())
+        return cls(
+            content_hash=digest.hexdigest(),
+            size=size,
+            compressed=b"".join(compressed),
+            search_text=index_text("".join(text), max_chars),
+        )
 
 
 @dataclass
@@ -18,13 +118,42 @@ class RepoSyncResult:
     metadata: ResourceMetadata
     repo_path: Path
     metadata_root: Path
-    readme: Optional[str]
+    readme: Optional[ReadmeDocument]
+    commit_sha: Optional[str] = None
+    content_hash: Optional[str] = None
+    thumbnail_hash: Optional[str] = None
+
+
+def metadata_hash(ouchi_yaml: str, readme_hash: str | None, thumbnail_hash: str | None = None) -> str:
+    digest = hashlib.sha256(ouchi_yaml.encode("utf-8"))
+    if readme_hash is not None:
+        digest.update(b"\0readme:")
+        digest.update(readme_hash.encode("ascii"))
+    if thumbnail_hash is not None:
+        digest.update(b"\0thumbnail:")
+        digest.update(thumbnail_hash.encode("ascii"))
+    return digest.hexdigest()
+
+
+def sparse_patterns(subpath: str | None) -> list[str]:
+    """Non-cone sparse-checkout patterns covering only the files a sync reads."""
+    prefix = f"/{subpath.strip('/')}/" if subpath and subpath.strip("/") else "/"
+    return [prefix + name for name in ("ouchi.yaml", *README_CANDIDATES)]
 
 
 class RepoSyncService:
-    def __init__(self, storage_dir: Path | None = None) -> None:
+    def __init__(
+        self,
+        storage_dir: Path | None = None,
+        fetch_mode: str | None = None,
+        storage_mode: str | None = None,
+        thumbnails: ThumbnailStore | None = None,
+    ) -> None:
         self.storage_dir = storage_dir or settings.repo_storage_dir
         self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.fetch_mode = fetch_mode or settings.repo_fetch_mode
+        self.storage_mode = storage_mode or settings.repo_storage_mode
+        self.thumbnails = thumbnails or ThumbnailStore(self.storage_dir / CACHE_DIR_NAME)
 
     def _resolve_repo_dir(self, repo_url: str) -> Path:
         parsed = urlparse(repo_url)
@@ -32,37 +161,182 @@ class RepoSyncService:
         safe_name = repo_name.replace(" ", "-")
         return self.storage_dir / safe_name
 
+    def remote_head(self, repo_url: str, branch: str | None = None) -> str | None:
+        """Commit SHA the remote currently advertises for ``branch`` (or HEAD), without fetching."""
+        output = Git().ls_remote(repo_url, f"refs/heads/{branch}" if branch else "HEAD")
+        for line in output.splitlines():
+            sha, _, _ = line.partition("\t")
+            if sha:
+                return sha
+        return None
+
+    async def remote_head_async(self, repo_url: str, branch: str | None = None) -> str | None:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_sync_executor(), partial(self.remote_head, repo_url, branch))
+
+    async def sync_async(self, repo_url: str, branch: str | None = None, subpath: str | None = None) -> RepoSyncResult:
+        loop = asyncio.get_running_loop()
+        # Two syncs of the same repository would otherwise clone or reset the same directory concurrently.
+        async with _repo_lock(self._resolve_repo_dir(repo_url).resolve()):
+            future = loop.run_in_executor(get_sync_executor(), partial(self.sync, repo_url, branch, subpath))
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # The thread cannot be stopped; keep the directory locked until it is done with it.
+                await asyncio.wait([future])
+                raise
+
     def sync(self, repo_url: str, branch: str | None = None, subpath: str | None = None) -> RepoSyncResult:
+        """Blocking sync; callers must not run two for the same repository at once (:meth:`sync_async` does not)."""
         repo_dir = self._resolve_repo_dir(repo_url)
+        if self.storage_mode == "bare":
+            repo_dir = repo_dir.with_name(f"{repo_dir.name}.git")
+            commit = self._sync_bare(repo_url, repo_dir, branch)
+            read = self._tree_reader(commit, subpath)
+            metadata_root = repo_dir / subpath if subpath else repo_dir
+        else:
+            commit = self._sync_checkout(repo_url, repo_dir, branch, subpath).head.commit
+            metadata_root = (repo_dir / subpath if subpath else repo_dir).resolve()
+            read = self._file_reader(metadata_root)
+
+        chunks = read("ouchi.yaml")
+        if chunks is None:
+            raise OuchiMetadataError(f"ouchi.yaml not found in {metadata_root}")
+        content = b"".join(chunks).decode("utf-8")
+        metadata = parse_ouchi_metadata(content)
+        if not metadata.repo:
+            metadata.repo = repo_url  # type: ignore[assignment]
+
+        readme = None
+        for candidate in README_CANDIDATES:
+            chunks = read(candidate)
+            if chunks is not None:
+                readme = ReadmeDocument.from_chunks(chunks)
+                break
+
+        thumbnail_hash = None
+        source = self._read_thumbnail(commit, subpath, metadata.thumbnail)
+        if source is not None:
+            thumbnail_hash = self.thumbnails.store(source)
+
+        return RepoSyncResult(
+            metadata=metadata,
+            repo_path=repo_dir,
+            metadata_root=metadata_root,
+            readme=readme,
+            commit_sha=commit.hexsha,
+            content_hash=metadata_hash(content, readme.content_hash if readme else None, thumbnail_hash),
+            thumbnail_hash=thumbnail_hash,
+        )
+
+    def _sync_checkout(self, repo_url: str, repo_dir: Path, branch: str | None, subpath: str | None) -> Repo:
         if repo_dir.exists() and (repo_dir / ".git").exists():
             repo = Repo(repo_dir)
-            origin = repo.remotes.origin
-            origin.fetch()
-            checkout_branch = branch or repo.active_branch.name
-            repo.git.checkout(checkout_branch)
-            origin.pull()
+            if self.fetch_mode == "shallow":
+                self._update_shallow(repo, branch, subpath)
+            else:
+                origin = repo.remotes.origin
+                origin.fetch()
+                checkout_branch = branch or repo.active_branch.name
+                repo.git.checkout(checkout_branch)
+                origin.pull()
+            return repo
+        if repo_dir.exists():
+            shutil.rmtree(repo_dir)
+        if self.fetch_mode == "shallow":
+            return self._clone_shallow(repo_url, repo_dir, branch, subpath)
+        repo = Repo.clone_from(repo_url, repo_dir)
+        if branch:
+            repo.git.checkout(branch)
+        return repo
+
+    def _sync_bare(self, repo_url: str, repo_dir: Path, branch: str | None) -> Commit:
+        """Keep a blob-less bare mirror of ``branch`` and return its tip; no working tree is written."""
+        depth = {"depth": 1} if self.fetch_mode == "shallow" else {}
+        if (repo_dir / "HEAD").exists():
+            repo = Repo(repo_dir)
+            ref = branch or repo.head.reference.name
+            repo.remotes.origin.fetch(f"+refs/heads/{ref}:refs/heads/{ref}", filter="blob:none", **depth)
         else:
             if repo_dir.exists():
                 shutil.rmtree(repo_dir)
-            repo = Repo.clone_from(repo_url, repo_dir)
+            options = {"bare": True, "filter": "blob:none", "single_branch": True, **depth}
             if branch:
-                repo.git.checkout(branch)
+                options["branch"] = branch
+            repo = Repo.clone_from(repo_url, repo_dir, **options)
+            ref = branch or repo.head.reference.name
+        return repo.commit(f"refs/heads/{ref}")
 
-        metadata_root = repo_dir / subpath if subpath else repo_dir
-        metadata_root = metadata_root.resolve()
-        metadata = load_ouchi_metadata(metadata_root)
-        if not metadata.repo:
-            metadata.repo = repo_url  # type: ignore[assignment]
+    @staticmethod
+    def _file_reader(root: Path) -> ChunkReader:
+        def chunks(path: Path) -> Iterator[bytes]:
+            with path.open("rb") as handle:
+                yield from iter(partial(handle.read, READ_CHUNK_SIZE), b"")
 
-        readme_path = None
-        for candidate in ("README.md", "README.MD", "readme.md"):
-            potential = metadata_root / candidate
-            if potential.exists():
-                readme_path = potential
-                break
-        readme = readme_path.read_text(encoding="utf-8") if readme_path else None
+        def read(name: str) -> Iterator[bytes] | None:
+            path = root / name
+            return chunks(path) if path.exists() else None
+
+        return read
+
+    @staticmethod
+    def _read_thumbnail(commit: Commit, subpath: str | None, thumbnail: str | None) -> bytes | None:
+        """Bytes of the image ``ouchi.yaml`` names as its thumbnail.
+
+        The path is relative to the ``ouchi.yaml`` directory, or to the
+        repository root with a leading ``/``. It is read from the commit, not
+        the work tree, because sparse checkouts leave it out. URLs, paths
+        outside the repository and files over ``thumbnail_max_bytes`` give
+        ``None``.
+        """
+        if not thumbnail or "://" in thumbnail:
+            return None
+        base = "" if thumbnail.startswith("/") or not subpath else subpath.strip("/")
+        path = posixpath.normpath(posixpath.join(base, thumbnail.lstrip("/")))
+        if path == ".." or path.startswith("../"):
+            return None
+        try:
+            blob = commit.tree / path
+        except KeyError:
+            return None
+        # Asking for the size fetches a blob the partial clone does not have yet.
+        if blob.type != "blob" or blob.size > settings.thumbnail_max_bytes:
+            return None
+        return blob.data_stream.read()
+
+    @staticmethod
+    def _tree_reader(commit: Commit, subpath: str | None) -> ChunkReader:
+        prefix = subpath.strip("/") if subpath else ""
+
+        def read(name: str) -> Iterator[bytes] | None:
+            try:
+                blob = commit.tree / (f"{prefix}/{name}" if prefix else name)
+            except KeyError:
+                return None
+            # Missing blobs of the partial clone are fetched on demand by git cat-file.
+            return iter(partial(blob.data_stream.read, READ_CHUNK_SIZE), b"")
+
+        return read
+
+    def _clone_shallow(self, repo_url: str, repo_dir: Path, branch: str | None, subpath: str | None) -> Repo:
+        # Depth-1, blob-less clone: only the tip commit and its trees are
+        # downloaded; blobs are fetched lazily for the sparse paths below.
+        options = {"depth": 1, "filter": "blob:none", "no_checkout": True, "single_branch": True}
+        if branch:
+            options["branch"] = branch
+        repo = Repo.clone_from(repo_url, repo_dir, **options)
+        repo.git.sparse_checkout("set", "--no-cone", *sparse_patterns(subpath))
+        repo.git.checkout(branch or repo.active_branch.name)
+        return repo
 
-        return RepoSyncResult(metadata=metadata, repo_path=repo_dir, metadata_root=metadata_root, readme=readme)
+    def _update_shallow(self, repo: Repo, branch: str | None, subpath: str | None) -> None:
+        checkout_branch = branch or repo.active_branch.name
+        repo.git.sparse_checkout("set", "--no-cone", *sparse_patterns(subpath))
+        repo.remotes.origin.fetch(
+            f"+refs/heads/{checkout_branch}:refs/remotes/origin/{checkout_branch}", depth=1, filter="blob:none"
+        )
+        # The cache is never edited locally, so reset instead of merging into a shallow history.
+        repo.git.checkout("-B", checkout_branch, f"origin/{checkout_branch}")
 
 
-__all__ = ["RepoSyncService", "RepoSyncResult", "OuchiMetadataError"]
+__all__ = ["RepoSyncService", "RepoSyncResult", "ReadmeDocument", "OuchiMetadataError", "get_sync_executor", "shutdown_sync_executor"]
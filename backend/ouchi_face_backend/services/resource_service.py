@@ -1,27 +1,108 @@
 from __future__ import annotations
 
+import asyncio
+import time
 from datetime import datetime, date
-from typing import Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import Any, Literal, Sequence
 
-from sqlalchemy import case, select
+from sqlalchemy import and_, func, insert, not_, or_, select, tuple_, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Bundle
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ..db.fts import remove_resource_fts, search_resource_ids, upsert_resource_fts
+from ..core.config import settings
+from ..db.fts import (
+    count_matches,
+    fuzzy_groups,
+    merge_resource_fts,
+    remove_resource_fts,
+    search_resources,
+    upsert_fts_rows,
+    upsert_resources_fts,
+)
+from ..db.fts_query import SearchQuery, compile_query
+from ..db.readme import remove_readme, store_readme
+from ..db.tags import (
+    TagMode,
+    remove_resource_tags,
+    replace_resource_tags,
+    replace_resource_tags_bulk,
+    tag_facets,
+    tag_filter,
+)
+from ..models.event import Event
 from ..models.resource import Resource, ResourceKind, ResourceSource
 from ..schemas.resource import (
+    BulkSyncItem,
+    BulkSyncResponse,
     RepoResourceCreate,
     ResourceCreateRequest,
     ResourceMetadata,
     ResourceRead,
 )
+from ..utils.cursor import decode_cursor, encode_cursor
 from ..utils.slugify import slugify
-from .repo_sync import RepoSyncService
+from .catalog_cache import CatalogCache, catalog_cache
+from .event_bus import (
+    RESOURCE_CREATED,
+    RESOURCE_DELETED,
+    RESOURCE_UPDATED,
+    CatalogEvent,
+    EventBus,
+    event_bus,
+)
+from .event_log import EventLogService
+from .health_history import HealthHistoryService
+from .repo_sync import RepoSyncResult, RepoSyncService
+
+CountMode = Literal["exact", "estimate", "none"]
+
+# Filtered estimates stop counting after this many matches.
+ESTIMATE_CAP = 1000
+
+# A new slug is retried this many times if concurrent writers keep taking it.
+SLUG_ATTEMPTS = 5
+
+# Columns a new row needs that metadata does not provide.
+_NEW_RESOURCE_DEFAULTS = {
+    "source": ResourceSource.MANUAL,
+    "health_status": "unknown",
+    "repo_url": None,
+    "updated_at": None,
+}
+
+# The ResourceRead columns, for pages serialized without loading Resource objects.
+READ_COLUMNS = Bundle("resource", *(getattr(Resource, name) for name in ResourceRead.model_fields if name != "snippet"))
+
+# A staged resource and the README text to index for it (None: leave as is).
+StagedSync = tuple[Resource, str | None]
+
+
+@dataclass
+class ResourcePage:
+    items: Sequence[Resource]  # column rows instead with list_page(rows=True)
+    total: int | None
+    total_is_estimate: bool = False
+    next_cursor: str | None = None
+    snippets: dict[int, str] = field(default_factory=dict)
 
 
 class ResourceService:
-    def __init__(self, session: AsyncSession, repo_sync: RepoSyncService | None = None) -> None:
+    def __init__(
+        self,
+        session: AsyncSession,
+        repo_sync: RepoSyncService | None = None,
+        cache: CatalogCache = catalog_cache,
+        events: EventBus = event_bus,
+    ) -> None:
         self.session = session
         self.repo_sync = repo_sync or RepoSyncService()
+        self.cache = cache
+        self.events = events
+        # Resources changed since the last commit, announced once it succeeds.
+        self._changes: dict[int, CatalogEvent] = {}
 
     async def list_resources(
         self,
@@ -33,34 +114,135 @@ class ResourceService:
         limit: int = 50,
         offset: int = 0,
     ) -> tuple[Sequence[Resource], int]:
-        query = select(Resource)
-        if kind:
-            query = query.where(Resource.kind == kind)
-        if owner:
-            query = query.where(Resource.owner == owner)
-        if tag:
-            query = query.where(Resource.tags.contains([tag]))
+        page = await self.list_page(q=q, kind=kind, tags=[tag] if tag else None, owner=owner, limit=limit, offset=offset)
+        return page.items, page.total
+
+    async def list_page(
+        self,
+        *,
+        q: str | None = None,
+        kind: ResourceKind | None = None,
+        tags: Sequence[str] | None = None,
+        tag_mode: TagMode = "all",
+        owner: str | None = None,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: str | None = None,
+        count: CountMode = "exact",
+        rows: bool = False,
+    ) -> ResourcePage:
+        """Return one page ordered by ``(modified_at, id)`` descending.
 
-        id_order: Iterable[int] | None = None
+        With ``cursor`` the page starts right after the row the cursor points
+        at (keyset pagination), so deep pages cost the same as the first one;
+        ``offset`` is ignored in that case. Searches (``q``) are ordered by
+        relevance instead and page with ``offset``; their ``tag:``,
+        ``owner:`` and ``kind:`` fields narrow the result like the keyword
+        arguments do, and negated ones (``-tag:``) leave matches out. With ``rows`` the items are plain rows of the
+        ``ResourceRead`` columns rather than ``Resource`` objects.
+        """
+        entity = READ_COLUMNS if rows else Resource
+        filters = self._filters(kind=kind, owner=owner, tags=tags, tag_mode=tag_mode)
         if q:
-            ids = list(await search_resource_ids(self.session, q))
-            if not ids:
-                return [], 0
-            id_order = ids
-            query = query.where(Resource.id.in_(ids))
-
-        count_result = await self.session.exec(query.with_only_columns(Resource.id))
-        total = len(count_result.scalars().all())
-
-        query = query.order_by(Resource.modified_at.desc())
-        if id_order:
-            ordering = case({rid: index for index, rid in enumerate(id_order)}, value=Resource.id)
-            query = query.order_by(ordering)
-
-        query = query.offset(offset).limit(limit)
-        result = await self.session.exec(query)
+            search = compile_query(q)
+            filters += self._filters(kind=search.kind, owner=search.owner, tags=search.tags)
+            filters += self._exclusions(search)
+            if search.has_text:
+                return await self._search_page(search, filters, entity, limit=limit, offset=offset, count=count)
+
+        query = select(entity).where(*filters).order_by(Resource.modified_at.desc(), Resource.id.desc())
+        if cursor:
+            query = query.where(tuple_(Resource.modified_at, Resource.id) < decode_cursor(cursor))
+        else:
+            query = query.offset(offset)
+        result = await self.session.exec(query.limit(limit + 1))
         resources = result.scalars().all()
-        return resources, total
+
+        next_cursor = None
+        if len(resources) > limit:
+            resources = resources[:limit]
+            next_cursor = encode_cursor(resources[-1].modified_at, resources[-1].id)
+
+        total, estimated = await self._count(filters, count)
+        return ResourcePage(items=resources, total=total, total_is_estimate=estimated, next_cursor=next_cursor)
+
+    async def _search_page(
+        self, search: SearchQuery, filters: list, entity: Any, *, limit: int, offset: int, count: CountMode
+    ) -> ResourcePage:
+        match = search.exact_match
+        hits = await search_resources(self.session, match, filters, limit=limit + 1, offset=offset, entity=entity)
+        # Fall back to typo-tolerant matching only when the query matches
+        # nothing at all, so every page of one query uses the same expression.
+        if not hits and (offset == 0 or not await count_matches(self.session, match, filters, cap=1)):
+            fuzzy = search.match(await fuzzy_groups(self.session, search.terms, search.prefix_last))
+            if fuzzy != match:
+                match = fuzzy
+                hits = await search_resources(
+                    self.session, match, filters, limit=limit + 1, offset=offset, entity=entity
+                )
+
+        hits = hits[:limit]
+        if count == "none":
+            total, estimated = None, False
+        elif count == "estimate":
+            total = await count_matches(self.session, match, filters, cap=ESTIMATE_CAP)
+            estimated = total >= ESTIMATE_CAP
+        else:
+            total, estimated = await count_matches(self.session, match, filters), False
+        return ResourcePage(
+            items=[resource for resource, _ in hits],
+            total=total,
+            total_is_estimate=estimated,
+            snippets={resource.id: snippet for resource, snippet in hits},
+        )
+
+    async def tag_facets(
+        self, *, kind: ResourceKind | None = None, owner: str | None = None, limit: int = 100
+    ) -> list[tuple[str, int]]:
+        return await tag_facets(self.session, self._filters(kind=kind, owner=owner), limit=limit)
+
+    @staticmethod
+    def _filters(
+        *,
+        kind: ResourceKind | None = None,
+        owner: str | None = None,
+        tags: Sequence[str] | None = None,
+        tag_mode: TagMode = "all",
+    ) -> list:
+        filters = []
+        if kind:
+            filters.append(Resource.kind == kind)
+        if owner:
+            filters.append(Resource.owner == owner)
+        if tags:
+            filters.append(tag_filter(tags, tag_mode))
+        return filters
+
+    @staticmethod
+    def _exclusions(search: SearchQuery) -> list:
+        filters = []
+        if search.excluded_kinds:
+            filters.append(Resource.kind.not_in(search.excluded_kinds))
+        if search.excluded_owners:
+            filters.append(or_(Resource.owner.is_(None), Resource.owner.not_in(search.excluded_owners)))
+        if search.excluded_tags:
+            filters.append(not_(tag_filter(search.excluded_tags, "any")))
+        return filters
+
+    async def _count(self, filters: list, mode: CountMode) -> tuple[int | None, bool]:
+        if mode == "none":
+            return None, False
+        if mode == "estimate":
+            if not filters:
+                # MAX(id) is a single b-tree seek; it overshoots only by the number of deleted rows.
+                result = await self.session.exec(select(func.coalesce(func.max(Resource.id), 0)))
+                return result.scalar_one(), True
+            capped = select(Resource.id).where(*filters).limit(ESTIMATE_CAP).subquery()
+            result = await self.session.exec(select(func.count()).select_from(capped))
+            total = result.scalar_one()
+            return total, total >= ESTIMATE_CAP
+        result = await self.session.exec(select(func.count()).select_from(Resource).where(*filters))
+        return result.scalar_one(), False
 
     async def get_resource(self, resource_id: int) -> Resource | None:
         result = await self.session.exec(select(Resource).where(Resource.id == resource_id))
@@ -70,36 +252,201 @@ class ResourceService:
         result = await self.session.exec(select(Resource).where(Resource.slug == slug))
         return result.scalars().one_or_none()
 
+    async def get_timestamps(self, *, resource_id: int | None = None, slug: str | None = None) -> Row | None:
+        """``(id, modified_at, health_checked_at, last_synced_at)`` of one resource, without loading it."""
+        condition = Resource.id == resource_id if slug is None else Resource.slug == slug
+        result = await self.session.exec(
+            select(Resource.id, Resource.modified_at, Resource.health_checked_at, Resource.last_synced_at).where(condition)
+        )
+        return result.one_or_none()
+
+    async def catalog_watermark(self) -> Row:
+        """``(newest event id, latest health check)``; together they move whenever any list page can change.
+
+        Every catalog write, from any process, commits an event log entry, and
+        health checks always set ``health_checked_at``. Both are index lookups.
+        """
+        newest_event = select(func.max(Event.id)).scalar_subquery()
+        latest_check = select(func.max(Resource.health_checked_at)).scalar_subquery()
+        result = await self.session.exec(select(newest_event, latest_check))
+        return result.one()
+
     async def get_by_repo(self, repo_url: str) -> Resource | None:
         result = await self.session.exec(select(Resource).where(Resource.repo_url == repo_url))
         return result.scalars().one_or_none()
 
     async def create_or_update(self, payload: ResourceCreateRequest) -> Resource:
         if isinstance(payload, RepoResourceCreate):
-            sync_result = self.repo_sync.sync(payload.repo_url, payload.branch, payload.subpath)
-            resource = await self._apply_metadata(sync_result.metadata, ResourceSource.REPOSITORY)
-            resource.repo_url = str(payload.repo_url)
-            resource.last_synced_at = datetime.utcnow()
-            await self.session.commit()
-            await self.session.refresh(resource)
-            await upsert_resource_fts(self.session, resource)
-            await self.session.commit()
-            return resource
+            repo_url = str(payload.repo_url)
+            sync_result = await self.repo_sync.sync_async(repo_url, payload.branch, payload.subpath)
+            return await self.store_sync_result(repo_url, payload.branch, payload.subpath, sync_result)
 
         resource = await self._apply_metadata(payload.metadata, ResourceSource.MANUAL)
-        await self.session.commit()
-        await self.session.refresh(resource)
-        await upsert_resource_fts(self.session, resource)
-        await self.session.commit()
+        await upsert_resources_fts(self.session, [resource])
+        await self.commit()
         return resource
 
+    async def sync_resource(self, resource: Resource) -> tuple[Resource, bool]:
+        """Re-sync a repository-backed resource; returns ``(resource, refreshed)``.
+
+        The remote tip is checked with ``ls-remote`` first, so an unchanged
+        repository costs one round-trip and no database write. A new commit
+        that leaves ``ouchi.yaml`` and the README untouched only records the
+        new SHA.
+        """
+        sync_result = await self._fetch_if_changed(resource)
+        if sync_result is None:
+            return resource, False
+        if sync_result.content_hash == resource.metadata_hash:
+            self._record_unchanged(resource, sync_result)
+            await self.commit()
+            return resource, False
+        return await self.store_sync_result(resource.repo_url, resource.repo_branch, resource.repo_subpath, sync_result), True
+
+    async def sync_all(self, concurrency: int | None = None) -> BulkSyncResponse:
+        """Refresh every repository-backed resource.
+
+        Remote checks and fetches run in parallel (bounded by ``concurrency``);
+        the resulting writes are applied afterwards in a few batched
+        transactions rather than two commits per repository.
+        """
+        started = time.perf_counter()
+        result = await self.session.exec(
+            select(Resource).where(Resource.source == ResourceSource.REPOSITORY, Resource.repo_url.is_not(None))
+        )
+        resources = result.scalars().all()
+        limit = asyncio.Semaphore(concurrency or settings.bulk_sync_concurrency)
+
+        async def fetch(resource: Resource) -> tuple[Resource, BulkSyncItem, RepoSyncResult | None]:
+            async with limit:
+                fetch_started = time.perf_counter()
+                item = BulkSyncItem(resource_id=resource.id, repo_url=resource.repo_url, status="skipped")
+                sync_result = None
+                try:
+                    sync_result = await self._fetch_if_changed(resource)
+                    if sync_result is not None:
+                        item.status = "unchanged" if sync_result.content_hash == resource.metadata_hash else "changed"
+                except Exception as exc:  # noqa: BLE001 - one broken repository must not abort the sweep
+                    item.status, item.error = "failed", str(exc)
+                item.duration_ms = (time.perf_counter() - fetch_started) * 1000
+                return resource, item, sync_result
+
+        outcomes = await asyncio.gather(*(fetch(resource) for resource in resources))
+        pending = [outcome for outcome in outcomes if outcome[1].status in ("changed", "unchanged")]
+        batch_size = settings.bulk_sync_batch_size
+        for start in range(0, len(pending), batch_size):
+            await self._write_sync_batch(pending[start : start + batch_size])
+
+        items = [item for _, item, _ in outcomes]
+        if any(item.status == "changed" for item in items):
+            # Each batch leaves a small index segment behind; fold them together.
+            await merge_resource_fts(self.session)
+            await self.session.commit()
+        return BulkSyncResponse(
+            changed=sum(item.status == "changed" for item in items),
+            unchanged=sum(item.status == "unchanged" for item in items),
+            skipped=sum(item.status == "skipped" for item in items),
+            failed=sum(item.status == "failed" for item in items),
+            duration_ms=(time.perf_counter() - started) * 1000,
+            items=items,
+        )
+
+    async def _write_sync_batch(self, batch: list[tuple[Resource, BulkSyncItem, RepoSyncResult]]) -> None:
+        try:
+            staged = [await self._apply_sync_outcome(resource, item, sync_result) for resource, item, sync_result in batch]
+            await self._index_staged([entry for entry in staged if entry is not None])
+            await self.commit()
+            return
+        except Exception:  # noqa: BLE001 - retry one by one to isolate the offending row
+            await self.rollback()
+        for resource, item, sync_result in batch:
+            try:
+                await self.session.refresh(resource)
+                if entry := await self._apply_sync_outcome(resource, item, sync_result):
+                    await self._index_staged([entry])
+                await self.commit()
+            except Exception as exc:  # noqa: BLE001 - reported in the summary
+                await self.rollback()
+                item.status, item.error = "failed", str(exc)
+
+    async def _apply_sync_outcome(
+        self, resource: Resource, item: BulkSyncItem, sync_result: RepoSyncResult
+    ) -> StagedSync | None:
+        """Stage one sync outcome; returns it when the search index entry needs rewriting."""
+        if item.status == "unchanged":
+            self._record_unchanged(resource, sync_result)
+            return None
+        return await self._stage_sync_result(resource.repo_url, resource.repo_branch, resource.repo_subpath, sync_result)
+
+    async def _fetch_if_changed(self, resource: Resource) -> RepoSyncResult | None:
+        repo_url, branch = resource.repo_url, resource.repo_branch
+        if resource.repo_commit_sha and await self.repo_sync.remote_head_async(repo_url, branch) == resource.repo_commit_sha:
+            return None
+        return await self.repo_sync.sync_async(repo_url, branch, resource.repo_subpath)
+
+    def _record_unchanged(self, resource: Resource, sync_result: RepoSyncResult) -> None:
+        resource.repo_commit_sha = sync_result.commit_sha
+        resource.last_synced_at = datetime.utcnow()
+        self._record_change(RESOURCE_UPDATED, resource.id, resource.slug)
+
+    async def store_sync_result(
+        self, repo_url: str, branch: str | None, subpath: str | None, sync_result: RepoSyncResult
+    ) -> Resource:
+        entry = await self._stage_sync_result(repo_url, branch, subpath, sync_result)
+        await self._index_staged([entry])
+        await self.commit()
+        return entry[0]
+
+    async def _stage_sync_result(
+        self, repo_url: str, branch: str | None, subpath: str | None, sync_result: RepoSyncResult
+    ) -> StagedSync:
+        """Write a sync result to the session; the README is only rewritten when its hash changed."""
+        resource = await self._apply_metadata(sync_result.metadata, ResourceSource.REPOSITORY)
+        resource.repo_url = repo_url
+        resource.repo_branch = branch
+        resource.repo_subpath = subpath
+        resource.repo_commit_sha = sync_result.commit_sha
+        resource.metadata_hash = sync_result.content_hash
+        resource.thumbnail_hash = sync_result.thumbnail_hash
+        resource.last_synced_at = datetime.utcnow()
+        await self.session.flush()
+        return resource, await store_readme(self.session, resource.id, sync_result.readme)
+
+    async def _index_staged(self, staged: Sequence[StagedSync]) -> None:
+        readmes = {resource.id: readme for resource, readme in staged if readme is not None}
+        await upsert_resources_fts(self.session, [resource for resource, _ in staged], readmes)
+
     async def delete(self, resource_id: int) -> None:
         resource = await self.get_resource(resource_id)
         if not resource:
             return
         await self.session.delete(resource)
         await remove_resource_fts(self.session, resource_id)
+        await remove_resource_tags(self.session, resource_id)
+        await remove_readme(self.session, resource_id)
+        await HealthHistoryService(self.session).purge(resource_id)
+        self._record_change(RESOURCE_DELETED, resource_id, resource.slug)
+        await self.commit()
+
+    async def commit(self) -> None:
+        """Commit along with an event log entry per changed resource, then drop their cached reads and publish."""
+        changes = list(self._changes.values())
+        await EventLogService(self.session).append(changes)
         await self.session.commit()
+        self._changes = {}
+        if changes:
+            self.cache.invalidate([event.resource_id for event in changes])
+            self.events.publish(changes)
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
+        self._changes = {}
+
+    def _record_change(self, event_type: str, resource_id: int, slug: str) -> None:
+        previous = self._changes.get(resource_id)
+        if previous is not None and previous.type == RESOURCE_CREATED and event_type == RESOURCE_UPDATED:
+            return  # still new as far as anyone outside this transaction knows
+        self._changes[resource_id] = CatalogEvent(event_type, resource_id, {"slug": slug})
 
     async def _apply_metadata(self, metadata: ResourceMetadata, source: ResourceSource) -> Resource:
         base_slug = slugify(metadata.name)
@@ -107,52 +454,125 @@ class ResourceService:
         if metadata.repo and not resource:
             resource = await self.get_by_repo(str(metadata.repo))
 
-        if resource:
-            resource.kind = metadata.kind
-            resource.name = metadata.name
-            resource.slug = base_slug
-            resource.description = metadata.description
-            resource.tags = metadata.tags
-            resource.url = str(metadata.url) if metadata.url else None
-            resource.path = metadata.path
-            resource.owner = metadata.owner
-            resource.license = metadata.license
-            resource.thumbnail_path = metadata.thumbnail
-            resource.healthcheck_path = metadata.healthcheck
+        if resource is None:
+            values = {**_NEW_RESOURCE_DEFAULTS, "slug": base_slug, "source": source, **self._metadata_values(metadata)}
+            resource = await self._insert_resource({**values, "created_at": values["modified_at"]})
+            self._record_change(RESOURCE_CREATED, resource.id, resource.slug)
         else:
-            slug = await self._ensure_unique_slug(base_slug)
-            resource = Resource(
-                kind=metadata.kind,
-                name=metadata.name,
-                slug=slug,
-                description=metadata.description,
-                tags=metadata.tags,
-                url=str(metadata.url) if metadata.url else None,
-                path=metadata.path,
-                owner=metadata.owner,
-                license=metadata.license,
-                thumbnail_path=metadata.thumbnail,
-                healthcheck_path=metadata.healthcheck,
-                source=source,
+            resource.slug = base_slug
+            self._assign_metadata(resource, metadata)
+            resource.source = source
+            await self.session.flush()
+            self._record_change(RESOURCE_UPDATED, resource.id, resource.slug)
+        await replace_resource_tags(self.session, resource.id, resource.tags)
+        return resource
+
+    async def import_batch(self, records: Sequence[ResourceMetadata]) -> tuple[int, int]:
+        """Upsert many metadata records with a handful of statements; returns ``(created, updated)``.
+
+        Records are matched like :meth:`create_or_update` does (slug first,
+        then repository URL), and a later record for the same slug wins.
+        Imported rows keep their existing ``source``; new ones are manual.
+        Updated rows forget their last synced commit and metadata hash, so the
+        next sync of a repository-backed row rewrites the imported metadata.
+        Rows are written with bulk statements rather than ORM objects, whose
+        construction would dominate the cost. Nothing is committed.
+        """
+        latest = {slugify(metadata.name): metadata for metadata in records}
+        result = await self.session.exec(select(Resource.slug, Resource.id).where(Resource.slug.in_(list(latest))))
+        by_slug = dict(result.all())
+        repos = [str(metadata.repo) for slug, metadata in latest.items() if slug not in by_slug and metadata.repo]
+        by_repo = {}
+        if repos:
+            result = await self.session.exec(select(Resource.repo_url, Resource.id).where(Resource.repo_url.in_(repos)))
+            by_repo = dict(result.all())
+
+        updates, inserts = [], []
+        for slug, metadata in latest.items():
+            values = {"slug": slug, **self._metadata_values(metadata)}
+            resource_id = by_slug.get(slug) or (by_repo.get(str(metadata.repo)) if metadata.repo else None)
+            if resource_id is None:
+                inserts.append({**_NEW_RESOURCE_DEFAULTS, "created_at": values["modified_at"], **values})
+            else:
+                updates.append({"id": resource_id, **values, "repo_commit_sha": None, "metadata_hash": None})
+
+        if updates:
+            await self.session.exec(update(Resource), params=updates)
+        if inserts:
+            result = await self.session.exec(
+                insert(Resource).returning(Resource.id, sort_by_parameter_order=True), params=inserts
             )
-            self.session.add(resource)
+            for row, resource_id in zip(inserts, result.scalars().all()):
+                row["id"] = resource_id
+        for event_type, batch in ((RESOURCE_UPDATED, updates), (RESOURCE_CREATED, inserts)):
+            for row in batch:
+                self._record_change(event_type, row["id"], row["slug"])
+        rows = updates + inserts
+        await replace_resource_tags_bulk(self.session, {row["id"]: row["tags"] for row in rows})
+        await upsert_fts_rows(self.session, rows)
+        return len(inserts), len(updates)
 
-        resource.source = source
+    @classmethod
+    def _assign_metadata(cls, resource: Resource, metadata: ResourceMetadata) -> None:
+        for column, value in cls._metadata_values(metadata).items():
+            setattr(resource, column, value)
+
+    @staticmethod
+    def _metadata_values(metadata: ResourceMetadata) -> dict[str, Any]:
+        """Column values ``metadata`` sets; ``repo_url`` and ``updated_at`` only when given."""
+        values = {
+            "kind": metadata.kind,
+            "name": metadata.name,
+            "description": metadata.description,
+            "tags": metadata.tags,
+            "url": str(metadata.url) if metadata.url else None,
+            "path": metadata.path,
+            "owner": metadata.owner,
+            "license": metadata.license,
+            "thumbnail_path": metadata.thumbnail,
+            "healthcheck_path": metadata.healthcheck,
+            "modified_at": datetime.utcnow(),
+        }
         if metadata.repo:
-            resource.repo_url = str(metadata.repo)
+            values["repo_url"] = str(metadata.repo)
         if metadata.updated:
             if isinstance(metadata.updated, datetime):
-                resource.updated_at = metadata.updated
+                values["updated_at"] = metadata.updated
             elif isinstance(metadata.updated, date):
-                resource.updated_at = datetime.combine(metadata.updated, datetime.min.time())
-        resource.touch()
-        await self.session.flush()
-        return resource
+                values["updated_at"] = datetime.combine(metadata.updated, datetime.min.time())
+        return values
+
+    async def _insert_resource(self, values: dict[str, Any]) -> Resource:
+        """Insert a row under ``values["slug"]``, or the first free ``<slug>-N`` if that is taken.
 
-    async def _ensure_unique_slug(self, candidate: str) -> str:
-        existing_slugs = await self.session.exec(select(Resource.slug))
-        return slugify(candidate, existing_slugs.scalars().all())
+        The unique index on ``slug`` decides: a slug claimed by another writer
+        between the lookup and the insert is skipped, not raised.
+        """
+        base = values["slug"]
+        for _ in range(SLUG_ATTEMPTS):
+            slug = slugify(base, await self._taken_slugs(base))
+            result = await self.session.exec(
+                sqlite_insert(Resource)
+                .values(**{**values, "slug": slug})
+                .on_conflict_do_nothing(index_elements=[Resource.slug])
+                .returning(Resource.id)
+            )
+            resource_id = result.scalar_one_or_none()
+            if resource_id is not None:
+                return await self.session.get(Resource, resource_id)
+        raise RuntimeError(f"could not allocate a slug for {base!r}")
+
+    async def _taken_slugs(self, base: str) -> list[str]:
+        """``base`` and its numbered variants, read as two ranges of the slug index."""
+        result = await self.session.exec(
+            select(Resource.slug).where(
+                or_(Resource.slug == base, and_(Resource.slug >= f"{base}-0", Resource.slug < f"{base}-:"))
+            )
+        )
+        return result.scalars().all()
 
 
-async def to_read_model(resource: Resource) -> ResourceRead:
-    return ResourceRead.model_validate(resource)
+async def to_read_model(resource: Resource, snippet: str | None = None) -> ResourceRead:
+    item = ResourceRead.model_validate(resource)
+    item.snippet = snippet
+    return item
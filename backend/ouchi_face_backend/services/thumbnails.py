@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from importlib.util import find_spec
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Sequence
+
+from ..core.config import settings
+
+# Kept beside the repository checkouts, under a name no clone is given.
+CACHE_DIR_NAME = ".thumbnails"
+MEDIA_TYPES = {"webp": "image/webp", "jpeg": "image/jpeg"}
+# Encoder options per format; Pillow format names differ from the file extensions.
+_ENCODERS = {"webp": ("WEBP", {"method": 4}), "jpeg": ("JPEG", {"optimize": True, "progressive": True})}
+_DIGEST = re.compile(r"[0-9a-f]{64}")
+
+_executor: ProcessPoolExecutor | None = None
+
+
+def images_supported() -> bool:
+    """Whether the optional Pillow dependency (``ouchi-face-backend[images]``) is installed."""
+    return find_spec("PIL") is not None
+
+
+def get_thumbnail_executor() -> ProcessPoolExecutor:
+    """Worker processes for decoding and resizing, which would otherwise hold the GIL for the whole API."""
+    global _executor
+    if _executor is None:
+        # Forking a process that runs an event loop and thread pools is unsafe; spawn fresh interpreters.
+        _executor = ProcessPoolExecutor(max_workers=settings.thumbnail_workers, mp_context=get_context("spawn"))
+    return _executor
+
+
+def shutdown_thumbnail_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def render_variants(source: bytes, target: str, sizes: Sequence[int], image_format: str, quality: int) -> None:
+    """Write ``<size>.<format>`` for each size into ``target``; runs in a worker process.
+
+    Each variant fits in a ``size`` x ``size`` box and is never enlarged.
+    Variants are derived largest first, each from the previous one, and JPEG
+    sources are decoded straight at a reduced scale when that is big enough.
+    """
+    from PIL import Image, ImageOps
+
+    encoder, options = _ENCODERS[image_format]
+    with Image.open(io.BytesIO(source)) as opened:
+        largest = max(sizes)
+        opened.draft(None, (largest, largest))
+        image = ImageOps.exif_transpose(opened)
+        has_alpha = "A" in image.getbands() or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha and image_format == "webp" else "RGB")
+        os.makedirs(target, exist_ok=True)
+        for size in sorted(sizes, reverse=True):
+            image.thumbnail((size, size), Image.Resampling.LANCZOS)
+            path = os.path.join(target, f"{size}.{image_format}")
+            partial = f"{path}.{os.getpid()}.tmp"
+            image.save(partial, encoder, quality=quality, **options)
+            # Readers only ever see complete files, even with two syncs rendering the same image.
+            os.replace(partial, path)
+
+
+class ThumbnailStore:
+    """Resized variants of thumbnail images, addressed by the SHA-256 of the source bytes.
+
+    A digest directory is written once and never changes, so an image shared
+    by several resources, or one that survives a sync, is processed only once
+    and can be served with immutable cache headers.
+    """
+
+    def __init__(
+        self,
+        root: Path | None = None,
+        sizes: Sequence[int] | None = None,
+        image_format: str | None = None,
+        quality: int | None = None,
+    ) -> None:
+        self.root = root or settings.repo_storage_dir / CACHE_DIR_NAME
+        self.sizes = tuple(sorted(sizes or settings.thumbnail_sizes))
+        self.format = image_format or settings.thumbnail_format
+        self.quality = quality or settings.thumbnail_quality
+
+    @property
+    def media_type(self) -> str:
+        return MEDIA_TYPES[self.format]
+
+    def variant_path(self, digest: str, size: int) -> Path | None:
+        """Path of the ``size`` variant of ``digest``; ``None`` unless both are valid, so requests cannot escape the cache."""
+        if size not in self.sizes or not _DIGEST.fullmatch(digest):
+            return None
+        return self.root / digest[:2] / digest / f"{size}.{self.format}"
+
+    def store(self, source: bytes) -> str | None:
+        """Digest of ``source`` once its variants exist, rendering them in a worker process if needed.
+
+        Blocks until they are written, so call it from a worker thread. Returns
+        ``None`` when Pillow is missing or ``source`` is not a readable image.
+        """
+        if not images_supported():
+            return None
+        digest = hashlib.sha256(source).hexdigest()
+        paths = [self.variant_path(digest, size) for size in self.sizes]
+        if all(path.exists() for path in paths):
+            return digest
+        future = get_thumbnail_executor().submit(
+            render_variants, source, str(paths[0].parent), self.sizes, self.format, self.quality
+        )
+        try:
+            future.result()
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); start a fresh pool next time.
+            shutdown_thumbnail_executor()
+            return None
+        except Exception:  # noqa: BLE001 - undecodable or oversized images just get no thumbnail
+            return None
+        return digest
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(modified_at: datetime, resource_id: int) -> str:
+    raw = json.dumps([modified_at.isoformat(), resource_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        modified_at, resource_id = json.loads(raw)
+        return datetime.fromisoformat(modified_at), int(resource_id)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor("Malformed pagination cursor") from exc
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import re
+
+_SUBSTITUTIONS = [
+    (re.compile(r"<!--.*?-->", re.S), " "),
+    (re.compile(r"^\s*(```|~~~).*$", re.M), " "),
+    (re.compile(r"!\[([^\]]*)\]\([^)]*\)"), r"\1"),
+    (re.compile(r"\[([^\]]*)\]\([^)]*\)"), r"\1"),
+    (re.compile(r"^\s*\[[^\]]+\]:\s*\S+.*$", re.M), " "),
+    (re.compile(r"<[^>\n]+>"), " "),
+    (re.compile(r"^\s{0,3}(#{1,6}|>+|[-*+]|\d+[.)])\s+", re.M), ""),
+    (re.compile(r"^\s*([-*_=]\s*){3,}$", re.M), " "),
+    (re.compile(r"[*_~`|]+"), " "),
+    (re.compile(r"[ \t]+"), " "),
+    (re.compile(r"\n\s*\n+"), "\n"),
+]
+
+
+def strip_markdown(text: str) -> str:
+    """Reduce Markdown to the words a reader sees: markup, link targets and HTML tags are dropped."""
+    for pattern, replacement in _SUBSTITUTIONS:
+        text = pattern.sub(replacement, text)
+    return text.strip()
+
+
+def index_text(text: str, max_chars: int) -> str:
+    """Plain text for the search index: at most ``max_chars`` characters, never ending in a cut-off word."""
+    if len(text) > max_chars:
+        text = text[: max_chars + 1].rpartition(" ")[0] if max_chars else ""
+    return strip_markdown(text)
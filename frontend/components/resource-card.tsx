@@ -2,6 +2,7 @@ import Image from 'next/image';
 import Link from 'next/link';
 
 import type { Resource } from '../lib/api';
+import { thumbnailUrl } from '../lib/api';
 import { statusStyles } from '../lib/status-style';
 
 interface Props {
@@ -9,6 +10,9 @@ interface Props {
 }
 
 export function ResourceCard({ resource }: Props) {
+  // Synced thumbnails come pre-sized from the API; only fall back to the raw path.
+  const variant = thumbnailUrl(resource, 640);
+  const thumbnail = variant ?? resource.thumbnail_path;
   return (
     <div className="group flex flex-col rounded-xl border border-slate-800 bg-slate-900/70 p-5 shadow-lg shadow-slate-900/40 transition hover:border-primary-500/60 hover:bg-slate-900">
       <div className="flex items-center justify-between">
@@ -19,10 +23,11 @@ export function ResourceCard({ resource }: Props) {
       </div>
       <h3 className="mt-3 text-lg font-semibold text-slate-100">{resource.name}</h3>
       <p className="mt-2 line-clamp-3 text-sm text-slate-300">{resource.description ?? 'No description yet.'}</p>
-      {resource.thumbnail_path ? (
+      {thumbnail ? (
         <div className="mt-4 overflow-hidden rounded-lg border border-slate-800">
           <Image
-            src={resource.thumbnail_path}
+            src={thumbnail}
+            unoptimized={variant !== null}
             alt={`${resource.name} thumbnail`}
             width={640}
             height={360}
@@ -12,24 +12,34 @@ export interface Resource {
   repo_url?: string | null;
   owner?: string | null;
   thumbnail_path?: string | null;
+  thumbnail_hash?: string | null;
   license?: string | null;
   healthcheck_path?: string | null;
   updated_at?: string | null;
   last_synced_at?: string | null;
   health_status: string;
   health_checked_at?: string | null;
+  health_latency_ms?: number | null;
   source: 'manual' | 'repository';
   created_at: string;
   modified_at: string;
+  snippet?: string | null;
 }
 
 export interface ResourceListResponse {
   items: Resource[];
-  total: number;
+  total: number | null;
+  total_is_estimate: boolean;
+  next_cursor?: string | null;
 }
 
 const API_BASE = process.env.NEXT_PUBLIC_API_BASE ?? 'http://localhost:8000';
 
+/** Resized copy of a synced thumbnail (sizes 160, 320, 640), or null when none was generated. */
+export function thumbnailUrl(resource: Resource, size: 160 | 320 | 640): string | null {
+  return resource.thumbnail_hash ? `${API_BASE}/api/thumbnails/${resource.thumbnail_hash}/${size}` : null;
+}
+
 async function handleResponse<T>(res: Response): Promise<T> {
   if (!res.ok) {
     const message = await res.text();
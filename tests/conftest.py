@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from git_remote import GitRemote
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ouchi_face_backend.db.session import create_schema
+
+
+@pytest_asyncio.fixture()
+async def engine() -> AsyncGenerator[AsyncEngine, None]:
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(create_schema)
+    try:
+        yield engine
+    finally:
+        await engine.dispose()
+
+
+@pytest_asyncio.fixture()
+async def session_factory(engine: AsyncEngine):
+    factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    @asynccontextmanager
+    async def get_session() -> AsyncGenerator[AsyncSession, None]:
+        async with factory() as session:
+            yield session
+
+    return get_session
+
+
+@pytest_asyncio.fixture()
+async def session(session_factory) -> AsyncGenerator[AsyncSession, None]:
+    async with session_factory() as async_session:
+        yield async_session
+
+
+@pytest.fixture()
+def remote(tmp_path: Path) -> GitRemote:
+    git_remote = GitRemote.create(tmp_path)
+    git_remote.push(
+        {
+            "apps/demo/ouchi.yaml": b"kind: app\nname: Demo App\ntags: [demo]\n",
+            "apps/demo/README.md": b"# Demo\n",
+            "weights.bin": b"\0" * 1024,
+        },
+        "initial",
+    )
+    return git_remote
@@ -0,0 +1,39 @@
+"""Local git remotes for tests that sync repositories."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+from git import Actor, Repo
+
+AUTHOR = Actor("Ouchi Tests", "tests@ouchi.local")
+
+
+@dataclass
+class GitRemote:
+    """A local bare repository served over file:// plus a work tree that pushes to it."""
+
+    url: str
+    bare: Repo
+    work: Repo
+
+    @classmethod
+    def create(cls, root: Path) -> GitRemote:
+        bare_dir = root / "remote" / "catalog-app.git"
+        bare = Repo.init(bare_dir, bare=True, initial_branch="main")
+        bare.git.config("uploadpack.allowFilter", "true")
+        work = Repo.init(root / "work", initial_branch="main")
+        work.create_remote("origin", str(bare_dir))
+        return cls(url=bare_dir.as_uri(), bare=bare, work=work)
+
+    def push(self, files: dict[str, bytes], message: str = "update") -> str:
+        root = Path(self.work.working_tree_dir)
+        for name, content in files.items():
+            target = root / name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(content)
+        self.work.index.add(list(files))
+        commit = self.work.index.commit(message, author=AUTHOR, committer=AUTHOR)
+        self.work.remotes.origin.push("HEAD:refs/heads/main")
+        return commit.hexsha
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import pytest
+
+from ouchi_face_backend.services.catalog_cache import CachedResponse, CatalogCache
+
+
+class Loader:
+    def __init__(self, resource_id: int | None = None) -> None:
+        self.resource_id = resource_id
+        self.calls = 0
+
+    async def __call__(self) -> tuple[CachedResponse, int | None]:
+        self.calls += 1
+        return CachedResponse(f"body-{self.calls}".encode()), self.resource_id
+
+
+@pytest.mark.asyncio()
+async def test_entries_expire_and_are_evicted_least_recently_used_first() -> None:
+    now = [0.0]
+    cache = CatalogCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+    first, second, third = Loader(), Loader(), Loader()
+
+    assert (await cache.fetch("a", first)).body == b"body-1"
+    assert (await cache.fetch("a", first)).body == b"body-1"
+    await cache.fetch("b", second)
+    await cache.fetch("a", first)  # "b" is now the least recently used
+    await cache.fetch("c", third)
+    await cache.fetch("b", second)
+    assert (first.calls, second.calls) == (1, 2)
+
+    now[0] = 11
+    assert (await cache.fetch("b", second)).body == b"body-3"
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.expired) == (2, 5, 2, 1)
+    assert stats.entries == 2
+
+
+@pytest.mark.asyncio()
+async def test_invalidation_is_scoped_to_the_changed_resource() -> None:
+    cache = CatalogCache(max_entries=10, ttl_seconds=60)
+    listing, one, two = Loader(), Loader(resource_id=1), Loader(resource_id=2)
+    for key, loader in [("list", listing), ("one", one), ("two", two)]:
+        await cache.fetch(key, loader)
+
+    cache.invalidate([1])
+    for key, loader in [("list", listing), ("one", one), ("two", two)]:
+        await cache.fetch(key, loader)
+    assert (listing.calls, one.calls, two.calls) == (2, 2, 1)
+
+    cache.invalidate()
+    await cache.fetch("two", two)
+    assert two.calls == 2
+    assert cache.stats().stale == 3
+
+
+@pytest.mark.asyncio()
+async def test_result_of_a_load_overlapping_a_write_is_not_cached() -> None:
+    cache = CatalogCache(max_entries=10, ttl_seconds=60)
+    calls = 0
+
+    async def load() -> tuple[CachedResponse, int]:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            cache.invalidate([7])  # a write commits while the row is being read
+        return CachedResponse(b"row"), 7
+
+    await cache.fetch("row", load)
+    await cache.fetch("row", load)
+    await cache.fetch("row", load)
+    assert calls == 2
+
+
+@pytest.mark.asyncio()
+async def test_misses_and_disabled_cache_always_load() -> None:
+    async def missing() -> None:
+        return None
+
+    cache = CatalogCache(max_entries=10, ttl_seconds=60)
+    assert await cache.fetch("gone", missing) is None
+    assert cache.stats().entries == 0
+
+    disabled, loader = CatalogCache(max_entries=0, ttl_seconds=60), Loader()
+    await disabled.fetch("a", loader)
+    await disabled.fetch("a", loader)
+    assert loader.calls == 2
+
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from sqlalchemy import func, select
+
+from ouchi_face_backend.models.resource import Resource, ResourceKind, ResourceSource, ResourceTag
+from ouchi_face_backend.services.catalog_io import CatalogTransfer, iter_lines
+from ouchi_face_backend.services.resource_service import ResourceService
+
+
+async def _chunks(data: bytes, size: int = 7):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+async def _collect(stream) -> bytes:
+    return b"".join([chunk async for chunk in stream])
+
+
+@pytest.mark.asyncio()
+async def test_import_then_export_round_trips(session_factory) -> None:
+    records = [
+        {"kind": "app", "name": f"Service {index}", "tags": ["ops", f"team-{index % 2}"], "owner": "@ops"}
+        for index in range(5)
+    ]
+    lines = [json.dumps(record) for record in records]
+    lines.insert(2, '{"kind": "app"}')
+    lines.insert(4, "not json")
+    payload = ("\n".join(lines) + "\n\n").encode()
+
+    transfer = CatalogTransfer(session_factory=session_factory, batch_size=2)
+    summary = await transfer.import_lines(iter_lines(_chunks(payload)))
+
+    assert (summary.created, summary.updated, summary.failed) == (5, 0, 2)
+    assert [error.line for error in summary.errors] == [3, 5]
+    assert summary.errors[0].error.startswith("name:")
+
+    exported = await _collect(transfer.export())
+    assert [json.loads(line)["name"] for line in exported.splitlines()] == [record["name"] for record in records]
+
+    again = await transfer.import_lines(iter_lines(_chunks(exported)))
+    assert (again.created, again.updated, again.failed) == (0, 5, 0)
+
+    async with session_factory() as session:
+        assert (await session.exec(select(func.count()).select_from(Resource))).scalar() == 5
+        assert (await session.exec(select(func.count()).select_from(ResourceTag))).scalar() == 10
+        page = await ResourceService(session).list_page(q="service 3", tags=["team-1"])
+    assert [item.slug for item in page.items] == ["service-3"]
+
+
+@pytest.mark.asyncio()
+async def test_import_over_a_repository_row_forces_the_next_sync(session_factory) -> None:
+    async with session_factory() as session:
+        session.add(
+            Resource(
+                kind=ResourceKind.APP,
+                name="Demo App",
+                slug="demo-app",
+                source=ResourceSource.REPOSITORY,
+                repo_url="https://example.com/demo.git",
+                repo_commit_sha="a" * 40,
+                metadata_hash="b" * 64,
+            )
+        )
+        await session.commit()
+
+    payload = json.dumps({"kind": "app", "name": "Demo App", "description": "imported"}).encode() + b"\n"
+    summary = await CatalogTransfer(session_factory=session_factory).import_lines(iter_lines(_chunks(payload)))
+    assert summary.updated == 1
+
+    async with session_factory() as session:
+        resource = (await session.exec(select(Resource))).scalar_one()
+    assert (resource.description, resource.source) == ("imported", ResourceSource.REPOSITORY)
+    assert resource.repo_commit_sha is None and resource.metadata_hash is None
+
+
+@pytest.mark.asyncio()
+async def test_iter_lines_skips_oversized_lines() -> None:
+    payload = b"short\n" + b"x" * 50 + b"\nlast"
+    lines = [line async for line in iter_lines(_chunks(payload, 8), max_line_bytes=16)]
+    assert lines == [b"short", None, b"last"]
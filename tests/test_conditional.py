@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from fastapi import Request
+
+from ouchi_face_backend.api.conditional import cached_json, is_not_modified, resource_validators
+from ouchi_face_backend.services.catalog_cache import CachedResponse
+
+
+def _request(**headers: str) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+def test_resource_validators_follow_every_timestamp() -> None:
+    modified, checked = datetime(2024, 5, 4, 12, 0, 0, 500), datetime(2024, 5, 4, 12, 5)
+    etag, last_modified = resource_validators(1, modified, checked, None)
+    assert last_modified == checked
+    assert etag == resource_validators(1, modified, checked, None)[0]
+    assert etag != resource_validators(1, modified, datetime(2024, 5, 4, 12, 6), None)[0]
+    assert etag != resource_validators(2, modified, checked, None)[0]
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since() -> None:
+    etag, last_modified = '"r-1"', datetime(2024, 5, 4, 12, 5, 30, 900)
+    since = "Sat, 04 May 2024 12:05:30 GMT"
+
+    assert is_not_modified(_request(if_none_match='"x", W/"r-1"'), etag, last_modified)
+    assert is_not_modified(_request(if_none_match="*"), etag, last_modified)
+    assert not is_not_modified(_request(if_none_match='"x"', if_modified_since=since), etag, last_modified)
+    assert is_not_modified(_request(if_modified_since=since), etag, last_modified)
+    assert not is_not_modified(_request(if_modified_since="Sat, 04 May 2024 12:05:29 GMT"), etag, last_modified)
+    assert not is_not_modified(_request(if_modified_since="garbage"), etag, last_modified)
+    assert not is_not_modified(_request(), etag, last_modified)
+
+
+def test_cached_json_answers_304_without_a_body() -> None:
+    cached = CachedResponse(b'{"id":1}', '"r-1"', datetime(2024, 5, 4, 12, 5))
+
+    fresh = cached_json(_request(), cached)
+    assert fresh.status_code == 200
+    assert fresh.body == b'{"id":1}'
+    assert fresh.headers["etag"] == '"r-1"'
+    assert fresh.headers["last-modified"] == "Sat, 04 May 2024 12:05:00 GMT"
+
+    revalidated = cached_json(_request(if_none_match='"r-1"'), cached)
+    assert revalidated.status_code == 304
+    assert revalidated.body == b""
+    assert revalidated.headers["etag"] == '"r-1"'
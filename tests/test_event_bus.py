@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ouchi_face_backend.models.resource import ResourceKind, ResourceSource
+from ouchi_face_backend.schemas.resource import ManualResourceCreate, ResourceMetadata
+from ouchi_face_backend.services.catalog_cache import CatalogCache
+from ouchi_face_backend.services.event_bus import (
+    HEALTH_CHANGED,
+    RESOURCE_UPDATED,
+    CatalogEvent,
+    EventBus,
+)
+from ouchi_face_backend.services.resource_service import ResourceService
+
+
+def _events(messages: list[bytes]) -> list[tuple[str, str]]:
+    """``(event, data)`` pairs of a batch of SSE messages."""
+    parsed = []
+    for message in b"".join(messages).decode().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in message.splitlines() if not line.startswith(":"))
+        if "event" in fields:
+            parsed.append((fields["event"], fields["data"]))
+    return parsed
+
+
+@pytest.mark.asyncio()
+async def test_slow_subscribers_get_coalesced_then_resync() -> None:
+    bus = EventBus(max_pending=2)
+    subscription = bus.subscribe()
+
+    bus.publish([CatalogEvent(HEALTH_CHANGED, 1, {"status": "down"}), CatalogEvent(RESOURCE_UPDATED, 1)])
+    bus.publish([CatalogEvent(HEALTH_CHANGED, 1, {"status": "up"})])
+    assert _events(subscription.drain()) == [
+        (RESOURCE_UPDATED, '{"resource_id":1}'),
+        (HEALTH_CHANGED, '{"resource_id":1,"status":"up"}'),
+    ]
+
+    bus.publish([CatalogEvent(HEALTH_CHANGED, resource_id, {"status": "up"}) for resource_id in range(3)])
+    assert _events(subscription.drain()) == [("resync", "{}")]
+
+    subscription.close()
+    bus.publish([CatalogEvent(HEALTH_CHANGED, 1)])
+    assert bus.subscriber_count == 0
+    assert subscription.drain() == []
+
+
+@pytest.mark.asyncio()
+async def test_stream_sends_heartbeats_and_stops_on_close() -> None:
+    bus = EventBus()
+    stream = bus.stream(heartbeat=0.01)
+    assert (await anext(stream)).startswith(b"retry:")
+    assert await anext(stream) == b": keepalive\n\n"
+
+    bus.publish([CatalogEvent(HEALTH_CHANGED, 7, {"status": "down"})])
+    assert _events([await anext(stream)]) == [(HEALTH_CHANGED, '{"resource_id":7,"status":"down"}')]
+
+    bus.close()
+    remaining = await asyncio.wait_for(_collect(stream), timeout=1)
+    assert _events(remaining) == []
+    assert bus.subscriber_count == 0
+
+
+async def _collect(stream) -> list[bytes]:
+    return [chunk async for chunk in stream]
+
+
+@pytest.mark.asyncio()
+async def test_service_publishes_committed_changes_only(session: AsyncSession) -> None:
+    bus = EventBus()
+    subscription = bus.subscribe()
+    service = ResourceService(session, cache=CatalogCache(max_entries=0, ttl_seconds=0), events=bus)
+
+    payload = ManualResourceCreate(metadata=ResourceMetadata(kind=ResourceKind.APP, name="Alpha"))
+    resource_id = (await service.create_or_update(payload)).id
+    assert _events(subscription.drain()) == [("resource.created", f'{{"resource_id":{resource_id},"slug":"alpha"}}')]
+    await service.create_or_update(payload)
+    assert [event for event, _ in _events(subscription.drain())] == ["resource.updated"]
+
+    await service._apply_metadata(ResourceMetadata(kind=ResourceKind.APP, name="Beta"), ResourceSource.MANUAL)
+    await service.rollback()
+    await service.delete(resource_id)
+    assert [event for event, _ in _events(subscription.drain())] == ["resource.deleted"]
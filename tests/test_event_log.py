@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ouchi_face_backend.models.event import Event
+from ouchi_face_backend.models.resource import Resource, ResourceKind, ResourceSource
+from ouchi_face_backend.schemas.resource import ManualResourceCreate, ResourceMetadata
+from ouchi_face_backend.services.catalog_cache import CatalogCache
+from ouchi_face_backend.services.event_bus import EventBus
+from ouchi_face_backend.services.event_log import EventLogService
+from ouchi_face_backend.services.health_monitor import HealthMonitor
+from ouchi_face_backend.services.resource_service import ResourceService
+
+
+@pytest.mark.asyncio()
+async def test_committed_changes_are_logged_and_paged_in_order(session: AsyncSession) -> None:
+    bus = EventBus()
+    subscription = bus.subscribe()
+    service = ResourceService(session, cache=CatalogCache(max_entries=0, ttl_seconds=0), events=bus)
+    ids = []
+    for name in ("Alpha", "Beta", "Alpha"):
+        payload = ManualResourceCreate(metadata=ResourceMetadata(kind=ResourceKind.APP, name=name))
+        ids.append((await service.create_or_update(payload)).id)
+    await service._apply_metadata(ResourceMetadata(kind=ResourceKind.APP, name="Gamma"), ResourceSource.MANUAL)
+    await service.rollback()
+    await service.delete(ids[1])
+
+    log = EventLogService(session)
+    page = await log.since(0, limit=3)
+    assert [(event.type, event.resource_id) for event in page.events] == [
+        ("resource.created", ids[0]),
+        ("resource.created", ids[1]),
+        ("resource.updated", ids[0]),
+    ]
+    assert page.events[0].data == {"slug": "alpha"}
+    assert (page.next_id, page.has_more, page.reset) == (page.events[-1].id, True, False)
+
+    rest = await log.since(page.next_id)
+    assert [event.type for event in rest.events] == ["resource.deleted"]
+    assert not rest.has_more
+    # Stream ids are the logged ids, so ?since=<last SSE id> picks up where a stream left off.
+    streamed = [int(message.split(b"\n")[0].removeprefix(b"id: ")) for message in subscription.drain()]
+    assert streamed == [page.events[2].id, rest.events[0].id]
+
+    only_alpha = await log.since(0, resource_id=ids[0])
+    assert [event.type for event in only_alpha.events] == ["resource.created", "resource.updated"]
+    assert only_alpha.next_id == rest.next_id
+    assert (await log.since(rest.next_id)).events == []
+
+
+@pytest.mark.asyncio()
+async def test_health_transitions_are_logged_once(session_factory) -> None:
+    statuses = iter([200, 200, None])
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        status = next(statuses)
+        if status is None:
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(status)
+
+    async with session_factory() as session:
+        session.add(Resource(kind=ResourceKind.APP, name="App", slug="app", url="http://apps.local"))
+        await session.commit()
+
+    monitor = HealthMonitor(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        session_factory=session_factory,
+        cache=CatalogCache(max_entries=0, ttl_seconds=0),
+        events=EventBus(),
+    )
+    for _ in range(3):
+        await monitor._run_checks()
+    await monitor.shutdown()
+
+    async with session_factory() as session:
+        rows = (await session.exec(select(Event.type, Event.data).order_by(Event.id))).all()
+    assert [(event_type, data.split(",")[0]) for event_type, data in rows] == [
+        ("health.changed", '{"status":"up"'),
+        ("health.changed", '{"status":"down"'),
+    ]
+    # A failed connection has no latency; None values are left out of the stored payload.
+    assert "latency_ms" in rows[0][1] and "latency_ms" not in rows[1][1]
+
+
+@pytest.mark.asyncio()
+async def test_prune_keeps_recent_events_and_the_newest_id(session: AsyncSession) -> None:
+    now = datetime(2024, 6, 1)
+    session.add_all(
+        Event(resource_id=1, type="resource.updated", created_at=now - timedelta(days=age)) for age in (90, 60, 1, 0)
+    )
+    await session.commit()
+    log = EventLogService(session)
+
+    assert await log.prune(now) == 2
+    await session.commit()
+    stale = await log.since(1)
+    assert (stale.reset, stale.next_id, stale.events) == (True, 4, [])
+    assert [event.id for event in (await log.since(2)).events] == [3, 4]
+
+    assert await log.prune(now + timedelta(days=365)) == 1
+    await session.commit()
+    assert (await session.exec(select(Event.id))).all() == [4]
+    # A position past the newest id comes from another database: start over.
+    assert (await log.since(9)).reset
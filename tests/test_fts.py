@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import insert, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ouchi_face_backend.db.fts import (
+    merge_resource_fts,
+    optimize_resource_fts,
+    rebuild_resource_fts,
+    remove_resources_fts,
+    upsert_resources_fts,
+)
+from ouchi_face_backend.models.resource import Resource, ResourceKind
+
+
+async def _indexed(session: AsyncSession) -> dict[int, str]:
+    result = await session.exec(text("SELECT rowid, name FROM resources_fts ORDER BY rowid"))
+    return dict(result.all())
+
+
+@pytest.mark.asyncio()
+async def test_batched_writes_and_rebuild(session: AsyncSession) -> None:
+    resources = [Resource(kind=ResourceKind.APP, name=f"App {i}", slug=f"app-{i}", tags=["demo"]) for i in range(3)]
+    session.add_all(resources)
+    await session.flush()
+
+    await upsert_resources_fts(session, resources)
+    resources[0].name = "Renamed"
+    await upsert_resources_fts(session, resources[:1])
+    await remove_resources_fts(session, [resources[2].id])
+    await session.commit()
+    assert await _indexed(session) == {resources[0].id: "Renamed", resources[1].id: "App 1"}
+
+    # Rows written behind the index's back are picked up by a rebuild.
+    await session.exec(insert(Resource).values(kind=ResourceKind.MODEL, name="Imported", slug="imported", tags=[]))
+    assert await rebuild_resource_fts(session) == 4
+    await optimize_resource_fts(session)
+    await merge_resource_fts(session, pages=16)
+    await session.commit()
+    assert sorted((await _indexed(session)).values()) == ["App 1", "App 2", "Imported", "Renamed"]
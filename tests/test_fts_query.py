@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import pytest
+
+from ouchi_face_backend.db.fts_query import InvalidQuery, SearchQuery, compile_query
+from ouchi_face_backend.models.resource import ResourceKind
+
+
+def test_compile_query_quotes_input_and_extracts_fields() -> None:
+    query = compile_query('self-hosted "audio model" -beta tag:gpu owner:@alice KIND:Model kube')
+
+    assert query == SearchQuery(
+        terms=("kube",),
+        phrases=(("self", "hosted"), ("audio", "model")),
+        excluded=(("beta",),),
+        tags=("gpu",),
+        owner="@alice",
+        kind=ResourceKind.MODEL,
+        prefix_last=True,
+    )
+    assert query.exact_match == '"kube"* AND "self hosted" AND "audio model" NOT "beta"'
+    assert compile_query('a:"b OR c" NEAR(x').exact_match == '"a b or c" AND "near x"'
+
+
+def test_compile_query_bounds_terms_and_prefixes() -> None:
+    assert len(compile_query(" ".join(f"w{i}" for i in range(100))).terms) == 8
+    assert compile_query("k").prefix_last is False
+    assert compile_query("kube ").prefix_last is False
+    assert compile_query("tag:gpu").exact_match is None
+    assert compile_query("-beta").excluded == ()
+    with pytest.raises(InvalidQuery):
+        compile_query("kind:robot")
+
+
+def test_compile_query_negated_fields_are_exclusions() -> None:
+    query = compile_query("kube -tag:foo -tag:foo -owner:@bob -kind:dataset")
+
+    assert query == SearchQuery(
+        terms=("kube",),
+        excluded_tags=("foo",),
+        excluded_owners=("@bob",),
+        excluded_kinds=(ResourceKind.DATASET,),
+        prefix_last=False,
+    )
+    assert query.exact_match == '"kube"'
+    assert compile_query("-tag:gpu").excluded_tags == ("gpu",)
+    with pytest.raises(InvalidQuery):
+        compile_query("-kind:robot")
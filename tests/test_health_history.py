@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ouchi_face_backend.models.health import HealthRollup, HealthSample
+from ouchi_face_backend.services.health_history import DAY, HOUR, MINUTE, HealthHistoryService
+from ouchi_face_backend.services.health_monitor import HealthCheckResult
+
+
+@pytest.mark.asyncio()
+async def test_rollup_preserves_uptime_across_tiers(session: AsyncSession) -> None:
+    now = datetime(2024, 6, 1, 12, 0, 0)
+    history = HealthHistoryService(session)
+    results = []
+    # One probe every 10 minutes for 20 days; every fourth probe is down.
+    for index in range(20 * 24 * 6):
+        checked_at = now - timedelta(minutes=10 * index)
+        status = "down" if index % 4 == 0 else "up"
+        results.append(HealthCheckResult(resource_id=1, status=status, checked_at=checked_at, latency_ms=float(index % 7)))
+    await history.record(results)
+    await session.commit()
+
+    since = now - timedelta(days=30)
+    before = await history.summary(1, since=since, until=now)
+    await history.rollup(now)
+    await session.commit()
+    after = await history.summary(1, since=since, until=now)
+
+    assert before.samples == after.samples == len(results)
+    assert after.uptime == pytest.approx(75.0)
+    assert after.avg_latency_ms == pytest.approx(before.avg_latency_ms)
+
+    raw = (await session.exec(select(HealthSample))).all()
+    assert len(raw) <= 13
+    resolutions = {row.resolution for row in (await session.exec(select(HealthRollup))).all()}
+    assert resolutions == {MINUTE, HOUR, DAY}
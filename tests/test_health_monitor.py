@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+from sqlmodel import delete, select
+
+from ouchi_face_backend.core.config import settings
+from ouchi_face_backend.models.event import Event
+from ouchi_face_backend.models.health import HealthSample
+from ouchi_face_backend.models.resource import Resource, ResourceKind
+from ouchi_face_backend.services.health_monitor import HealthMonitor
+from ouchi_face_backend.services.health_schedule import HealthSchedule
+
+
+@pytest.mark.asyncio()
+async def test_run_checks_bounds_per_host_fan_out(session_factory, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "health_per_host_concurrency", 2)
+    in_flight = {"current": 0, "peak": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        in_flight["current"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["current"])
+        await asyncio.sleep(0.01)
+        in_flight["current"] -= 1
+        return httpx.Response(503 if request.url.path == "/broken" else 200)
+
+    async with session_factory() as session:
+        for index in range(6):
+            path = "/broken" if index == 0 else f"/app-{index}"
+            session.add(Resource(kind=ResourceKind.APP, name=f"App {index}", slug=f"app-{index}", url=f"http://apps.local{path}"))
+        session.add(Resource(kind=ResourceKind.DATASET, name="Offline", slug="offline"))
+        await session.commit()
+
+    monitor = HealthMonitor(client=httpx.AsyncClient(transport=httpx.MockTransport(handler)), session_factory=session_factory)
+    await monitor._run_checks()
+    await monitor.shutdown()
+
+    assert in_flight["peak"] == 2
+    async with session_factory() as session:
+        rows = {res.slug: res for res in (await session.exec(select(Resource))).all()}
+    assert rows["app-0"].health_status == "down"
+    assert all(rows[f"app-{index}"].health_status == "up" for index in range(1, 6))
+    assert rows["offline"].health_status == "unknown"
+    assert rows["offline"].health_checked_at is None
+
+
+@pytest.mark.asyncio()
+async def test_probe_falls_back_to_get_and_records_latency(session_factory) -> None:
+    methods: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        methods.append(request.method)
+        if request.method == "HEAD":
+            return httpx.Response(405)
+        return httpx.Response(200, content=b"x" * 1_000_000, headers={"ETag": '"v1"'})
+
+    monitor = HealthMonitor(client=httpx.AsyncClient(transport=httpx.MockTransport(handler)), session_factory=session_factory)
+    result = await monitor._check_resource(1, "http://apps.local", "/health")
+    await monitor.shutdown()
+
+    assert methods == ["HEAD", "GET"]
+    assert result.status == "up"
+    assert result.latency_ms is not None
+    assert monitor._etags[1] == '"v1"'
+
+
+@pytest.mark.asyncio()
+async def test_tick_requeues_resources_when_a_probe_crashes(session_factory) -> None:
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("transport bug")
+        return httpx.Response(200)
+
+    async with session_factory() as session:
+        session.add(Resource(kind=ResourceKind.APP, name="App", slug="app", url="http://apps.local"))
+        await session.commit()
+
+    monitor = HealthMonitor(client=httpx.AsyncClient(transport=httpx.MockTransport(handler)), session_factory=session_factory)
+    monitor.schedule = HealthSchedule(base_interval=0, min_interval=0, max_interval=0, jitter=0)
+    await monitor._tick()  # loads the targets; they fall due right after
+    with pytest.raises(RuntimeError):
+        await monitor._tick()
+    await monitor._tick()
+    await monitor.shutdown()
+
+    async with session_factory() as session:
+        resource = (await session.exec(select(Resource))).one()
+    assert resource.health_status == "up"
+
+
+@pytest.mark.asyncio()
+async def test_resource_deleted_mid_tick_does_not_lose_other_results(session_factory) -> None:
+    async with session_factory() as session:
+        for slug in ("kept", "removed"):
+            session.add(Resource(kind=ResourceKind.APP, name=slug, slug=slug, url=f"http://apps.local/{slug}"))
+        await session.commit()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/removed":
+            async with session_factory() as session:
+                await session.exec(delete(Resource).where(Resource.slug == "removed"))
+                await session.commit()
+        return httpx.Response(200)
+
+    monitor = HealthMonitor(client=httpx.AsyncClient(transport=httpx.MockTransport(handler)), session_factory=session_factory)
+    monitor.schedule = HealthSchedule(base_interval=0, min_interval=0, max_interval=0, jitter=0)
+    await monitor._tick()  # loads the targets; they fall due right after
+    await monitor._tick()
+    await monitor.shutdown()
+
+    async with session_factory() as session:
+        kept = (await session.exec(select(Resource))).one()
+        samples = (await session.exec(select(HealthSample.resource_id))).all()
+        events = (await session.exec(select(Event.resource_id))).all()
+    assert (kept.slug, kept.health_status) == ("kept", "up")
+    assert samples == [kept.id]
+    assert events == [kept.id]
+    assert monitor.schedule.state(kept.id).last_status == "up"
+    assert monitor.schedule.state(kept.id + 1).last_status is None
+    assert monitor.schedule.pop_due(float("inf")) == [kept.id]
+
+
+@pytest.mark.asyncio()
+async def test_failed_store_leaves_the_schedule_state_untouched(session_factory, monkeypatch: pytest.MonkeyPatch) -> None:
+    async with session_factory() as session:
+        session.add(Resource(kind=ResourceKind.APP, name="App", slug="app", url="http://apps.local"))
+        await session.commit()
+
+    monitor = HealthMonitor(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200))),
+        session_factory=session_factory,
+    )
+    monitor.schedule = HealthSchedule(base_interval=0, min_interval=0, max_interval=0, jitter=0)
+    store = monitor._store
+
+    async def locked(results):
+        raise RuntimeError("database is locked")
+
+    await monitor._tick()
+    monkeypatch.setattr(monitor, "_store", locked)
+    with pytest.raises(RuntimeError):
+        await monitor._tick()
+    assert monitor.schedule.state(1).last_status is None
+
+    monkeypatch.setattr(monitor, "_store", store)
+    await monitor._tick()
+    await monitor.shutdown()
+    assert list(monitor.schedule.state(1).history) == ["up"]
+
+
+@pytest.mark.asyncio()
+async def test_loading_targets_forgets_validators_of_removed_resources(session_factory) -> None:
+    async with session_factory() as session:
+        session.add(Resource(kind=ResourceKind.APP, name="App", slug="app", url="http://apps.local"))
+        await session.commit()
+
+    monitor = HealthMonitor(
+        client=httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200))),
+        session_factory=session_factory,
+    )
+    monitor._etags = {1: '"v1"', 2: '"gone"'}
+    await monitor._load_targets()
+    await monitor.shutdown()
+    assert monitor._etags == {1: '"v1"'}
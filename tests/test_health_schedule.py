@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from ouchi_face_backend.services.health_schedule import HealthSchedule
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_schedule(clock: FakeClock) -> HealthSchedule:
+    return HealthSchedule(
+        base_interval=100,
+        min_interval=20,
+        max_interval=400,
+        backoff=2.0,
+        stable_after=2,
+        jitter=0.0,
+        clock=clock,
+        rng=lambda: 0.5,
+    )
+
+
+def test_stable_resources_back_off_and_down_ones_are_probed_sooner() -> None:
+    clock = FakeClock()
+    schedule = make_schedule(clock)
+    schedule.sync([1, 2])
+    assert schedule.pop_due() == []
+    clock.now = 100
+    assert sorted(schedule.pop_due()) == [1, 2]
+
+    intervals = []
+    for _ in range(5):
+        intervals.append(schedule.record(1, "up") - clock.now)
+    assert intervals == [100, 100, 200, 400, 400]
+
+    assert schedule.record(2, "down") - clock.now == 20
+    clock.now = 120
+    assert schedule.pop_due() == [2]
+
+
+def test_flapping_resource_stays_on_min_interval() -> None:
+    clock = FakeClock()
+    schedule = make_schedule(clock)
+    schedule.sync([7])
+    clock.now = 100
+    schedule.pop_due()
+    for status in ("up", "down", "up", "up", "up"):
+        due = schedule.record(7, status)
+    assert schedule.state(7).flapping
+    assert due - clock.now == 20
+
+
+def test_sync_drops_removed_resources() -> None:
+    clock = FakeClock()
+    schedule = make_schedule(clock)
+    schedule.sync([1, 2, 3])
+    schedule.sync([3])
+    clock.now = 1000
+    assert schedule.pop_due() == [3]
+    assert len(schedule) == 1
+
+
+def test_new_resources_are_spread_across_the_base_interval() -> None:
+    clock = FakeClock()
+    offsets = iter([0.1, 0.9])
+    schedule = HealthSchedule(
+        base_interval=100, min_interval=20, max_interval=400, jitter=0.1, clock=clock, rng=lambda: next(offsets)
+    )
+    schedule.sync([1])
+    schedule.sync([1, 2])
+    assert schedule.next_due() == 10
+    clock.now = 89
+    assert schedule.pop_due() == [1]
+    clock.now = 90
+    assert schedule.pop_due() == [2]
+
+
+def test_requeue_restores_popped_resources_without_a_result() -> None:
+    clock = FakeClock()
+    schedule = make_schedule(clock)
+    schedule.sync([1, 2])
+    clock.now = 100
+    assert sorted(schedule.pop_due()) == [1, 2]
+    schedule.record(1, "up")
+
+    schedule.requeue([1, 2])
+    clock.now = 120
+    assert schedule.pop_due() == [2]
+    clock.now = 200
+    assert schedule.pop_due() == [1]
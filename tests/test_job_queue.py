@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from git_remote import GitRemote
+
+from ouchi_face_backend.core.config import settings
+from ouchi_face_backend.models.job import JobStatus, SyncJob
+from ouchi_face_backend.services.job_queue import SyncJobQueue
+from ouchi_face_backend.services.repo_sync import RepoSyncService
+
+
+@pytest.mark.asyncio()
+async def test_jobs_run_in_background_and_resume_after_restart(session_factory, remote: GitRemote, tmp_path: Path) -> None:
+    async with session_factory() as session:
+        session.add(SyncJob(repo_url=remote.url, subpath="apps/demo", status=JobStatus.RUNNING))
+        await session.commit()
+
+    queue = SyncJobQueue(session_factory, repo_sync=RepoSyncService(storage_dir=tmp_path / "cache"), workers=1)
+    failing = await queue.submit(remote.url, subpath="missing")
+    await queue.start()
+    await queue.join()
+    await queue.shutdown()
+
+    resumed = await queue.get(1)
+    assert resumed.status == JobStatus.SUCCEEDED
+    assert resumed.attempts == 1
+    assert resumed.resource_id is not None
+    assert resumed.sync_ms is not None and resumed.db_ms is not None
+
+    failed = await queue.get(failing.id)
+    assert failed.status == JobStatus.FAILED
+    assert "ouchi.yaml not found" in failed.error
+
+
+@pytest.mark.asyncio()
+async def test_worker_survives_a_job_that_cannot_be_claimed(
+    session_factory, remote: GitRemote, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    queue = SyncJobQueue(session_factory, repo_sync=RepoSyncService(storage_dir=tmp_path / "cache"), workers=1)
+    update = queue._update
+    calls = 0
+
+    async def flaky_update(job_id: int, **values) -> None:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("database is locked")
+        await update(job_id, **values)
+
+    monkeypatch.setattr(queue, "_update", flaky_update)
+    await queue.start()
+    crashed = await queue.submit(remote.url, subpath="apps/demo")
+    await queue.join()
+    later = await queue.submit(remote.url, subpath="apps/demo")
+    await queue.join()
+    await queue.shutdown()
+
+    assert (await queue.get(crashed.id)).status == JobStatus.FAILED
+    assert (await queue.get(later.id)).status == JobStatus.SUCCEEDED
+
+
+@pytest.mark.asyncio()
+async def test_jobs_interrupted_too_often_are_failed_on_restart(
+    session_factory, remote: GitRemote, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "sync_job_max_attempts", 2)
+    async with session_factory() as session:
+        for attempts in (1, 2):
+            session.add(SyncJob(repo_url=remote.url, subpath="apps/demo", status=JobStatus.RUNNING, attempts=attempts))
+        await session.commit()
+
+    queue = SyncJobQueue(session_factory, repo_sync=RepoSyncService(storage_dir=tmp_path / "cache"), workers=1)
+    await queue.start()
+    await queue.join()
+    await queue.shutdown()
+
+    retried, abandoned = await queue.get(1), await queue.get(2)
+    assert (retried.status, retried.attempts) == (JobStatus.SUCCEEDED, 2)
+    assert (abandoned.status, abandoned.attempts) == (JobStatus.FAILED, 2)
+    assert "interrupted 2 times" in abandoned.error
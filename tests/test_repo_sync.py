@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import zlib
+from pathlib import Path
+
+import pytest
+from git import Repo
+from git_remote import GitRemote
+
+from ouchi_face_backend.services import repo_sync
+from ouchi_face_backend.services.repo_sync import ReadmeDocument, RepoSyncService
+
+def test_shallow_sync_only_materializes_metadata(remote: GitRemote, tmp_path: Path) -> None:
+    service = RepoSyncService(storage_dir=tmp_path / "cache", fetch_mode="shallow")
+
+    result = service.sync(remote.url, subpath="apps/demo")
+    assert result.metadata.name == "Demo App"
+    assert result.readme.search_text == "Demo"
+    assert zlib.decompress(result.readme.compressed) == b"# Demo\n"
+    checkout = result.repo_path
+    assert (checkout / ".git" / "shallow").exists()
+    assert not (checkout / "weights.bin").exists()
+
+    remote.push({"apps/demo/ouchi.yaml": b"kind: app\nname: Demo App v2\n"}, "rename")
+    assert service.sync(remote.url, subpath="apps/demo").metadata.name == "Demo App v2"
+    assert Repo(checkout).git.rev_list("--count", "HEAD") == "1"
+
+
+def test_full_sync_clones_everything(remote: GitRemote, tmp_path: Path) -> None:
+    service = RepoSyncService(storage_dir=tmp_path / "cache", fetch_mode="full")
+    result = service.sync(remote.url, subpath="apps/demo")
+    assert result.metadata.name == "Demo App"
+    assert (result.repo_path / "weights.bin").exists()
+
+
+def test_bare_sync_reads_metadata_from_git_objects(remote: GitRemote, tmp_path: Path) -> None:
+    service = RepoSyncService(storage_dir=tmp_path / "cache", fetch_mode="shallow", storage_mode="bare")
+
+    result = service.sync(remote.url, subpath="apps/demo")
+    assert result.metadata.name == "Demo App"
+    assert zlib.decompress(result.readme.compressed) == b"# Demo\n"
+    assert result.repo_path.name == "catalog-app.git"
+    assert Repo(result.repo_path).bare
+    assert not (result.repo_path / "apps").exists()
+
+    remote.push({"apps/demo/ouchi.yaml": b"kind: app\nname: Demo App v2\n"}, "rename")
+    assert service.sync(remote.url, subpath="apps/demo").metadata.name == "Demo App v2"
+
+
+@pytest.mark.asyncio()
+async def test_concurrent_syncs_of_one_repo_are_serialized(remote: GitRemote, tmp_path: Path) -> None:
+    service = RepoSyncService(storage_dir=tmp_path / "cache")
+    sync, guard = service.sync, threading.Lock()
+    in_flight = {"current": 0, "peak": 0}
+
+    def tracked_sync(*args):
+        with guard:
+            in_flight["current"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["current"])
+        try:
+            time.sleep(0.02)
+            return sync(*args)
+        finally:
+            with guard:
+                in_flight["current"] -= 1
+
+    service.sync = tracked_sync
+    results = await asyncio.gather(*(service.sync_async(remote.url, subpath="apps/demo") for _ in range(4)))
+    assert {result.commit_sha for result in results} == {remote.work.head.commit.hexsha}
+    assert in_flight["peak"] == 1
+    assert repo_sync._repo_locks == {}
+
+
+def test_readme_document_bounds_indexed_text() -> None:
+    text = "# Title\n\n" + "word " * 1000
+    document = ReadmeDocument.from_chunks([text.encode()[i : i + 7] for i in range(0, len(text), 7)], max_chars=40)
+
+    assert document.size == len(text)
+    assert zlib.decompress(document.compressed).decode() == text
+    assert document.search_text == "Title\nword word word word word word"
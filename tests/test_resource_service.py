@@ -1,47 +1,23 @@
 from __future__ import annotations
 
-import asyncio
+import json
+import zlib
 from datetime import date
 from pathlib import Path
 
 import pytest
-import pytest_asyncio
-from sqlalchemy import text
-from sqlalchemy.pool import StaticPool
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
-from sqlmodel import SQLModel
+from git_remote import GitRemote
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ouchi_face_backend.models.resource import ResourceKind, ResourceSource
-from ouchi_face_backend.schemas.resource import ManualResourceCreate, ResourceMetadata
-from ouchi_face_backend.services.repo_sync import RepoSyncService
-from ouchi_face_backend.services.resource_service import ResourceService
-
-
-@pytest_asyncio.fixture()
-async def session(tmp_path: Path) -> AsyncSession:
-    engine = create_async_engine(
-        "sqlite+aiosqlite://",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    async with engine.begin() as conn:
-        await conn.run_sync(SQLModel.metadata.create_all)
-        await conn.execute(
-            text(
-                """
-                CREATE VIRTUAL TABLE IF NOT EXISTS resources_fts USING fts5(
-                    name, description, tags, content='', content_rowid='id'
-                )
-                """
-            )
-        )
-    session_factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
-    try:
-        async with session_factory() as async_session:
-            yield async_session
-    finally:
-        await engine.dispose()
+from ouchi_face_backend.models.resource import Resource, ResourceKind, ResourceReadme, ResourceSource
+from ouchi_face_backend.schemas.resource import (
+    ManualResourceCreate,
+    ResourceListResponse,
+    ResourceMetadata,
+    resource_list_json,
+)
+from ouchi_face_backend.services.repo_sync import RepoSyncResult, RepoSyncService
+from ouchi_face_backend.services.resource_service import ResourceService, to_read_model
 
 
 @pytest.mark.asyncio()
@@ -93,3 +69,237 @@ async def test_search_resources(session: AsyncSession, tmp_path: Path) -> None:
     resources, total = await service.list_resources(q="metrics", limit=10)
     assert total == 1
     assert resources[0].name == "Local Logs"
+
+
+@pytest.mark.asyncio()
+async def test_search_ranks_prefixes_typos_and_snippets(session: AsyncSession, tmp_path: Path) -> None:
+    service = ResourceService(session, repo_sync=RepoSyncService(storage_dir=tmp_path))
+    for name, description in (
+        ("Grafana Boards", "Dashboards for the kubernetes cluster"),
+        ("Kubernetes Console", "Cluster admin"),
+        ("Speech Model", "Audio inference"),
+    ):
+        metadata = ResourceMetadata(kind=ResourceKind.APP, name=name, description=description)
+        await service.create_or_update(ManualResourceCreate(metadata=metadata))
+
+    page = await service.list_page(q="kubernetes")
+    assert [item.name for item in page.items] == ["Kubernetes Console", "Grafana Boards"]
+    assert page.total == 2
+    assert page.snippets[page.items[0].id] == "<mark>Kubernetes</mark> Console"
+
+    page = await service.list_page(q="clus")
+    assert page.total == 2
+
+    page = await service.list_page(q="kubernets consle")
+    assert [item.name for item in page.items] == ["Kubernetes Console"]
+
+    page = await service.list_page(q='"audio" OR NOT')
+    assert page.total == 0
+
+    page = await service.list_page(q="kubernetes -grafana kind:app")
+    assert [item.name for item in page.items] == ["Kubernetes Console"]
+
+    page = await service.list_page(q="cluster -kind:app")
+    assert page.total == 0
+
+
+@pytest.mark.asyncio()
+async def test_search_excludes_negated_tags_and_owners(session: AsyncSession, tmp_path: Path) -> None:
+    service = ResourceService(session, repo_sync=RepoSyncService(storage_dir=tmp_path))
+    for name, tags, owner in (("GPU Cluster", ["gpu"], "@ops"), ("CPU Cluster", ["cpu"], None), ("Old Cluster", [], "@bob")):
+        metadata = ResourceMetadata(kind=ResourceKind.APP, name=name, tags=tags, owner=owner)
+        await service.create_or_update(ManualResourceCreate(metadata=metadata))
+
+    page = await service.list_page(q="cluster -tag:gpu")
+    assert sorted(item.name for item in page.items) == ["CPU Cluster", "Old Cluster"]
+    page = await service.list_page(q="-owner:@bob -tag:cpu")
+    assert [item.name for item in page.items] == ["GPU Cluster"]
+
+
+@pytest.mark.asyncio()
+async def test_snippets_escape_stored_markup(session: AsyncSession, tmp_path: Path) -> None:
+    service = ResourceService(session, repo_sync=RepoSyncService(storage_dir=tmp_path))
+    description = '<script>alert("x")</script> Dashboard & <mark>notes</mark>'
+    metadata = ResourceMetadata(kind=ResourceKind.APP, name="Boards", description=description)
+    resource = await service.create_or_update(ManualResourceCreate(metadata=metadata))
+
+    page = await service.list_page(q="dashboard")
+    assert page.snippets[resource.id] == (
+        "&lt;script&gt;alert(&quot;x&quot;)&lt;/script&gt; <mark>Dashboard</mark> &amp; &lt;mark&gt;notes&lt;/mark&gt;"
+    )
+    assert (await service.list_page(q="cluster kind:model")).total == 0
+
+
+@pytest.mark.asyncio()
+async def test_sync_resource_skips_unchanged_repository(session: AsyncSession, tmp_path: Path, remote: GitRemote) -> None:
+    service = ResourceService(session, repo_sync=RepoSyncService(storage_dir=tmp_path / "cache"))
+    resource = Resource(kind=ResourceKind.APP, name="Demo App", slug="demo-app", repo_url=remote.url, repo_subpath="apps/demo")
+    session.add(resource)
+    await session.commit()
+
+    resource, refreshed = await service.sync_resource(resource)
+    assert refreshed
+    assert resource.tags == ["demo"]
+    modified_at = resource.modified_at
+
+    resource, refreshed = await service.sync_resource(resource)
+    assert not refreshed
+
+    head = remote.push({"weights.bin": b"\1" * 1024}, "retrain")
+    resource, refreshed = await service.sync_resource(resource)
+    assert not refreshed
+    assert resource.repo_commit_sha == head
+    assert resource.modified_at == modified_at
+
+    remote.push({"apps/demo/README.md": b"# Demo v2\n"}, "docs")
+    resource, refreshed = await service.sync_resource(resource)
+    assert refreshed
+    assert resource.modified_at > modified_at
+
+
+@pytest.mark.asyncio()
+async def test_readme_is_indexed_and_only_rewritten_when_it_changes(
+    session: AsyncSession, tmp_path: Path, remote: GitRemote
+) -> None:
+    service = ResourceService(session, repo_sync=RepoSyncService(storage_dir=tmp_path / "cache"))
+    remote.push({"apps/demo/README.md": b"# Demo\n\nServes [embeddings](https://example.com/docs).\n"}, "docs")
+
+    def sync() -> RepoSyncResult:
+        return service.repo_sync.sync(remote.url, subpath="apps/demo")
+
+    resource = await service.store_sync_result(remote.url, None, "apps/demo", sync())
+
+    page = await service.list_page(q="embeddings")
+    assert [item.id for item in page.items] == [resource.id]
+    assert page.snippets[resource.id] == "Demo\nServes <mark>embeddings</mark>."
+    assert (await service.list_page(q="example")).total == 0
+    readme = await session.get(ResourceReadme, resource.id)
+    assert zlib.decompress(readme.content).startswith(b"# Demo")
+
+    remote.push({"apps/demo/ouchi.yaml": b"kind: app\nname: Demo App\ndescription: Vectors\n"}, "describe")
+    entry = await service._stage_sync_result(remote.url, None, "apps/demo", sync())
+    assert entry == (resource, None)
+
+    remote.push({"apps/demo/README.md": b"# Demo\n"}, "trim docs")
+    await service.store_sync_result(remote.url, None, "apps/demo", sync())
+    assert (await service.list_page(q="embeddings")).total == 0
+
+
+@pytest.mark.asyncio()
+async def test_sync_all_reports_changed_skipped_and_failed(session: AsyncSession, tmp_path: Path, remote: GitRemote) -> None:
+    service = ResourceService(session, repo_sync=RepoSyncService(storage_dir=tmp_path / "cache"))
+    missing = (tmp_path / "missing.git").as_uri()
+    repository = ResourceSource.REPOSITORY
+    session.add(
+        Resource(kind=ResourceKind.APP, name="Demo App", slug="demo-app", repo_url=remote.url, repo_subpath="apps/demo", source=repository)
+    )
+    session.add(Resource(kind=ResourceKind.APP, name="Gone", slug="gone", repo_url=missing, source=repository))
+    session.add(Resource(kind=ResourceKind.APP, name="Manual", slug="manual"))
+    await session.commit()
+
+    first = await service.sync_all()
+    assert (first.changed, first.skipped, first.failed) == (1, 0, 1)
+    assert {item.repo_url: item.status for item in first.items} == {remote.url: "changed", missing: "failed"}
+
+    second = await service.sync_all()
+    assert (second.changed, second.skipped, second.failed) == (0, 1, 1)
+    demo = await service.get_by_slug("demo-app")
+    assert demo.tags == ["demo"]
+
+
+@pytest.mark.asyncio()
+async def test_list_page_walks_keyset_cursor(session: AsyncSession, tmp_path: Path) -> None:
+    service = ResourceService(session, repo_sync=RepoSyncService(storage_dir=tmp_path))
+    for index in range(5):
+        await service.create_or_update(
+            ManualResourceCreate(metadata=ResourceMetadata(kind=ResourceKind.APP, name=f"App {index}"))
+        )
+
+    seen: list[str] = []
+    page = await service.list_page(limit=2)
+    assert page.total == 5
+    while True:
+        seen.extend(resource.name for resource in page.items)
+        if not page.next_cursor:
+            break
+        page = await service.list_page(limit=2, cursor=page.next_cursor, count="none")
+        assert page.total is None
+
+    assert seen == [f"App {index}" for index in reversed(range(5))]
+    estimate = await service.list_page(limit=1, count="estimate")
+    assert estimate.total == 5 and estimate.total_is_estimate
+
+
+@pytest.mark.asyncio()
+async def test_tag_filters_use_exact_tags_and_facets(session: AsyncSession, tmp_path: Path) -> None:
+    service = ResourceService(session, repo_sync=RepoSyncService(storage_dir=tmp_path))
+    for name, tags in (("Both", ["gpu", "llm"]), ("Gpu Only", ["gpu"]), ("Substring", ["gpus"])):
+        await service.create_or_update(
+            ManualResourceCreate(metadata=ResourceMetadata(kind=ResourceKind.MODEL, name=name, tags=tags))
+        )
+
+    async def names(**kwargs) -> set[str]:
+        page = await service.list_page(**kwargs)
+        return {resource.name for resource in page.items}
+
+    assert await names(tags=["gpu"]) == {"Both", "Gpu Only"}
+    assert await names(tags=["gpu", "llm"]) == {"Both"}
+    assert await names(tags=["llm", "gpus"], tag_mode="any") == {"Both", "Substring"}
+    assert await service.tag_facets() == [("gpu", 2), ("gpus", 1), ("llm", 1)]
+
+    await service.create_or_update(
+        ManualResourceCreate(metadata=ResourceMetadata(kind=ResourceKind.MODEL, name="Both", tags=["llm"]))
+    )
+    assert await names(tags=["gpu"]) == {"Gpu Only"}
+
+
+@pytest.mark.asyncio()
+async def test_new_slug_skips_taken_suffixes_and_retries_on_conflict(session: AsyncSession, monkeypatch) -> None:
+    for slug in ["demo", "demo-2", "demo-app"]:
+        session.add(Resource(kind=ResourceKind.APP, name=slug, slug=slug))
+    await session.commit()
+    service = ResourceService(session)
+
+    # A stale lookup (as if another writer inserted "demo" meanwhile) must not raise.
+    taken_slugs = service._taken_slugs
+    lookups: list[str] = []
+
+    async def stale_first(base: str) -> list[str]:
+        lookups.append(base)
+        return [] if len(lookups) == 1 else await taken_slugs(base)
+
+    monkeypatch.setattr(service, "_taken_slugs", stale_first)
+
+    metadata = ResourceMetadata(kind=ResourceKind.APP, name="Demo")
+    values = {"slug": "demo", "source": ResourceSource.MANUAL, "health_status": "unknown"}
+    values.update(service._metadata_values(metadata))
+    resource = await service._insert_resource({**values, "created_at": values["modified_at"]})
+
+    assert resource.slug == "demo-3"
+    assert lookups == ["demo", "demo"]
+    assert await taken_slugs("demo") == ["demo", "demo-2", "demo-3"]
+
+
+@pytest.mark.asyncio()
+async def test_row_pages_serialize_like_read_models(session: AsyncSession) -> None:
+    service = ResourceService(session)
+    for name in ["Cluster Dashboard", "Cluster Metrics"]:
+        metadata = ResourceMetadata(kind=ResourceKind.APP, name=name, tags=["ops"], updated=date(2024, 5, 4))
+        await service.create_or_update(ManualResourceCreate(metadata=metadata))
+
+    for q in [None, "cluster"]:
+        models = await service.list_page(q=q)
+        rows = await service.list_page(q=q, rows=True)
+        expected = ResourceListResponse(
+            items=[await to_read_model(res, models.snippets.get(res.id)) for res in models.items],
+            total=models.total,
+        )
+        body = resource_list_json.dump_json(
+            {
+                "items": [{**row._asdict(), "snippet": rows.snippets.get(row.id)} for row in rows.items],
+                "total": rows.total,
+                "total_is_estimate": rows.total_is_estimate,
+                "next_cursor": rows.next_cursor,
+            }
+        )
+        assert json.loads(body) == json.loads(expected.model_dump_json())
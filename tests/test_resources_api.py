@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import AsyncGenerator
+
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy import update
+
+from ouchi_face_backend.api.deps import get_db_session, get_read_db_session
+from ouchi_face_backend.application import create_app
+from ouchi_face_backend.models.resource import Resource, ResourceKind
+from ouchi_face_backend.schemas.resource import ManualResourceCreate, ResourceMetadata
+from ouchi_face_backend.services.catalog_cache import CatalogCache, catalog_cache
+from ouchi_face_backend.services.resource_service import ResourceService
+
+
+@pytest_asyncio.fixture()
+async def client(session_factory) -> AsyncGenerator[httpx.AsyncClient, None]:
+    async def override_session():
+        async with session_factory() as session:
+            yield session
+
+    app = create_app()
+    app.dependency_overrides[get_db_session] = override_session
+    app.dependency_overrides[get_read_db_session] = override_session
+    catalog_cache.clear()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    catalog_cache.clear()
+
+
+@pytest.mark.asyncio()
+async def test_list_revalidates_against_the_database(
+    client: httpx.AsyncClient, session_factory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async with session_factory() as session:
+        session.add(Resource(kind=ResourceKind.APP, name="Demo", slug="demo"))
+        await session.commit()
+
+    first = await client.get("/api/resources")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    revalidated = await client.get("/api/resources", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+
+    created = await client.post("/api/resources", json={"metadata": {"kind": "app", "name": "Second"}})
+    assert created.status_code == 200
+    changed = await client.get("/api/resources", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    etag = changed.headers["etag"]
+
+    # Writes from another process (a CLI import, another worker) never touch
+    # this process's cache, but they do move the database watermark.
+    monkeypatch.setattr(catalog_cache, "ttl_seconds", 0)
+    catalog_cache.clear()
+    assert (await client.get("/api/resources", headers={"If-None-Match": etag})).status_code == 304
+    async with session_factory() as session:
+        metadata = ResourceMetadata(kind=ResourceKind.APP, name="Demo", description="edited elsewhere")
+        await ResourceService(session, cache=CatalogCache()).create_or_update(ManualResourceCreate(metadata=metadata))
+    elsewhere = await client.get("/api/resources", headers={"If-None-Match": etag})
+    assert elsewhere.status_code == 200
+    assert "edited elsewhere" in {item["description"] for item in elsewhere.json()["items"]}
+
+    etag = elsewhere.headers["etag"]
+    async with session_factory() as session:
+        await session.exec(update(Resource).where(Resource.slug == "demo").values(health_checked_at=datetime.utcnow()))
+        await session.commit()
+    assert (await client.get("/api/resources", headers={"If-None-Match": etag})).status_code == 200
+
+
+@pytest.mark.asyncio()
+async def test_matching_list_validator_skips_loading_the_page(
+    client: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    etag = (await client.get("/api/resources?limit=5")).headers["etag"]
+    catalog_cache.clear()
+
+    async def unexpected(*args, **kwargs):
+        raise AssertionError("a matching validator must not load the page")
+
+    monkeypatch.setattr(ResourceService, "list_page", unexpected)
+    response = await client.get("/api/resources?limit=5", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
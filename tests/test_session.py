@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ouchi_face_backend.db.session import build_engine, create_schema
+from ouchi_face_backend.models.resource import Resource
+
+
+@pytest.mark.asyncio()
+async def test_file_engines_apply_storage_profile(tmp_path: Path) -> None:
+    url = f"sqlite+aiosqlite:///{tmp_path / 'catalog.db'}"
+    writer, reader = build_engine(url), build_engine(url, read_only=True)
+    try:
+        async with writer.begin() as conn:
+            assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+            assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 1  # NORMAL
+            assert (await conn.execute(text("PRAGMA busy_timeout"))).scalar() == 5000
+            await conn.execute(text("CREATE TABLE item (id INTEGER PRIMARY KEY)"))
+            await conn.execute(text("INSERT INTO item DEFAULT VALUES"))
+
+        async with reader.connect() as conn:
+            assert (await conn.execute(text("SELECT count(*) FROM item"))).scalar() == 1
+            with pytest.raises(OperationalError, match="readonly"):
+                await conn.execute(text("INSERT INTO item DEFAULT VALUES"))
+        assert reader.pool.size() == 8
+    finally:
+        await writer.dispose()
+        await reader.dispose()
+
+
+# ``resource`` as created by releases before columns were added to it.
+LEGACY_RESOURCE_TABLE = """
+CREATE TABLE resource (
+    id INTEGER PRIMARY KEY, kind VARCHAR(7) NOT NULL, name VARCHAR NOT NULL, slug VARCHAR NOT NULL UNIQUE,
+    description VARCHAR, tags JSON NOT NULL, url VARCHAR, path VARCHAR, repo_url VARCHAR, owner VARCHAR,
+    thumbnail_path VARCHAR, license VARCHAR, healthcheck_path VARCHAR, updated_at DATETIME,
+    last_synced_at DATETIME, health_status VARCHAR NOT NULL, health_checked_at DATETIME,
+    source VARCHAR(10) NOT NULL, created_at DATETIME NOT NULL, modified_at DATETIME NOT NULL
+)
+"""
+
+
+@pytest.mark.asyncio()
+async def test_create_schema_upgrades_existing_tables(tmp_path: Path) -> None:
+    engine = build_engine(f"sqlite+aiosqlite:///{tmp_path / 'catalog.db'}")
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text(LEGACY_RESOURCE_TABLE))
+            await conn.execute(
+                text(
+                    "INSERT INTO resource (kind, name, slug, tags, health_status, source, created_at, modified_at)"
+                    " VALUES ('APP', 'Demo', 'demo', '[\"demo\"]', 'up', 'MANUAL', '2024-01-01', '2024-01-01')"
+                )
+            )
+            await conn.run_sync(create_schema)
+
+        async with AsyncSession(engine) as session:
+            resource = (await session.exec(select(Resource))).one()
+        assert resource.health_latency_ms is None
+        assert resource.repo_branch is None and resource.repo_subpath is None
+        assert resource.repo_commit_sha is None and resource.metadata_hash is None
+    finally:
+        await engine.dispose()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import io
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from git_remote import GitRemote
+
+from ouchi_face_backend.services import thumbnails
+from ouchi_face_backend.services.repo_sync import RepoSyncService
+from ouchi_face_backend.services.thumbnails import ThumbnailStore, shutdown_thumbnail_executor
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture(autouse=True)
+def worker_pool() -> Iterator[None]:
+    yield
+    shutdown_thumbnail_executor()
+
+
+def _png(width: int, height: int, mode: str = "RGBA") -> bytes:
+    buffer = io.BytesIO()
+    Image.new(mode, (width, height), (255, 0, 0, 128)[: len(mode)]).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def test_variants_are_rendered_once_per_image(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    store = ThumbnailStore(tmp_path, sizes=[320, 160, 640], image_format="webp", quality=70)
+    digest = store.store(_png(1200, 600))
+
+    dimensions = {}
+    for size in (160, 320, 640):
+        with Image.open(store.variant_path(digest, size)) as variant:
+            assert (variant.format, variant.mode) == ("WEBP", "RGBA")
+            dimensions[size] = variant.size
+    assert dimensions == {160: (160, 80), 320: (320, 160), 640: (640, 320)}
+
+    def no_pool():
+        raise AssertionError("cached variants must not be rendered again")
+
+    monkeypatch.setattr(thumbnails, "get_thumbnail_executor", no_pool)
+    assert store.store(_png(1200, 600)) == digest
+
+    assert store.variant_path(digest, 200) is None
+    assert store.variant_path("../" + digest[3:], 160) is None
+
+
+def test_small_and_broken_images(tmp_path: Path) -> None:
+    store = ThumbnailStore(tmp_path, sizes=[160, 320], image_format="jpeg")
+    digest = store.store(_png(100, 40, mode="RGB"))
+    with Image.open(store.variant_path(digest, 320)) as variant:
+        assert (variant.format, variant.size) == ("JPEG", (100, 40))
+
+    assert store.store(b"not an image") is None
+    assert [path.name for path in tmp_path.glob("*/*")] == [digest]
+
+
+def test_sync_extracts_thumbnail_outside_the_sparse_checkout(remote: GitRemote, tmp_path: Path) -> None:
+    remote.push(
+        {
+            "apps/demo/ouchi.yaml": b"kind: app\nname: Demo App\nthumbnail: media/logo.png\n",
+            "apps/demo/media/logo.png": _png(800, 800),
+        },
+        "add thumbnail",
+    )
+    service = RepoSyncService(storage_dir=tmp_path / "cache", fetch_mode="shallow")
+    result = service.sync(remote.url, subpath="apps/demo")
+
+    assert result.thumbnail_hash is not None
+    assert service.thumbnails.variant_path(result.thumbnail_hash, 640).exists()
+    assert not (result.repo_path / "apps/demo/media/logo.png").exists()
+
+    remote.push({"apps/demo/media/logo.png": _png(800, 400)}, "new logo")
+    changed = service.sync(remote.url, subpath="apps/demo")
+    assert changed.thumbnail_hash != result.thumbnail_hash
+    assert changed.content_hash != result.content_hash
+
+    remote.push({"apps/demo/ouchi.yaml": b"kind: app\nname: Demo App\nthumbnail: ../../../etc/passwd\n"}, "escape")
+    assert service.sync(remote.url, subpath="apps/demo").thumbnail_hash is None